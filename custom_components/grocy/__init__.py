@@ -7,10 +7,13 @@ https://github.com/custom-components/grocy
 from __future__ import annotations
 
 import logging
+import time
 from typing import List
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.start import async_at_started
 
 from .const import (
     ATTR_BATTERIES,
@@ -33,30 +36,29 @@ from .const import (
 from .coordinator import GrocyDataUpdateCoordinator
 from .grocy_data import GrocyData, async_setup_endpoint_for_image_proxy
 from .services import async_setup_services, async_unload_services
+from .store import GrocyDataStore, GrocyJournalStore
 from homeassistant.exceptions import ConfigEntryNotReady
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
-    """Set up this integration using UI."""
+    """Set up this integration using UI.
+
+    The setup runs in stages: the enabled Grocy features are read, one
+    shared warm-up refresh fetches the data of every entity that will be
+    enabled (plus the chores for the chore buttons), and the platforms
+    are set up from that data without fetching again. The chore buttons
+    and the image proxy are deferred until Home Assistant has started.
+    """
     _LOGGER.info(STARTUP_MESSAGE)
+    setup_start = time.monotonic()
 
     coordinator: GrocyDataUpdateCoordinator = GrocyDataUpdateCoordinator(
         hass, config_entry
     )
-    try:
-        coordinator.available_entities = await _async_get_available_entities(
-            coordinator.grocy_data
-        )
-    except Exception as exc:
-        _LOGGER.warning("Grocy config fetch failed during setup: %s", exc)
-        # Raise ConfigEntryNotReady so Home Assistant retries the entry later.
-        raise ConfigEntryNotReady("Grocy is not reachable or returned invalid data") from exc
-    await coordinator.async_config_entry_first_refresh()
-    hass.data.setdefault(DOMAIN, {})
-    # store coordinator per config entry id to support multiple installs
-    hass.data[DOMAIN][config_entry.entry_id] = coordinator
+    store = GrocyDataStore(hass, config_entry.entry_id)
+    journal_store = GrocyJournalStore(hass, config_entry.entry_id)
 
     # Respect per-entry options: if the user opted out of creating chore
     # buttons, avoid forwarding the 'button' platform for this entry. This
@@ -72,13 +74,169 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     if not create_buttons and "button" in platforms:
         platforms.remove("button")
 
-    await hass.config_entries.async_forward_entry_setups(config_entry, platforms)
+    with coordinator.timed_setup_stage("cache"):
+        cached = await store.async_load()
+        if journals := await journal_store.async_load():
+            coordinator.grocy_data.journals.restore(journals)
+
+    if cached:
+        # Bring the entities up with the last known data and talk to Grocy
+        # in the background, so a slow or unreachable Grocy does not block
+        # the setup.
+        coordinator.available_entities, coordinator.data = cached
+        _async_set_warm_up_keys(hass, config_entry, coordinator, create_buttons)
+        # Let the domains poll on their own schedule right away: when Grocy
+        # is not reachable yet the first refresh fails, and the hub does
+        # not poll by itself.
+        coordinator.async_subscribe_domains()
+        config_entry.async_create_background_task(
+            hass,
+            _async_refresh_in_background(hass, config_entry, coordinator, store),
+            f"{DOMAIN}_first_refresh",
+        )
+    else:
+        with coordinator.timed_setup_stage("config"):
+            try:
+                coordinator.available_entities = await _async_get_available_entities(
+                    coordinator.grocy_data
+                )
+            except Exception as exc:
+                _LOGGER.warning("Grocy config fetch failed during setup: %s", exc)
+                # Raise ConfigEntryNotReady so Home Assistant retries the entry later.
+                raise ConfigEntryNotReady("Grocy is not reachable or returned invalid data") from exc
+        _async_set_warm_up_keys(hass, config_entry, coordinator, create_buttons)
+        with coordinator.timed_setup_stage("warm_up"):
+            await coordinator.async_config_entry_first_refresh()
+
+    @callback
+    def _async_save_data() -> None:
+        if coordinator.last_update_success:
+            store.async_schedule_save(coordinator.available_entities, coordinator.data)
+            journal_store.async_schedule_save(coordinator.grocy_data.journals.as_dict)
+
+    config_entry.async_on_unload(coordinator.async_add_listener(_async_save_data))
+    if not cached:
+        _async_save_data()
+
+    hass.data.setdefault(DOMAIN, {})
+    # store coordinator per config entry id to support multiple installs
+    hass.data[DOMAIN][config_entry.entry_id] = coordinator
+
+    with coordinator.timed_setup_stage("platforms"):
+        await hass.config_entries.async_forward_entry_setups(config_entry, platforms)
     await async_setup_services(hass, config_entry)
-    await async_setup_endpoint_for_image_proxy(hass, config_entry.data)
 
+    @callback
+    def _async_setup_image_proxy(_hass: HomeAssistant) -> None:
+        with coordinator.timed_setup_stage("image_proxy"):
+            async_setup_endpoint_for_image_proxy(hass, config_entry.data)
+
+    config_entry.async_on_unload(async_at_started(hass, _async_setup_image_proxy))
+
+    coordinator.record_setup_stage("total", time.monotonic() - setup_start)
     return True
 
 
+@callback
+def _async_set_warm_up_keys(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    coordinator: GrocyDataUpdateCoordinator,
+    create_buttons: bool,
+) -> None:
+    """Set the keys fetched before the platforms created their entities.
+
+    These are the keys of the entities enabled in the entity registry, the
+    chores sensor that is enabled by default with chore buttons, and the
+    chores the buttons are created from.
+    """
+    registry = er.async_get(hass)
+    enabled_unique_ids = {
+        entry.unique_id
+        for entry in er.async_entries_for_config_entry(registry, config_entry.entry_id)
+        if entry.disabled_by is None
+    }
+    coordinator.warm_up_keys = {
+        key
+        for key in coordinator.available_entities
+        if f"{config_entry.entry_id}{key.lower()}" in enabled_unique_ids
+    }
+    if create_buttons and ATTR_CHORES in coordinator.available_entities:
+        coordinator.required_keys.add(ATTR_CHORES)
+        coordinator.warm_up_keys.add(ATTR_CHORES)
+
+
+async def _async_refresh_in_background(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    coordinator: GrocyDataUpdateCoordinator,
+    store: GrocyDataStore,
+) -> None:
+    """Run the first live refresh after setting up from cached data."""
+    if await _async_check_available_entities(hass, config_entry, coordinator, store):
+        await coordinator.async_refresh()
+
+
+async def _async_check_available_entities(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    coordinator: GrocyDataUpdateCoordinator,
+    store: GrocyDataStore,
+) -> bool:
+    """Check whether the enabled Grocy features still match the cached ones.
+
+    Drops the cache and reloads the entry when the features changed, so
+    the set of entities matches again, and returns False. When Grocy is
+    not reachable, the check is repeated after the next successful update.
+    """
+    try:
+        available_entities = await _async_get_available_entities(
+            coordinator.grocy_data
+        )
+    except Exception as exc:  # pylint: disable=broad-except
+        _LOGGER.warning("Grocy config fetch failed, using cached data: %s", exc)
+        _async_check_available_entities_after_update(
+            hass, config_entry, coordinator, store
+        )
+        return True
+
+    if set(available_entities) != set(coordinator.available_entities):
+        _LOGGER.info("Enabled Grocy features changed, reloading")
+        await store.async_remove()
+        hass.async_create_task(hass.config_entries.async_reload(config_entry.entry_id))
+        return False
+    return True
+
+
+@callback
+def _async_check_available_entities_after_update(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    coordinator: GrocyDataUpdateCoordinator,
+    store: GrocyDataStore,
+) -> None:
+    """Check the enabled Grocy features once an update succeeded."""
+
+    @callback
+    def _async_updated() -> None:
+        if not coordinator.last_update_success:
+            return
+        unsubscribe()
+        config_entry.async_create_background_task(
+            hass,
+            _async_check_available_entities(hass, config_entry, coordinator, store),
+            f"{DOMAIN}_feature_check",
+        )
+
+    unsubscribe = coordinator.async_add_listener(_async_updated)
+
+
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the cached data of a removed config entry."""
+    await GrocyDataStore(hass, config_entry.entry_id).async_remove()
+    await GrocyJournalStore(hass, config_entry.entry_id).async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     await async_unload_services(hass)
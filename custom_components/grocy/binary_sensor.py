@@ -51,7 +51,8 @@ async def async_setup_entry(
                 description.key,
             )
 
-    async_add_entities(entities, True)
+    # The data was fetched by the warm-up refresh during setup
+    async_add_entities(entities)
 
 
 @dataclass
@@ -59,6 +60,7 @@ class GrocyBinarySensorEntityDescription(BinarySensorEntityDescription):
     """Grocy binary sensor entity description."""
 
     attributes_fn: Callable[[List[Any]], Mapping[str, Any] | None] = lambda _: None
+    list_attribute: str | None = None
     exists_fn: Callable[[List[str]], bool] = lambda _: True
     entity_registry_enabled_default: bool = False
 
@@ -69,70 +71,49 @@ BINARY_SENSORS: tuple[GrocyBinarySensorEntityDescription, ...] = (
         name="Grocy expired products",
         icon="mdi:delete-alert-outline",
         exists_fn=lambda entities: ATTR_EXPIRED_PRODUCTS in entities,
-        attributes_fn=lambda data: {
-            "expired_products": [x.as_dict() for x in data],
-            "count": len(data),
-        },
+        list_attribute="expired_products",
     ),
     GrocyBinarySensorEntityDescription(
         key=ATTR_EXPIRING_PRODUCTS,
         name="Grocy expiring products",
         icon="mdi:clock-fast",
         exists_fn=lambda entities: ATTR_EXPIRING_PRODUCTS in entities,
-        attributes_fn=lambda data: {
-            "expiring_products": [x.as_dict() for x in data],
-            "count": len(data),
-        },
+        list_attribute="expiring_products",
     ),
     GrocyBinarySensorEntityDescription(
         key=ATTR_OVERDUE_PRODUCTS,
         name="Grocy overdue products",
         icon="mdi:alert-circle-check-outline",
         exists_fn=lambda entities: ATTR_OVERDUE_PRODUCTS in entities,
-        attributes_fn=lambda data: {
-            "overdue_products": [x.as_dict() for x in data],
-            "count": len(data),
-        },
+        list_attribute="overdue_products",
     ),
     GrocyBinarySensorEntityDescription(
         key=ATTR_MISSING_PRODUCTS,
         name="Grocy missing products",
         icon="mdi:flask-round-bottom-empty-outline",
         exists_fn=lambda entities: ATTR_MISSING_PRODUCTS in entities,
-        attributes_fn=lambda data: {
-            "missing_products": [x.as_dict() for x in data],
-            "count": len(data),
-        },
+        list_attribute="missing_products",
     ),
     GrocyBinarySensorEntityDescription(
         key=ATTR_OVERDUE_CHORES,
         name="Grocy overdue chores",
         icon="mdi:alert-circle-check-outline",
         exists_fn=lambda entities: ATTR_OVERDUE_CHORES in entities,
-        attributes_fn=lambda data: {
-            "overdue_chores": [x.as_dict() for x in data],
-            "count": len(data),
-        },
+        list_attribute="overdue_chores",
     ),
     GrocyBinarySensorEntityDescription(
         key=ATTR_OVERDUE_TASKS,
         name="Grocy overdue tasks",
         icon="mdi:alert-circle-check-outline",
         exists_fn=lambda entities: ATTR_OVERDUE_TASKS in entities,
-        attributes_fn=lambda data: {
-            "overdue_tasks": [x.as_dict() for x in data],
-            "count": len(data),
-        },
+        list_attribute="overdue_tasks",
     ),
     GrocyBinarySensorEntityDescription(
         key=ATTR_OVERDUE_BATTERIES,
         name="Grocy overdue batteries",
         icon="mdi:battery-charging-10",
         exists_fn=lambda entities: ATTR_OVERDUE_BATTERIES in entities,
-        attributes_fn=lambda data: {
-            "overdue_batteries": [x.as_dict() for x in data],
-            "count": len(data),
-        },
+        list_attribute="overdue_batteries",
     ),
 )
 
@@ -140,6 +121,13 @@ BINARY_SENSORS: tuple[GrocyBinarySensorEntityDescription, ...] = (
 class GrocyBinarySensorEntity(GrocyEntity, BinarySensorEntity):
     """Grocy binary sensor entity definition."""
 
+    # The item lists are kept out of the recorder, only the counts are stored
+    _unrecorded_attributes = frozenset(
+        description.list_attribute
+        for description in BINARY_SENSORS
+        if description.list_attribute
+    )
+
     @property
     def is_on(self) -> bool | None:
         """Return true if the binary sensor is on."""
@@ -0,0 +1,163 @@
+"""Chore and battery details joined from bulk Grocy requests."""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence
+
+from pygrocy2.grocy_api_client import (
+    BatteryData,
+    BatteryDetailsResponse,
+    ChoreData,
+    ChoreDetailsResponse,
+    CurrentBatteryResponse,
+    CurrentChoreResponse,
+    UserDto,
+)
+
+from .sync import CountingJournal
+
+
+def _blank_to_none(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Return an object with Grocy's empty strings as None."""
+    return {key: None if value == "" else value for key, value in raw.items()}
+
+
+class ChoreDetails:
+    """Answer `get_chore` for all chores from a constant number of requests.
+
+    pygrocy requests `/chores/{id}` for every chore. The details are
+    instead joined from the current chores, `/objects/chores`, `/users`
+    and the executions counted from `chores_log`.
+    """
+
+    def __init__(
+        self,
+        current: List[CurrentChoreResponse],
+        chores: Sequence[Dict[str, Any]],
+        users: List[UserDto],
+        log: CountingJournal,
+    ) -> None:
+        """Join the chore objects, the users and the counted log."""
+        self._current = {chore.chore_id: chore for chore in current}
+        self._chores = {
+            chore.id: chore for chore in (ChoreData(**_blank_to_none(raw)) for raw in chores)
+        }
+        self._users = {user.id: user for user in users}
+        self._track_counts = dict(log.counts)
+        self._last_done = dict(log.latest)
+        # Details of chores created after the objects were read
+        self._requested: Dict[int, ChoreDetailsResponse | None] = {}
+
+    @classmethod
+    async def async_load(
+        cls,
+        api,
+        current: List[CurrentChoreResponse],
+        log: CountingJournal | None = None,
+    ) -> ChoreDetails:
+        """Load the chore objects and the users.
+
+        Without a synced journal of `chores_log`, the log is read in full.
+        """
+        if log is None:
+            log = CountingJournal("chores_log", "chore_id")
+            await log.async_sync(api, None)
+        details = cls(
+            current,
+            await api.get_generic_objects_for_type("chores") or [],
+            await api.get_users(),
+            log,
+        )
+        for chore_id in details._current.keys() - details._chores.keys():
+            details._requested[chore_id] = await api.get_chore(chore_id)
+        return details
+
+    def _user(self, user_id: Any) -> UserDto | None:
+        """Return a user by id."""
+        if user_id in (None, ""):
+            return None
+        return self._users.get(int(user_id))
+
+    def get_chore(self, chore_id: int) -> ChoreDetailsResponse | None:
+        """Return the details Grocy returns for a chore."""
+        chore = self._chores.get(chore_id)
+        if chore is None:
+            return self._requested.get(chore_id)
+
+        current = self._current.get(chore_id)
+        last_done = self._last_done.get(chore_id)
+        return ChoreDetailsResponse(
+            chore=chore,
+            last_tracked=current.last_tracked_time if current else None,
+            next_estimated_execution_time=(
+                current.next_estimated_execution_time if current else None
+            ),
+            track_count=self._track_counts.get(chore_id, 0),
+            next_execution_assigned_user=self._user(
+                chore.next_execution_assigned_to_user_id
+            ),
+            last_done_by=self._user(last_done[2]) if last_done else None,
+        )
+
+
+class BatteryDetails:
+    """Answer `get_battery` for all batteries from a constant number of requests.
+
+    pygrocy requests `/batteries/{id}` for every battery. The details are
+    instead joined from the current batteries, `/objects/batteries` and
+    the charge cycles counted from `battery_charge_cycles`.
+    """
+
+    def __init__(
+        self,
+        current: List[CurrentBatteryResponse],
+        batteries: Sequence[Dict[str, Any]],
+        log: CountingJournal,
+    ) -> None:
+        """Join the battery objects and the counted charge cycles."""
+        self._current = {battery.id: battery for battery in current}
+        self._batteries = {
+            battery.id: battery
+            for battery in (BatteryData(**_blank_to_none(raw)) for raw in batteries)
+        }
+        self._charge_cycles: Dict[int, int] = dict(log.counts)
+        # Details of batteries created after the objects were read
+        self._requested: Dict[int, BatteryDetailsResponse | None] = {}
+
+    @classmethod
+    async def async_load(
+        cls,
+        api,
+        current: List[CurrentBatteryResponse],
+        log: CountingJournal | None = None,
+    ) -> BatteryDetails:
+        """Load the battery objects.
+
+        Without a synced journal of `battery_charge_cycles`, the cycles are
+        read in full.
+        """
+        if log is None:
+            log = CountingJournal("battery_charge_cycles", "battery_id")
+            await log.async_sync(api, None)
+        details = cls(
+            current, await api.get_generic_objects_for_type("batteries") or [], log
+        )
+        for battery_id in details._current.keys() - details._batteries.keys():
+            details._requested[battery_id] = await api.get_battery(battery_id)
+        return details
+
+    def get_battery(self, battery_id: int) -> BatteryDetailsResponse | None:
+        """Return the details Grocy returns for a battery."""
+        battery = self._batteries.get(battery_id)
+        if battery is None:
+            return self._requested.get(battery_id)
+
+        current = self._current.get(battery_id)
+        return BatteryDetailsResponse(
+            battery=battery,
+            charge_cycles_count=self._charge_cycles.get(battery_id, 0),
+            last_charged=current.last_tracked_time if current else None,
+            last_tracked_time=current.last_tracked_time if current else None,
+            next_estimated_charge_time=(
+                current.next_estimated_charge_time if current else None
+            ),
+        )
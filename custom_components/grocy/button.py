@@ -4,21 +4,24 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import contextlib
-import json
 import logging
+import time
 from typing import Any, TYPE_CHECKING
+from weakref import WeakKeyDictionary
 
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.start import async_at_started
 from homeassistant.util import dt as dt_util
 
-from .const import ATTR_CHORES, CONF_CREATE_CHORE_BUTTONS, DOMAIN
+from .const import ATTR_CHORES, ATTR_OVERDUE_CHORES, CONF_CREATE_CHORE_BUTTONS, DOMAIN
 from .entity import GrocyEntity
-from .json_encoder import CustomJSONEncoder
+from .json_encoder import to_json_safe
+from .optimistic import apply_chore_executed
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
-    from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
     from .coordinator import GrocyDataUpdateCoordinator
 
@@ -41,7 +44,6 @@ async def async_setup_entry(
     coordinator: GrocyDataUpdateCoordinator = hass.data[DOMAIN][
         config_entry.entry_id
     ]
-    entities: list[GrocyButtonEntity] = []
 
     # Respect the integration option to create chore buttons. Options flow
     # stores the boolean under CONF_CREATE_CHORE_BUTTONS; default to True
@@ -66,164 +68,247 @@ async def async_setup_entry(
     # Only create buttons if chores are available and the option enables them
     if not create_buttons:
         _LOGGER.debug("Chore button creation disabled via config entry options")
-        async_add_entities([], True)
+        async_add_entities([])
         return
 
-    if ATTR_CHORES in coordinator.available_entities:
-        # Read current chores data directly from the GrocyData API and store
-        # it on the coordinator. The coordinator only populates `data` for
-        # keys that have registered entities, so we need to fetch chores at
-        # setup time to create the button entities.
-        try:
-            chores_data = await coordinator.grocy_data.async_update_data(ATTR_CHORES) or []
-        except (AttributeError, RuntimeError, TypeError) as err:  # pragma: no cover - best-effort
-            # Best-effort: if Grocy client or coordinator isn't available
-            # treat as no chores rather than failing setup.
-            _LOGGER.debug("Failed to fetch chores during setup: %s", err)
-            chores_data = []
+    if ATTR_CHORES not in coordinator.available_entities:
+        async_add_entities([])
+        return
+
+    reconciler = ChoreButtonReconciler(coordinator, config_entry, async_add_entities)
+
+    @callback
+    def _async_create_buttons(_hass: HomeAssistant | None = None) -> None:
+        """Create the buttons for the chores of the shared warm-up fetch.
+
+        Runs once Home Assistant has started, so the chore buttons do not
+        hold up the boot.
+        """
+        start = time.monotonic()
+        reconciler.async_add_initial(coordinator.data.get(ATTR_CHORES) or [])
+        config_entry.async_on_unload(
+            coordinator.async_add_listener(reconciler.async_reconcile)
+        )
+        coordinator.record_setup_stage("chore_buttons", time.monotonic() - start)
 
-        _LOGGER.debug("Grocy setup: found %d chores", len(chores_data))
+    config_entry.async_on_unload(async_at_started(hass, _async_create_buttons))
 
-        # Cache the fetched chores on the coordinator so the listener can
-        # reference coordinator.data[ATTR_CHORES]
-        coordinator.data[ATTR_CHORES] = chores_data
 
-        # Create initial entities for current chores
-        for chore in chores_data:
+class ChoreButtonReconciler:
+    """Keep the chore buttons in line with the chores in Grocy.
+
+    Buttons are indexed by chore id and the set of chore ids of the last
+    reconcile is kept as fingerprint. A coordinator update with the same
+    chores list, or with chores whose ids did not change, returns without
+    touching any entity. Reconciling runs synchronously in the listener,
+    so reconciles cannot overlap or pile up behind slow refreshes.
+    """
+
+    def __init__(
+        self,
+        coordinator: GrocyDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+        async_add_entities: AddEntitiesCallback,
+    ) -> None:
+        """Initialize the reconciler."""
+        self._coordinator = coordinator
+        self._config_entry = config_entry
+        self._async_add_entities = async_add_entities
+        self.index: dict[int, GrocyButtonEntity] = {}
+        self._fingerprint: frozenset[int] | None = None
+        self._last_chores: list[Any] | None = None
+
+    def _create_entity(self, chore_id: int, name: str) -> GrocyButtonEntity:
+        """Create, index and register the button of a chore."""
+        description = GrocyButtonEntityDescription(
+            key=f"chore_button_{chore_id}",
+            name=name,
+            entity_registry_enabled_default=True,
+        )
+        # Create the button and request it be grouped under a separate
+        # device by passing device_suffix="chores" to the base entity.
+        entity = GrocyButtonEntity(
+            self._coordinator,
+            description,
+            self._config_entry,
+            chore_id,
+            device_suffix="chores",
+        )
+        self._coordinator.entities.append(entity)
+        self.index[chore_id] = entity
+        return entity
+
+    @staticmethod
+    def _chores_by_id(chores: list[Any]) -> dict[int, str]:
+        """Return the name of every chore by id."""
+        chores_by_id: dict[int, str] = {}
+        for chore in chores:
             chore_id, chore_name = _extract_chore_fields(chore)
             if chore_id is None:
                 _LOGGER.debug("Skipping chore without id: %s", chore)
                 continue
-
-            description = GrocyButtonEntityDescription(
-                key=f"chore_button_{chore_id}",
-                name=f"{chore_name}",
-                entity_registry_enabled_default=True,
+            chores_by_id[int(chore_id)] = chore_name
+        return chores_by_id
+
+    @callback
+    def async_add_initial(self, chores: list[Any]) -> None:
+        """Create the buttons for the chores present at setup."""
+        _LOGGER.debug("Grocy setup: found %d chores", len(chores))
+        chores_by_id = self._chores_by_id(chores)
+        entities = [
+            self._create_entity(chore_id, f"{chore_name}")
+            for chore_id, chore_name in chores_by_id.items()
+        ]
+        self._fingerprint = frozenset(chores_by_id)
+        self._last_chores = chores
+        self._async_add_entities(entities)
+
+    @callback
+    def async_reconcile(self) -> None:
+        """Add buttons for new chores and retire the ones of removed chores."""
+        if ATTR_CHORES not in self._coordinator.available_entities:
+            return
+
+        # The coordinator always fetches chores while chore buttons are
+        # enabled. Don't treat a missing key as 'no chores' and remove
+        # user-visible button entities incorrectly.
+        chores = self._coordinator.data.get(ATTR_CHORES)
+        if chores is None or chores is self._last_chores:
+            return
+        self._last_chores = chores
+
+        chores_by_id = self._chores_by_id(chores)
+        fingerprint = frozenset(chores_by_id)
+        if fingerprint == self._fingerprint:
+            return
+        self._fingerprint = fingerprint
+        _LOGGER.debug("Grocy chore update: %d chores present", len(chores_by_id))
+
+        to_add_ids, to_remove_ids = _compute_chore_diff(set(self.index), chores)
+
+        new_entities = [
+            self._create_entity(chore_id, f"{chores_by_id[chore_id]} (Execute)")
+            for chore_id in to_add_ids
+        ]
+        if new_entities:
+            _LOGGER.debug(
+                "Grocy button: adding %d new entities: %s",
+                len(new_entities),
+                [e.entity_description.key for e in new_entities],
             )
-            # Create the button and request it be grouped under a separate
-            # device by passing device_suffix="chores" to the base entity.
-            entity = GrocyButtonEntity(
-                coordinator, description, config_entry, chore_id, device_suffix="chores"
+            self._async_add_entities(new_entities)
+
+        # Chores that came back after being removed become usable again
+        for chore_id in fingerprint:
+            entity = self.index[chore_id]
+            if entity._attr_available is False:  # noqa: SLF001
+                entity._attr_available = True  # noqa: SLF001
+                if entity.hass is not None:
+                    entity.async_write_ha_state()
+
+        if to_remove_ids:
+            _LOGGER.debug("Grocy button: removing chore ids: %s", to_remove_ids)
+            self._async_retire(to_remove_ids)
+
+    def _registry_entries(self) -> dict[str, er.RegistryEntry]:
+        """Return the registry entries of this config entry by entity id."""
+        registry = er.async_get(self._coordinator.hass)
+        return {
+            entry.entity_id: entry
+            for entry in er.async_entries_for_config_entry(
+                registry, self._config_entry.entry_id
             )
+        }
 
-            coordinator.entities.append(entity)
-            entities.append(entity)
+    @callback
+    def _async_retire(self, chore_ids: set[int]) -> None:
+        """Mark the buttons of removed chores unavailable.
 
-    async_add_entities(entities, True)
+        The registry entries of this config entry are read in one pass.
+        Buttons the user renamed or disabled are left alone.
+        """
+        entries = self._registry_entries()
+        expected_prefix = f"{self._config_entry.entry_id}_chore_button_"
+        for chore_id in chore_ids:
+            entity = self.index.get(chore_id)
+            if not entity:
+                continue
+
+            entry = entries.get(entity.entity_id)
+            if (
+                entry is None
+                or not entry.unique_id
+                or not entry.unique_id.startswith(expected_prefix)
+                or entry.disabled_by is not None
+                # If the registry name differs from the generated name,
+                # assume user changed it -> skip
+                or (entry.name and entry.name != f"{entity.entity_description.name}")
+            ):
+                continue
 
-    # Register a listener to react to coordinator updates and add/remove chore
-    # buttons dynamically. This must be defined inside this setup function so
-    # it closes over `hass`, `coordinator` and `async_add_entities`.
-    def _handle_coordinator_update() -> None:
-        """Handle coordinator updates and schedule async work.
+            # Keep the registry entry intact and avoid removing the
+            # in-memory entity to prevent UI flicker. Mark the entity as
+            # unavailable so it doesn't appear active.
+            entity._attr_available = False  # noqa: SLF001
+            if entity.hass is not None:
+                entity.async_write_ha_state()
 
-        The DataUpdateCoordinator invokes listeners synchronously (without
-        awaiting), so we schedule async work with hass.async_create_task.
-        """
 
-        async def _async_work() -> None:
-            # Only handle if chores feature is available
-            if ATTR_CHORES not in coordinator.available_entities:
-                return
-
-            # Coordinator may not populate data for ATTR_CHORES if the
-            # chores sensor/entity is disabled. In that case, fetch chores
-            # directly so we don't treat a missing key as 'no chores' and
-            # remove user-visible button entities incorrectly.
-            chores_data = coordinator.data.get(ATTR_CHORES)
-            if chores_data is None:
-                try:
-                    chores_data = await coordinator.grocy_data.async_update_data(ATTR_CHORES) or []
-                except (AttributeError, RuntimeError, TypeError) as err:  # pragma: no cover - best-effort fetch
-                    _LOGGER.debug("Failed to fetch chores during coordinator update: %s", err)
-                    chores_data = []
-
-            _LOGGER.debug("Grocy chore update: %d chores present", len(chores_data))
-
-            # Build mapping of existing chore entities in the coordinator
-            existing_chore_entities = {
-                int(entity.entity_description.key.split("_")[-1]): entity
-                for entity in coordinator.entities
-                if getattr(entity.entity_description, "key", "").startswith("chore_button_")
-            }
-
-            existing_ids = set(existing_chore_entities.keys())
-            to_add_ids, to_remove_ids = _compute_chore_diff(existing_ids, chores_data)
-
-            # Add new chore entities
-            new_entities: list[GrocyButtonEntity] = []
-            for chore in chores_data:
-                chore_id, chore_name = _extract_chore_fields(chore)
-                if chore_id is None or int(chore_id) not in to_add_ids:
-                    continue
-
-                description = GrocyButtonEntityDescription(
-                    key=f"chore_button_{chore_id}",
-                    name=f"{chore_name} (Execute)",
-                    entity_registry_enabled_default=True,
-                )
-                entity = GrocyButtonEntity(
-                    coordinator, description, config_entry, chore_id, device_suffix="chores"
-                )
-                coordinator.entities.append(entity)
-                new_entities.append(entity)
-                _LOGGER.debug("Grocy button: prepared entity for chore_id=%s description.key=%s", chore_id, description.key)
-
-            if new_entities:
-                _LOGGER.debug("Grocy button: adding %d new entities: %s", len(new_entities), [e.entity_description.key for e in new_entities])
-                async_add_entities(new_entities, True)
-
-            # Remove missing chore entities safely
-            if to_remove_ids:
-                _LOGGER.debug("Grocy button: removing chore ids: %s", to_remove_ids)
-                registry = er.async_get(hass)
-                for removed_id in to_remove_ids:
-                    entity = existing_chore_entities.get(removed_id)
-                    if not entity:
-                        continue
-
-                    entry = registry.async_get(entity.entity_id)
-                    safe_to_remove = False
-                    try:
-                        expected_prefix = f"{coordinator.config_entry.entry_id}_chore_button_"
-                        if entry and entry.unique_id and entry.unique_id.startswith(expected_prefix):
-                            # If the registry name differs from the generated name, assume user changed it -> skip
-                            generated_name = f"{entity.entity_description.name}"
-                            if (not entry.name) or (entry.name == generated_name):
-                                disabled_by = getattr(entry, "disabled_by", None)
-                                if disabled_by is None:
-                                    safe_to_remove = True
-                    except (AttributeError, TypeError) as err:  # pragma: no cover - defensive
-                        # Defensive catch: registry shape may vary across HA versions
-                        _LOGGER.debug("Error while checking registry entry for safe removal: %s", err)
-                        safe_to_remove = False
-
-                    if safe_to_remove:
-                        # Keep the registry entry intact and avoid removing the
-                        # in-memory entity to prevent UI flicker. Mark the
-                        # entity as unavailable so it doesn't appear active.
-                        try:
-                            # Coordinator entities are instances of our
-                            # GrocyButtonEntity; mark them unavailable so the
-                            # frontend shows them as not currently usable.
-                            # Accessing a protected attribute here mirrors
-                            # other HA integrations' patterns.
-                            entity._attr_available = False  # noqa: SLF001
-                        except (AttributeError, RuntimeError, TypeError) as err:  # pragma: no cover - defensive
-                            # Best-effort: if we can't mark unavailable, just
-                            # leave the entity in place and continue.
-                            _LOGGER.debug(
-                                "Failed to mark entity %s unavailable for chore %s: %s",
-                                getattr(entity, "entity_id", "<unknown>"),
-                                removed_id,
-                                err,
-                            )
-
-        # Schedule the async work without awaiting here
-        hass.async_create_task(_async_work())
-
-    # Register the listener with the coordinator
-    coordinator.async_add_listener(_handle_coordinator_update)
+# Attribute index per coordinator: the chores list it was built from and the
+# JSON-safe attributes of every chore by id.
+_CHORE_ATTRIBUTE_INDEXES: WeakKeyDictionary[Any, tuple[list[Any], dict[int, dict]]] = (
+    WeakKeyDictionary()
+)
+
+
+def _chore_attributes(chore: Any) -> Any:
+    """Return the attributes of a chore, preferring as_dict()."""
+    if hasattr(chore, "as_dict"):
+        try:
+            return chore.as_dict()
+        except (AttributeError, TypeError, ValueError) as err:
+            _LOGGER.debug("as_dict() failed for chore %s: %s", chore, err)
+    return chore
+
+
+def _chore_attributes_index(coordinator: Any) -> dict[int, dict]:
+    """Return the JSON-safe attributes of the current chores by chore id.
+
+    The index is built once per chores list, i.e. once per coordinator
+    update, so every button state write is a dict lookup.
+    """
+    chores = coordinator.data.get(ATTR_CHORES) or []
+    cached = _CHORE_ATTRIBUTE_INDEXES.get(coordinator)
+    if cached is not None and cached[0] is chores:
+        return cached[1]
+
+    ids: list[int] = []
+    attributes: list[Any] = []
+    for chore in chores:
+        try:
+            chore_id, _ = _extract_chore_fields(chore)
+        except (AttributeError, TypeError, ValueError) as err:
+            # Best-effort: if the chore item is malformed, skip it.
+            _LOGGER.debug("Error extracting chore fields: %s", err)
+            continue
+        if chore_id is None:
+            continue
+        ids.append(int(chore_id))
+        attributes.append(_chore_attributes(chore))
+
+    index: dict[int, dict] = {}
+    for chore_id, data in zip(ids, attributes):
+        # The first chore wins when ids repeat, like the former linear scan
+        if chore_id in index:
+            continue
+        try:
+            index[chore_id] = to_json_safe(data)
+        except (TypeError, ValueError) as err:
+            # Best-effort fallback for non-serializable objects
+            _LOGGER.debug("JSON conversion failed for chore %s: %s", chore_id, err)
+            index[chore_id] = {"value": str(data)}
+    _CHORE_ATTRIBUTE_INDEXES[coordinator] = (chores, index)
+    return index
 
 
 def _compute_chore_diff(existing_ids: set[int], chores: list[Any]) -> tuple[set[int], set[int]]:
@@ -308,78 +393,28 @@ class GrocyButtonEntity(GrocyEntity, ButtonEntity):
         # Store the chore id this button will execute.
         self._chore_id = chore_id
 
+    @property
+    def available(self) -> bool:
+        """Return False once the chore was removed from Grocy."""
+        return self._attr_available and super().available
+
     async def async_press(self) -> None:
         """Handle the button press to execute the chore."""
-        # Execute chore now and refresh the chores entity
-        def wrapper():
-            # grocy_api.execute_chore(chore_id, done_by, tracked_time, skipped=False)
-            self.coordinator.grocy_api.execute_chore(
-                self._chore_id, "", dt_util.now(), skipped=False
-            )
-
-        await self.hass.async_add_executor_job(wrapper)
-
-        # Force update chores sensor/entity by finding the matching entity and
-        # triggering an immediate state refresh. This avoids importing a
-        # private helper from `services.py`.
-        try:
-            entity = next(
-                (
-                    entity
-                    for entity in self.coordinator.entities
-                    if entity.entity_description.key == ATTR_CHORES
-                ),
-                None,
-            )
-            if entity:
-                await entity.async_update_ha_state(force_refresh=True)
-        except (AttributeError, RuntimeError, TypeError) as err:  # pragma: no cover - best-effort refresh; noqa: BLE001
-            # Best-effort: if refresh fails for any reason, do not block
-            # the button press. Log the error for diagnostics.
-            _LOGGER.debug(
-                "Failed to force refresh chores after executing chore %s: %s",
-                self._chore_id,
-                err,
-            )
+        # Execute chore now
+        await self.coordinator.grocy_api.execute_chore(
+            self._chore_id, "", dt_util.now(), skipped=False
+        )
+        self.coordinator.async_apply_local_change(
+            ATTR_CHORES, apply_chore_executed, self._chore_id, dt_util.now()
+        )
+        # Refetch the chore keys once a burst of presses is over
+        self.coordinator.async_mark_keys_dirty((ATTR_CHORES, ATTR_OVERDUE_CHORES))
 
     @property
     def extra_state_attributes(self) -> dict | None:
         """Return the chore details for this button as attributes.
 
-        Looks up the chore in coordinator.data[ATTR_CHORES] by id and returns
-        a JSON-serializable mapping (using CustomJSONEncoder to handle dates).
+        Looks the chore up by id in the attribute index of the current
+        chores list.
         """
-        chores = self.coordinator.data.get(ATTR_CHORES) or []
-        for c in chores:
-            try:
-                cid, _ = _extract_chore_fields(c)
-            except (AttributeError, TypeError, ValueError) as err:
-                # Best-effort: if the chore item is malformed, skip it.
-                _LOGGER.debug("Error extracting chore fields: %s", err)
-                cid = None
-            if cid is None:
-                continue
-            if int(cid) == int(self._chore_id):
-                # Prefer as_dict() when available
-                if hasattr(c, "as_dict"):
-                    try:
-                        data = c.as_dict()
-                    except (AttributeError, TypeError, ValueError) as err:
-                        _LOGGER.debug("as_dict() failed for chore %s: %s", cid, err)
-                        data = c
-                else:
-                    data = c
-
-                # Ensure the returned structure is JSON-compatible
-                try:
-                    return json.loads(json.dumps(data, cls=CustomJSONEncoder))
-                except (TypeError, ValueError) as err:
-                    # Best-effort fallback for non-serializable objects
-                    _LOGGER.debug("JSON serialization failed for chore %s: %s", cid, err)
-                    try:
-                        return dict(data) if isinstance(data, dict) else {"value": str(data)}
-                    except (TypeError, ValueError) as err2:
-                        _LOGGER.debug("Fallback serialization also failed for chore %s: %s", cid, err2)
-                        return None
-
-        return None
+        return _chore_attributes_index(self.coordinator).get(int(self._chore_id))
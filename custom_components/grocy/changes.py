@@ -0,0 +1,156 @@
+"""Track which parts of the Grocy data changed between updates."""
+from __future__ import annotations
+
+from datetime import date, time, timedelta
+from enum import Enum
+from functools import cache
+from typing import Any, Dict, Hashable, Iterable, List, Set, Tuple
+
+from .const import ATTR_CHORES
+
+CHORE_BUTTON_CONTEXT = "chore_button_{}"
+
+_SCALARS = (str, int, float, bool, Enum, date, time, timedelta)
+
+
+@cache
+def _slots(cls: type) -> Tuple[str, ...]:
+    """Return the slots of a class and its bases."""
+    slots: List[str] = []
+    for klass in cls.__mro__:
+        names = getattr(klass, "__slots__", ())
+        slots.extend(
+            name
+            for name in ((names,) if isinstance(names, str) else names)
+            if not name.startswith("__")
+        )
+    return tuple(slots)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Return a hashable value equal for items with the same content.
+
+    Walks the attributes the items already hold, without converting them
+    to their dict or JSON form.
+    """
+    if value is None or isinstance(value, _SCALARS):
+        return value
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    if hasattr(value, "__dict__"):
+        return (type(value), _freeze(vars(value)))
+    slots = _slots(type(value))
+    return (
+        type(value),
+        tuple(_freeze(getattr(value, name, None)) for name in slots)
+        if slots
+        else repr(value),
+    )
+
+
+def item_fingerprint(item: Any) -> int:
+    """Return a fingerprint of an item's content."""
+    return hash(_freeze(item))
+
+
+def _chore_id(chore: Any) -> Any:
+    """Return the id of a chore item."""
+    if isinstance(chore, dict):
+        return chore.get("chore_id") or chore.get("id")
+    return getattr(chore, "id", None)
+
+
+class ChangeTracker:
+    """Content fingerprints of the published data per key.
+
+    Merging new data returns the listener contexts whose content changed:
+    the key itself and, for chores, the chore buttons of the chores that
+    changed. Data whose content is unchanged is replaced by the object
+    published before, so memoized attributes stay valid.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        # key -> (data object, fingerprint, chore fingerprints by id)
+        self._seen: Dict[str, Tuple[Any, int, Dict[Any, int]]] = {}
+        self._published: Dict[str, Tuple[Any, int, Dict[Any, int]]] = {}
+        # key -> fingerprints of the last list of the key by item id; the
+        # items are kept so their ids are not reused
+        self._items: Dict[str, Dict[int, Tuple[Any, int]]] = {}
+
+    def _item_fingerprints(self, key: str, data: List[Any]) -> List[int]:
+        """Return the fingerprints of a list's items.
+
+        Items that are the same objects as in the key's previous list, like
+        the unchanged records of the stock, are not walked again.
+        """
+        previous = self._items.get(key, {})
+        items: Dict[int, Tuple[Any, int]] = {}
+        fingerprints = []
+        for item in data:
+            known = previous.get(id(item))
+            if known is None or known[0] is not item:
+                known = (item, item_fingerprint(item))
+            items[id(item)] = known
+            fingerprints.append(known[1])
+        self._items[key] = items
+        return fingerprints
+
+    def _fingerprint(self, key: str, data: Any) -> Tuple[Any, int, Dict[Any, int]]:
+        """Return the fingerprints of a key's data, computed once per object."""
+        seen = self._seen.get(key)
+        if seen is not None and seen[0] is data:
+            return seen
+
+        chores: Dict[Any, int] = {}
+        if isinstance(data, list):
+            fingerprints = self._item_fingerprints(key, data)
+            if key == ATTR_CHORES:
+                chores = {
+                    _chore_id(item): fingerprint
+                    for item, fingerprint in zip(data, fingerprints, strict=True)
+                }
+            fingerprint = hash(tuple(fingerprints))
+        else:
+            fingerprint = item_fingerprint(data)
+
+        seen = (data, fingerprint, chores)
+        self._seen[key] = seen
+        return seen
+
+    def merge(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], Set[str]]:
+        """Return the data to publish and the contexts that changed."""
+        merged: Dict[str, Any] = {}
+        changed: Set[str] = set()
+        for key, value in data.items():
+            _, fingerprint, chores = self._fingerprint(key, value)
+            published = self._published.get(key)
+            if published is not None and published[1] == fingerprint:
+                merged[key] = published[0]
+                continue
+
+            merged[key] = value
+            changed.add(key)
+            if key == ATTR_CHORES:
+                old_chores = published[2] if published is not None else {}
+                changed.update(
+                    CHORE_BUTTON_CONTEXT.format(chore_id)
+                    for chore_id in old_chores.keys() | chores.keys()
+                    if old_chores.get(chore_id) != chores.get(chore_id)
+                )
+            self._published[key] = (value, fingerprint, chores)
+        return merged, changed
+
+    def contexts_for_keys(self, keys: Iterable[str]) -> Set[str]:
+        """Return the contexts of the keys, including their chore buttons."""
+        contexts = set(keys)
+        if ATTR_CHORES in contexts and ATTR_CHORES in self._published:
+            contexts.update(
+                CHORE_BUTTON_CONTEXT.format(chore_id)
+                for chore_id in self._published[ATTR_CHORES][2]
+            )
+        return contexts
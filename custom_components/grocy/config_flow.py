@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 from homeassistant import config_entries
 from homeassistant.config_entries import OptionsFlowWithReload
 from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import voluptuous as vol
 
 if TYPE_CHECKING:
@@ -13,8 +14,14 @@ if TYPE_CHECKING:
 
 from .const import (
     CONF_API_KEY,
+    CONF_ATTRIBUTE_FIELDS,
     CONF_CREATE_CHORE_BUTTONS,
+    CONF_MAX_ATTRIBUTE_ITEMS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MEAL_PLAN_DAYS,
     CONF_PORT,
+    CONF_UPDATE_INTERVALS,
     CONF_URL,
     CONF_VERIFY_SSL,
     DEFAULT_PORT,
@@ -118,21 +125,22 @@ class GrocyFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             # missing). Importing here avoids raising on module import which
             # would cause the config flow to be marked 'Not implemented'.
             try:
-                from pygrocy2.grocy import Grocy
+                from .grocy_api import AsyncGrocy
             except Exception:  # pragma: no cover - environment dependent
                 _LOGGER.exception("pygrocy2 is not available during config flow")
                 return False
 
             (base_url, path) = extract_base_url_and_path(url)
-            client = Grocy(base_url, api_key, port=port, path=path, verify_ssl=verify_ssl)
+            client = AsyncGrocy(
+                async_get_clientsession(self.hass, verify_ssl),
+                base_url,
+                api_key,
+                port=port,
+                path=path,
+            )
 
             _LOGGER.debug("Testing credentials")
-
-            def system_info():
-                """Get system information from Grocy."""
-                return client.get_system_info()
-
-            await self.hass.async_add_executor_job(system_info)
+            await client.get_system_info()
             return True
         except Exception:  # pylint: disable=broad-except
             _LOGGER.exception("Error while testing credentials")
@@ -142,6 +150,25 @@ class GrocyFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 OPTIONS_SCHEMA = vol.Schema(
     {
         vol.Optional("create_chore_buttons"): bool,
+        vol.Optional(CONF_MAX_CONCURRENT_REQUESTS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=16)
+        ),
+        vol.Optional(CONF_MAX_UPDATE_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=30, max=86400)
+        ),
+        vol.Optional(CONF_MAX_ATTRIBUTE_ITEMS): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=1000)
+        ),
+        vol.Optional(CONF_MEAL_PLAN_DAYS): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=366)
+        ),
+        # Update interval in seconds for every polled Grocy domain
+        **{
+            vol.Optional(option): vol.All(vol.Coerce(int), vol.Range(min=5, max=86400))
+            for option in CONF_UPDATE_INTERVALS.values()
+        },
+        # Comma separated fields listed in the attributes of every domain
+        **{vol.Optional(option): str for option in CONF_ATTRIBUTE_FIELDS.values()},
     }
 )
 
@@ -240,21 +267,22 @@ class GrocyOptionsFlowHandler(OptionsFlowWithReload):
             # missing). Importing here avoids raising on module import which
             # would cause the config flow to be marked 'Not implemented'.
             try:
-                from pygrocy2.grocy import Grocy
+                from .grocy_api import AsyncGrocy
             except Exception:  # pragma: no cover - environment dependent
                 _LOGGER.exception("pygrocy2 is not available during options flow")
                 return False
 
             (base_url, path) = extract_base_url_and_path(url)
-            client = Grocy(base_url, api_key, port=port, path=path, verify_ssl=verify_ssl)
+            client = AsyncGrocy(
+                async_get_clientsession(self.hass, verify_ssl),
+                base_url,
+                api_key,
+                port=port,
+                path=path,
+            )
 
             _LOGGER.debug("Testing credentials")
-
-            def system_info():
-                """Get system information from Grocy."""
-                return client.get_system_info()
-
-            await self.hass.async_add_executor_job(system_info)
+            await client.get_system_info()
             return True
         except Exception:  # pylint: disable=broad-except
             _LOGGER.exception("Error while testing credentials")
@@ -18,6 +18,32 @@ CONF_PORT: Final = "port"
 CONF_API_KEY: Final = "api_key"
 CONF_VERIFY_SSL: Final = "verify_ssl"
 CONF_CREATE_CHORE_BUTTONS: Final = "create_chore_buttons"
+CONF_MAX_CONCURRENT_REQUESTS: Final = "max_concurrent_requests"
+CONF_MAX_UPDATE_INTERVAL: Final = "max_update_interval"
+CONF_MAX_ATTRIBUTE_ITEMS: Final = "max_attribute_items"
+CONF_MEAL_PLAN_DAYS: Final = "meal_plan_days"
+
+DEFAULT_MAX_CONCURRENT_REQUESTS: Final = 4
+DEFAULT_MAX_UPDATE_INTERVAL: Final = timedelta(minutes=10)
+# Number of items listed in the state attributes of an entity. The full
+# lists are available through the get_items service.
+DEFAULT_MAX_ATTRIBUTE_ITEMS: Final = 50
+# Number of days, starting today, the meal plan is fetched for. 0 fetches
+# all upcoming days.
+DEFAULT_MEAL_PLAN_DAYS: Final = 7
+
+# Adaptive polling: poll every ACTIVE_UPDATE_INTERVAL for ACTIVITY_WINDOW
+# after a write, and multiply the interval by IDLE_BACKOFF_FACTOR after
+# each refresh that found no change.
+ACTIVE_UPDATE_INTERVAL: Final = timedelta(seconds=5)
+ACTIVITY_WINDOW: Final = timedelta(minutes=2)
+IDLE_BACKOFF_FACTOR: Final = 1.5
+
+# Refreshes after writes are coalesced: the dirty keys are refetched once no
+# write happened for REFRESH_QUIET_WINDOW, but at most REFRESH_MAX_DELAY
+# after the first write of a burst.
+REFRESH_QUIET_WINDOW: Final = timedelta(seconds=2)
+REFRESH_MAX_DELAY: Final = timedelta(seconds=10)
 
 STARTUP_MESSAGE: Final = f"""
 -------------------------------------------------------------------
@@ -45,6 +71,50 @@ ATTR_OVERDUE_BATTERIES: Final = "overdue_batteries"
 ATTR_OVERDUE_CHORES: Final = "overdue_chores"
 ATTR_OVERDUE_PRODUCTS: Final = "overdue_products"
 ATTR_OVERDUE_TASKS: Final = "overdue_tasks"
+ATTR_POLLING_INTERVAL: Final = "polling_interval"
 ATTR_SHOPPING_LIST: Final = "shopping_list"
 ATTR_STOCK: Final = "stock"
 ATTR_TASKS: Final = "tasks"
+
+# Coordinator keys grouped by the Grocy domain they are polled with. Every
+# domain has its own coordinator, update interval and failure domain.
+UPDATE_DOMAINS: Final = {
+    ATTR_STOCK: (
+        ATTR_STOCK,
+        ATTR_EXPIRING_PRODUCTS,
+        ATTR_EXPIRED_PRODUCTS,
+        ATTR_OVERDUE_PRODUCTS,
+        ATTR_MISSING_PRODUCTS,
+    ),
+    ATTR_CHORES: (ATTR_CHORES, ATTR_OVERDUE_CHORES),
+    ATTR_TASKS: (ATTR_TASKS, ATTR_OVERDUE_TASKS),
+    ATTR_BATTERIES: (ATTR_BATTERIES, ATTR_OVERDUE_BATTERIES),
+    ATTR_MEAL_PLAN: (ATTR_MEAL_PLAN,),
+    ATTR_SHOPPING_LIST: (ATTR_SHOPPING_LIST,),
+}
+
+# Options flow keys holding the update interval (in seconds) per domain.
+CONF_UPDATE_INTERVALS: Final = {
+    domain: f"{domain}_update_interval" for domain in UPDATE_DOMAINS
+}
+
+# Options flow keys holding the comma separated fields listed in the state
+# attributes per domain. All fields are listed when the option is empty.
+CONF_ATTRIBUTE_FIELDS: Final = {
+    domain: f"{domain}_attribute_fields" for domain in UPDATE_DOMAINS
+}
+
+DEFAULT_UPDATE_INTERVALS: Final = {
+    ATTR_STOCK: SCAN_INTERVAL,
+    ATTR_CHORES: SCAN_INTERVAL,
+    ATTR_TASKS: SCAN_INTERVAL,
+    ATTR_BATTERIES: timedelta(minutes=5),
+    ATTR_MEAL_PLAN: timedelta(minutes=5),
+    ATTR_SHOPPING_LIST: SCAN_INTERVAL,
+}
+
+# Keys whose content depends on the current time and not only on the
+# Grocy database, so they are refreshed even when the database is unchanged.
+TIME_DEPENDENT_KEYS: Final = frozenset(
+    {ATTR_OVERDUE_BATTERIES, ATTR_OVERDUE_CHORES, ATTR_OVERDUE_TASKS}
+)
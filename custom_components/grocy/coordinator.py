@@ -1,29 +1,58 @@
 """Data update coordinator for Grocy."""
 from __future__ import annotations
 
+import asyncio
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from functools import partial
 import logging
-from typing import Any, Dict, List
+import time
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Set
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from .changes import ChangeTracker
 from .const import (
     CONF_API_KEY,
+    CONF_ATTRIBUTE_FIELDS,
+    CONF_MAX_ATTRIBUTE_ITEMS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MEAL_PLAN_DAYS,
     CONF_PORT,
+    CONF_UPDATE_INTERVALS,
     CONF_URL,
     CONF_VERIFY_SSL,
+    DEFAULT_MAX_ATTRIBUTE_ITEMS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MEAL_PLAN_DAYS,
+    DEFAULT_UPDATE_INTERVALS,
     DOMAIN,
-    SCAN_INTERVAL,
+    TIME_DEPENDENT_KEYS,
+    UPDATE_DOMAINS,
 )
+from .grocy_api import AsyncGrocy
 from .grocy_data import GrocyData
 from .helpers import extract_base_url_and_path
+from .optimistic import DERIVED_KEYS
+from .polling import AdaptivePollingController, DirtyKeyRefreshQueue, next_due_time
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class GrocyDataUpdateCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
-    """Grocy data update coordinator."""
+    """Grocy data update coordinator.
+
+    Entities subscribe to this coordinator. It does not poll by itself:
+    every Grocy domain (stock, chores, tasks, ...) is polled by its own
+    `GrocyDomainUpdateCoordinator` on its own interval, and their results
+    are merged into `data`. Refreshing this coordinator refreshes all
+    domains at once.
+    """
 
     def __init__(
         self,
@@ -35,7 +64,7 @@ class GrocyDataUpdateCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=SCAN_INTERVAL,
+            update_interval=None,
         )
 
         # store the related config entry for entity/device identification
@@ -48,54 +77,497 @@ class GrocyDataUpdateCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
 
         (base_url, path) = extract_base_url_and_path(url)
 
-        # Import pygrocy2.Grocy lazily so importing this module doesn't
-        # fail during integration discovery when the dependency is not
-        # available in the development environment.
-        try:
-            from pygrocy2.grocy import Grocy
-        except Exception as err:  # pragma: no cover - environment dependent
-            _LOGGER.error("pygrocy2 is not installed: %s", err)
-            raise
-
-        self.grocy_api = Grocy(base_url, api_key, path=path, port=port, verify_ssl=verify_ssl)
-        self.grocy_data = GrocyData(hass, self.grocy_api)
+        self.grocy_api = AsyncGrocy(
+            async_get_clientsession(hass, verify_ssl), base_url, api_key, port=port, path=path
+        )
+        self.grocy_data = GrocyData(
+            hass, self.grocy_api, meal_plan_days=self.meal_plan_days
+        )
 
         self.available_entities: List[str] = []
         self.entities: List[Entity] = []
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data."""
-        data: dict[str, Any] = {}
+        # Keys fetched regardless of entities (e.g. chores for the chore
+        # buttons) and keys fetched by the warm-up refresh at setup, before
+        # any entity exists.
+        self.required_keys: Set[str] = set()
+        self.warm_up_keys: Set[str] = set()
+        self.setup_timings: Dict[str, float] = {}
+
+        # Listener contexts (entity keys) whose data changed since the
+        # last notification; None notifies every listener.
+        self._changes = ChangeTracker()
+        self._changed_contexts: Set[str] | None = None
+        self._domain_success: Dict[str, bool] = {}
+        self.state_write_stats: Dict[str, int] = {
+            "state_writes": 0,
+            "state_writes_skipped": 0,
+        }
+
+        self.domain_coordinators: Dict[str, GrocyDomainUpdateCoordinator] = {
+            domain: GrocyDomainUpdateCoordinator(hass, self, domain, keys)
+            for domain, keys in UPDATE_DOMAINS.items()
+        }
+        self._domain_unsubscribers: List[Callable[[], None]] = []
+        self._refreshing_domains = False
+        self.refresh_queue = DirtyKeyRefreshQueue(
+            self.async_refresh_keys,
+            create_task=partial(
+                self.config_entry.async_create_background_task,
+                hass,
+                name=f"{DOMAIN}_refresh_dirty_keys",
+            ),
+        )
+
+    @property
+    def max_concurrent_requests(self) -> int:
+        """Return the maximum number of Grocy requests run in parallel."""
+        try:
+            return int(
+                self.config_entry.options.get(
+                    CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                )
+            )
+        except (AttributeError, TypeError, ValueError):
+            return DEFAULT_MAX_CONCURRENT_REQUESTS
+
+    @property
+    def max_update_interval(self) -> timedelta:
+        """Return the interval idle domains back off to."""
+        try:
+            seconds = self.config_entry.options.get(CONF_MAX_UPDATE_INTERVAL)
+        except AttributeError:
+            return DEFAULT_MAX_UPDATE_INTERVAL
+        if not seconds:
+            return DEFAULT_MAX_UPDATE_INTERVAL
+        return timedelta(seconds=int(seconds))
+
+    @property
+    def max_attribute_items(self) -> int:
+        """Return the number of items listed in the state attributes."""
+        try:
+            return int(
+                self.config_entry.options.get(
+                    CONF_MAX_ATTRIBUTE_ITEMS, DEFAULT_MAX_ATTRIBUTE_ITEMS
+                )
+            )
+        except (AttributeError, TypeError, ValueError):
+            return DEFAULT_MAX_ATTRIBUTE_ITEMS
+
+    @property
+    def meal_plan_days(self) -> int:
+        """Return the number of days the meal plan is fetched for."""
+        try:
+            return int(
+                self.config_entry.options.get(CONF_MEAL_PLAN_DAYS, DEFAULT_MEAL_PLAN_DAYS)
+            )
+        except (AttributeError, TypeError, ValueError):
+            return DEFAULT_MEAL_PLAN_DAYS
+
+    def attribute_fields(self, entity_key: str) -> FrozenSet[str] | None:
+        """Return the fields listed in the attributes of a key, None for all."""
+        for domain, keys in UPDATE_DOMAINS.items():
+            if entity_key in keys:
+                break
+        else:
+            return None
+        try:
+            option = self.config_entry.options.get(CONF_ATTRIBUTE_FIELDS[domain])
+        except AttributeError:
+            return None
+        if not option:
+            return None
+        return frozenset(
+            field.strip() for field in str(option).split(",") if field.strip()
+        ) or None
+
+    @property
+    def polling_intervals(self) -> Dict[str, float]:
+        """Return the current update interval of every domain in seconds."""
+        return {
+            domain: coordinator.polling.current_interval.total_seconds()
+            for domain, coordinator in self.domain_coordinators.items()
+        }
+
+    @callback
+    def async_record_activity(self, entity_keys: Iterable[str] | None = None) -> None:
+        """Poll the domains of the given keys (default: all) quickly after a write."""
+        if entity_keys is None:
+            domains = list(self.domain_coordinators.values())
+        else:
+            domains = {
+                coordinator
+                for key in entity_keys
+                if (coordinator := self.domain_coordinator_for(key)) is not None
+            }
+        for coordinator in domains:
+            coordinator.async_record_activity()
+
+    def enabled_keys(self) -> List[str]:
+        """Return the keys of all enabled entities and the required keys.
+
+        Before the platforms added their entities, the warm-up keys are
+        used instead, so the setup fetches everything once up front.
+        """
+        keys: List[str] = []
 
         for entity in self.entities:
             if not entity.enabled:
                 _LOGGER.debug("Entity %s is disabled.", entity.entity_id)
                 continue
 
-            try:
-                data[
-                    entity.entity_description.key
-                ] = await self.grocy_data.async_update_data(
-                    entity.entity_description.key
-                )
-            except Exception as error:  # pylint: disable=broad-except
-                raise UpdateFailed(f"Update failed: {error}") from error
+            keys.append(entity.entity_description.key)
+
+        if not self.entities:
+            keys.extend(self.warm_up_keys)
+        keys.extend(self.required_keys)
+
+        return list(dict.fromkeys(keys))
+
+    def record_setup_stage(self, stage: str, seconds: float) -> None:
+        """Record how long a setup stage took."""
+        self.setup_timings[stage] = round(seconds, 3)
+        _LOGGER.debug("Grocy setup stage '%s' took %.3f s", stage, seconds)
+
+    @contextmanager
+    def timed_setup_stage(self, stage: str) -> Iterator[None]:
+        """Measure the setup stage run inside the context."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record_setup_stage(stage, time.monotonic() - start)
+
+    def domain_coordinator_for(self, entity_key: str) -> GrocyDomainUpdateCoordinator | None:
+        """Return the domain coordinator polling the given key, if any."""
+        for coordinator in self.domain_coordinators.values():
+            if entity_key in coordinator.keys:
+                return coordinator
+        return None
+
+    def key_update_success(self, entity_key: str) -> bool:
+        """Return whether the last update of the key's domain succeeded."""
+        coordinator = self.domain_coordinator_for(entity_key)
+        if coordinator is None:
+            return self.last_update_success
+        return coordinator.last_update_success
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch data.
+
+        Refreshes every domain concurrently. The refresh only fails when
+        all domains fail; otherwise the failing domains keep retrying on
+        their own schedule.
+        """
+        domains = list(self.domain_coordinators.values())
+        self._refreshing_domains = True
+        try:
+            await asyncio.gather(
+                *(coordinator.async_refresh() for coordinator in domains)
+            )
+        finally:
+            self._refreshing_domains = False
+
+        if not any(coordinator.last_update_success for coordinator in domains):
+            error = next(
+                (c.last_exception for c in domains if c.last_exception), None
+            )
+            raise UpdateFailed(f"Update failed: {error}")
 
+        self.async_subscribe_domains()
+        data, self._changed_contexts = self._publish(self._merged_data())
         return data
 
+    def _publish(self, data: dict[str, Any]) -> tuple[dict[str, Any], Set[str]]:
+        """Return the data to publish and the listener contexts to notify.
+
+        Besides the keys whose content changed, all keys of a domain whose
+        update started or stopped failing are notified, so their entities
+        update their availability.
+        """
+        data, changed = self._changes.merge(data)
+        for domain, coordinator in self.domain_coordinators.items():
+            success = coordinator.last_update_success
+            if self._domain_success.get(domain, True) != success:
+                changed |= self._changes.contexts_for_keys(coordinator.keys)
+            self._domain_success[domain] = success
+        return data, changed
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners whose data changed.
+
+        Entities listen with their key as context and are only updated
+        when their key's content changed; listeners without context are
+        always updated.
+        """
+        changed, self._changed_contexts = self._changed_contexts, None
+        for update_callback, context in list(self._listeners.values()):
+            if changed is None or context is None or context in changed:
+                update_callback()
+                if context is not None:
+                    self.state_write_stats["state_writes"] += 1
+            else:
+                self.state_write_stats["state_writes_skipped"] += 1
+
+    def _merged_data(self) -> dict[str, Any]:
+        """Return the current data with the data of every domain merged in."""
+        data = dict(self.data or {})
+        for coordinator in self.domain_coordinators.values():
+            if coordinator.data:
+                data.update(coordinator.data)
+        return data
+
+    @callback
+    def async_subscribe_domains(self) -> None:
+        """Listen to the domain coordinators so they keep polling.
+
+        Called after the first successful refresh, or right away when the
+        setup starts from cached data, so the domains keep polling even
+        when Grocy is not reachable yet.
+        """
+        if self._domain_unsubscribers:
+            return
+        for coordinator in self.domain_coordinators.values():
+            self._domain_unsubscribers.append(
+                coordinator.async_add_listener(
+                    partial(self._async_handle_domain_update, coordinator)
+                )
+            )
+
+    @callback
+    def _async_handle_domain_update(
+        self, coordinator: GrocyDomainUpdateCoordinator
+    ) -> None:
+        """Merge a domain's data after it refreshed and notify entities."""
+        if self._refreshing_domains:
+            # The full refresh merges and notifies once all domains are done
+            return
+        _LOGGER.debug("Grocy domain '%s' updated", coordinator.domain)
+        self.last_update_success = any(
+            domain.last_update_success for domain in self.domain_coordinators.values()
+        )
+        self.data, self._changed_contexts = self._publish(self._merged_data())
+        _LOGGER.debug("Grocy data changed for %s", self._changed_contexts)
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Stop polling all domains."""
+        self.refresh_queue.cancel()
+        for unsubscribe in self._domain_unsubscribers:
+            unsubscribe()
+        self._domain_unsubscribers.clear()
+        for coordinator in self.domain_coordinators.values():
+            await coordinator.async_shutdown()
+        await super().async_shutdown()
+
+    async def async_refresh_keys(self, entity_keys: Iterable[str]) -> None:
+        """Fetch only the given keys and merge them into the data.
+
+        Keys are refreshed when an entity using them is enabled or when
+        they are already present in the data (e.g. chores fetched for the
+        chore buttons). Failures are logged; the regular polling of the
+        affected domains picks them up again.
+        """
+        current = self.data or {}
+        enabled = set(self.enabled_keys())
+        keys = [
+            key
+            for key in dict.fromkeys(entity_keys)
+            if key in enabled or key in current
+        ]
+        if not keys:
+            return
+
+        _LOGGER.debug("Refreshing Grocy keys %s", keys)
+        try:
+            fetched = await self.grocy_data.async_update_many(
+                keys, self.max_concurrent_requests
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            _LOGGER.warning("Failed to refresh %s: %s", keys, error)
+            return
+
+        self.async_set_updated_keys(fetched)
+
+    @callback
+    def async_set_updated_keys(self, updated: Dict[str, Any]) -> None:
+        """Merge data for some keys and notify the listeners."""
+        remaining = dict(updated)
+        for coordinator in self.domain_coordinators.values():
+            domain_data = {
+                key: remaining.pop(key)
+                for key in list(remaining)
+                if key in coordinator.keys
+            }
+            if domain_data:
+                # The hub merges and notifies through its domain listener
+                coordinator.async_set_updated_data(
+                    {**(coordinator.data or {}), **domain_data}
+                )
+
+        if remaining or not self._domain_unsubscribers:
+            self.data, self._changed_contexts = self._publish(
+                {**self._merged_data(), **remaining}
+            )
+            self.async_update_listeners()
+
+    @callback
+    def async_apply_local_change(
+        self, entity_key: str, change: Callable[..., Any], *args: Any
+    ) -> None:
+        """Apply the expected result of a write to the data right away.
+
+        `change` receives the current data of the key followed by `args`
+        and returns the updated data. Keys derived from it, such as the
+        overdue chores, are recomputed and the entities are notified
+        without waiting for Grocy; the next fetch reconciles the data.
+        """
+        if not self.data or self.data.get(entity_key) is None:
+            return
+        try:
+            updated = {entity_key: change(self.data[entity_key], *args)}
+            if entity_key in DERIVED_KEYS:
+                derived_key, derive = DERIVED_KEYS[entity_key]
+                if derived_key in self.data:
+                    updated[derived_key] = derive(updated[entity_key])
+        except Exception as error:  # pylint: disable=broad-except
+            _LOGGER.debug("Could not apply local change to %s: %s", entity_key, error)
+            return
+
+        self.async_set_updated_keys(updated)
+
+    @callback
+    def async_mark_keys_dirty(self, entity_keys: Iterable[str]) -> None:
+        """Schedule a coalesced refresh of keys changed by a write.
+
+        Fast polling of the affected domains starts right away, while the
+        keys themselves are refetched once the burst of writes is over.
+        """
+        entity_keys = list(entity_keys)
+        self.async_record_activity(entity_keys)
+        self.refresh_queue.mark_dirty(entity_keys)
+
     async def async_force_update_entity(self, entity_key: str) -> None:
-        """Force immediate update of an entity by key.
+        """Force immediate update of the data for an entity key."""
+        await self.async_refresh_keys([entity_key])
 
-        Finds the first registered entity whose description.key matches
-        `entity_key` and forces an immediate state refresh.
+
+class GrocyDomainUpdateCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
+    """Coordinator polling the keys of a single Grocy domain."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        hub: GrocyDataUpdateCoordinator,
+        domain: str,
+        keys: tuple[str, ...],
+    ) -> None:
+        """Initialize the domain coordinator."""
+        self.hub = hub
+        self.domain = domain
+        self.keys = frozenset(keys)
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{domain}",
+            update_interval=self._configured_interval(),
+        )
+
+        self.config_entry = hub.config_entry
+        self.polling = AdaptivePollingController(
+            self.update_interval, hub.max_update_interval
+        )
+
+        # Grocy's db-changed-time and the day of the last full fetch. While
+        # both are unchanged the previously fetched data is still current.
+        self._last_db_changed: datetime | None = None
+        self._last_full_fetch_date: date | None = None
+
+    def _configured_interval(self) -> timedelta:
+        """Return the update interval set in the options flow."""
+        default = DEFAULT_UPDATE_INTERVALS[self.domain]
+        try:
+            seconds = self.hub.config_entry.options.get(
+                CONF_UPDATE_INTERVALS[self.domain]
+            )
+        except AttributeError:
+            return default
+        if not seconds:
+            return default
+        return timedelta(seconds=int(seconds))
+
+    @callback
+    def async_record_activity(self) -> None:
+        """Switch to fast polling after a write and reschedule the next poll."""
+        self.update_interval = self.polling.record_activity()
+        if self._listeners:
+            self._schedule_refresh()
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch data.
+
+        Grocy's db-changed-time is polled first. When it has not moved
+        since the last full fetch, the previous data is reused and only
+        time dependent or not yet fetched keys are updated; time dependent
+        keys are then derived from the cached source lists. All keys are
+        fetched concurrently, so a refresh takes as long as the slowest
+        Grocy endpoint. Afterwards the adaptive polling controller picks
+        the interval until the next poll.
         """
-        entity = next(
-            (
-                entity
-                for entity in self.entities
-                if entity.entity_description.key == entity_key
-            ),
-            None,
+        keys = [key for key in self.hub.enabled_keys() if key in self.keys]
+        if not keys:
+            self.update_interval = self.polling.next_interval(changed=False)
+            return {}
+
+        try:
+            db_changed = await self.hub.grocy_data.async_get_last_db_changed()
+        except Exception as error:  # pylint: disable=broad-except
+            raise UpdateFailed(f"Update failed: {error}") from error
+
+        previous = self.data or {}
+        today = date.today()
+        unchanged = (
+            db_changed is not None
+            and db_changed == self._last_db_changed
+            and today == self._last_full_fetch_date
         )
-        if entity:
-            await entity.async_update_ha_state(force_refresh=True)
+        if unchanged:
+            keys_to_fetch = [
+                key
+                for key in keys
+                if key in TIME_DEPENDENT_KEYS or key not in previous
+            ]
+            _LOGGER.debug(
+                "Grocy database unchanged since %s, refreshing %s",
+                db_changed,
+                keys_to_fetch,
+            )
+        else:
+            keys_to_fetch = keys
+
+        try:
+            fetched = await self.hub.grocy_data.async_update_many(
+                keys_to_fetch,
+                self.hub.max_concurrent_requests,
+                cached_sources=unchanged,
+                db_changed=db_changed,
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            raise UpdateFailed(f"Update failed: {error}") from error
+
+        if not unchanged:
+            self._last_db_changed = db_changed
+            self._last_full_fetch_date = today
+
+        data = {key: previous[key] for key in keys if key in previous}
+        data.update(fetched)
+
+        self.update_interval = self.polling.next_interval(
+            changed=not unchanged, next_due=next_due_time(data)
+        )
+        _LOGGER.debug(
+            "Grocy domain '%s' next update in %s", self.domain, self.update_interval
+        )
+        return data
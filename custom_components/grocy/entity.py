@@ -1,9 +1,8 @@
 """Entity for Grocy."""
 from __future__ import annotations
 
-import json
 from collections.abc import Mapping
-from typing import Any
+from typing import AbstractSet, Any, Dict, List
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.device_registry import DeviceEntryType
@@ -12,7 +11,8 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, NAME, VERSION
 from .coordinator import GrocyDataUpdateCoordinator
-from .json_encoder import CustomJSONEncoder
+from .helpers import item_as_dict
+from .json_encoder import to_json_safe
 
 
 class GrocyEntity(CoordinatorEntity[GrocyDataUpdateCoordinator]):
@@ -25,8 +25,12 @@ class GrocyEntity(CoordinatorEntity[GrocyDataUpdateCoordinator]):
         config_entry: ConfigEntry,
         device_suffix: str | None = None,
     ) -> None:
-        """Initialize entity."""
-        super().__init__(coordinator)
+        """Initialize entity.
+
+        The description key is the listener context: the coordinator only
+        updates the entity when the data of its key changed.
+        """
+        super().__init__(coordinator, context=description.key)
         self._attr_name = description.name
         self._attr_unique_id = f"{config_entry.entry_id}{description.key.lower()}"
         self.entity_description = description
@@ -67,16 +71,51 @@ class GrocyEntity(CoordinatorEntity[GrocyDataUpdateCoordinator]):
             entry_type=DeviceEntryType.SERVICE,
         )
 
+    @property
+    def available(self) -> bool:
+        """Return if the last update of this entity's Grocy domain succeeded."""
+        return self.coordinator.key_update_success(self.entity_description.key)
+
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
-        """Return the extra state attributes."""
+        """Return the extra state attributes.
+
+        The attributes are converted once per version of the key's data:
+        every coordinator update replaces the data of the keys it
+        refreshed, so unchanged data is never serialized again. Lists are
+        cut to the configured number of items and fields; `count` holds
+        the full length.
+        """
         data = self.coordinator.data.get(self.entity_description.key)
-        if data and hasattr(self.entity_description, "attributes_fn"):
-            return json.loads(
-                json.dumps(
-                    self.entity_description.attributes_fn(data),
-                    cls=CustomJSONEncoder,
-                )
-            )
-
-        return None
+        if not data or not hasattr(self.entity_description, "attributes_fn"):
+            return None
+
+        max_items = self.coordinator.max_attribute_items
+        fields = self.coordinator.attribute_fields(self.entity_description.key)
+        cached = getattr(self, "_attributes_cache", None)
+        if cached is not None and cached[0] is data and cached[1] == (max_items, fields):
+            return cached[2]
+
+        list_attribute = getattr(self.entity_description, "list_attribute", None)
+        if list_attribute:
+            attributes = list_attributes(list_attribute, data, max_items, fields)
+        else:
+            attributes = to_json_safe(self.entity_description.attributes_fn(data))
+        self._attributes_cache = (data, (max_items, fields), attributes)
+        return attributes
+
+
+def list_attributes(
+    name: str,
+    data: List[Any],
+    max_items: int,
+    fields: AbstractSet[str] | None = None,
+) -> Dict[str, Any]:
+    """Return the first items of a list and its length as attributes.
+
+    With fields given, only these fields of every item are listed.
+    """
+    return {
+        name: [to_json_safe(item_as_dict(item, fields)) for item in data[:max_items]],
+        "count": len(data),
+    }
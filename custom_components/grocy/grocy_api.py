@@ -0,0 +1,576 @@
+"""Async Grocy API client on Home Assistant's shared aiohttp session.
+
+pygrocy2 talks to Grocy through `requests`, which blocks and has to run in
+the executor. The clients here send the same requests through the aiohttp
+session Home Assistant shares between integrations, which keeps the
+connections to Grocy alive, and return pygrocy2's response and data
+models, so the data looks the same to the rest of the integration.
+
+Only the calls the integration makes are implemented.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import Any, Dict, List, NamedTuple
+from urllib.parse import urljoin
+
+import aiohttp
+from homeassistant.util.json import json_loads
+from pygrocy2.data_models.generic import EntityType
+from pygrocy2.data_models.meal_items import MealPlanItem
+from pygrocy2.data_models.product import ShoppingListProduct
+from pygrocy2.data_models.system import SystemConfig, SystemInfo
+from pygrocy2.data_models.task import Task
+from pygrocy2.errors import GrocyError
+from pygrocy2.grocy_api_client import (
+    DEFAULT_PORT_NUMBER,
+    BatteryDetailsResponse,
+    ChoreDetailsResponse,
+    CurrentBatteryResponse,
+    CurrentChoreResponse,
+    CurrentStockResponse,
+    CurrentVolatilStockResponse,
+    MealPlanResponse,
+    MealPlanSectionResponse,
+    ProductDetailsResponse,
+    RecipeDetailsResponse,
+    ShoppingListItem,
+    SystemConfigDto,
+    SystemInfoDto,
+    TaskResponse,
+    TransactionType,
+    UserDto,
+)
+from pygrocy2.utils import grocy_datetime_str, localize_datetime, parse_date
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _entity_type(entity_type: EntityType | str) -> str:
+    """Return the name of an entity type."""
+    return getattr(entity_type, "value", entity_type)
+
+
+class GrocyApiError(GrocyError):
+    """Error response of the Grocy API.
+
+    A `GrocyError` like pygrocy2 raises, built from the status and the
+    error message instead of a `requests` response.
+    """
+
+    def __init__(self, status_code: int, message: str | None) -> None:
+        """Initialize the error."""
+        Exception.__init__(self, status_code, message)
+        self._status_code = status_code
+        self._message = message
+
+
+class ProductStock(NamedTuple):
+    """The stock of a product, read from its details.
+
+    `row` is the product's row in `/stock`, or None if it is not in
+    stock. The parent product's aggregated amounts change with it.
+    """
+
+    row: CurrentStockResponse | None
+    parent_product_id: int | None
+
+
+def _product_stock(details: Dict[str, Any]) -> ProductStock:
+    """Return the stock of a product from its `/stock/products` details."""
+    if "product" not in details:
+        raise ValueError("product details without product")
+    parent_product_id = details["product"].get("parent_product_id")
+    parent_product_id = int(parent_product_id) if parent_product_id not in (None, "") else None
+
+    amount = float(details.get("stock_amount") or 0)
+    amount_aggregated = float(details.get("stock_amount_aggregated") or amount)
+    if amount <= 0 and amount_aggregated <= 0:
+        return ProductStock(None, parent_product_id)
+
+    best_before_date = details.get("next_due_date") or details.get("next_best_before_date")
+    if not best_before_date:
+        raise ValueError("product details without due date")
+    amount_opened = float(details.get("stock_amount_opened") or 0)
+    row = CurrentStockResponse(
+        product_id=details["product"]["id"],
+        amount=amount,
+        best_before_date=best_before_date,
+        amount_opened=amount_opened,
+        amount_aggregated=amount_aggregated,
+        amount_opened_aggregated=float(
+            details.get("stock_amount_opened_aggregated") or amount_opened
+        ),
+        is_aggregated_amount=str(details.get("is_aggregated_amount") or "0") == "1",
+        product=details["product"],
+    )
+    return ProductStock(row, parent_product_id)
+
+
+class AsyncGrocyApiClient:
+    """Async counterpart of pygrocy2's `GrocyApiClient`."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str,
+        api_key: str,
+        port: int = DEFAULT_PORT_NUMBER,
+        path: str | None = None,
+    ) -> None:
+        """Initialize the client."""
+        self._session = session
+        if path:
+            self._base_url = f"{base_url}:{port}/{path}/api/"
+        else:
+            self._base_url = f"{base_url}:{port}/api/"
+        if api_key == "demo_mode":
+            self._headers = {"accept": "application/json"}
+        else:
+            self._headers = {"accept": "application/json", "GROCY-API-KEY": api_key}
+
+    async def _do_request(
+        self,
+        method: str,
+        end_url: str,
+        query_filters: List[str] | None = None,
+        data: Any = None,
+        params: Dict[str, str] | None = None,
+    ) -> Any:
+        """Send a request and return the parsed JSON response, if any."""
+        params = [
+            *(("query[]", query_filter) for query_filter in query_filters or []),
+            *(params or {}).items(),
+        ]
+        async with self._session.request(
+            method,
+            urljoin(self._base_url, end_url),
+            headers=self._headers,
+            params=params or None,
+            json=data,
+        ) as resp:
+            body = await resp.read()
+
+        _LOGGER.debug("-->\t%s /%s", method, end_url)
+        _LOGGER.debug("<--\t%d for /%s", resp.status, end_url)
+
+        if resp.status >= 400:
+            message = None
+            if body:
+                try:
+                    message = json_loads(body).get("error_message")
+                except (ValueError, AttributeError):
+                    message = body.decode(errors="replace")
+            raise GrocyApiError(resp.status, message)
+        if body:
+            return json_loads(body)
+        return None
+
+    async def _do_get_request(
+        self,
+        end_url: str,
+        query_filters: List[str] | None = None,
+        params: Dict[str, str] | None = None,
+    ) -> Any:
+        """Send a GET request."""
+        return await self._do_request("GET", end_url, query_filters, params=params)
+
+    async def _do_post_request(self, end_url: str, data: Any) -> Any:
+        """Send a POST request."""
+        return await self._do_request("POST", end_url, data=data)
+
+    async def _do_put_request(self, end_url: str, data: Any) -> Any:
+        """Send a PUT request."""
+        return await self._do_request("PUT", end_url, data=data)
+
+    async def _do_delete_request(self, end_url: str) -> Any:
+        """Send a DELETE request."""
+        return await self._do_request("DELETE", end_url)
+
+    async def get_stock(self) -> List[CurrentStockResponse]:
+        """Return the current stock."""
+        parsed_json = await self._do_get_request("stock")
+        return [CurrentStockResponse(**row) for row in parsed_json or []]
+
+    async def get_volatile_stock(self) -> CurrentVolatilStockResponse:
+        """Return the due, overdue, expired and missing products."""
+        return CurrentVolatilStockResponse(**await self._do_get_request("stock/volatile"))
+
+    async def get_product(self, product_id: int) -> ProductDetailsResponse | None:
+        """Return the details of a product."""
+        parsed_json = await self._do_get_request(f"stock/products/{product_id}")
+        return ProductDetailsResponse(**parsed_json) if parsed_json else None
+
+    async def get_product_stock(self, product_id: int) -> ProductStock:
+        """Return the stock of a product.
+
+        Raises `ValueError` if the details lack the fields of a stock row.
+        """
+        parsed_json = await self._do_get_request(f"stock/products/{product_id}")
+        return _product_stock(parsed_json) if parsed_json else ProductStock(None, None)
+
+    async def get_chores(
+        self, query_filters: List[str] | None = None
+    ) -> List[CurrentChoreResponse]:
+        """Return the current chores."""
+        parsed_json = await self._do_get_request("chores", query_filters)
+        return [CurrentChoreResponse(**chore) for chore in parsed_json or []]
+
+    async def get_chore(self, chore_id: int) -> ChoreDetailsResponse | None:
+        """Return the details of a chore."""
+        parsed_json = await self._do_get_request(f"chores/{chore_id}")
+        return ChoreDetailsResponse(**parsed_json) if parsed_json else None
+
+    async def get_batteries(
+        self, query_filters: List[str] | None = None
+    ) -> List[CurrentBatteryResponse]:
+        """Return the current batteries."""
+        parsed_json = await self._do_get_request("batteries", query_filters)
+        return [CurrentBatteryResponse(**battery) for battery in parsed_json or []]
+
+    async def get_battery(self, battery_id: int) -> BatteryDetailsResponse | None:
+        """Return the details of a battery."""
+        parsed_json = await self._do_get_request(f"batteries/{battery_id}")
+        return BatteryDetailsResponse(**parsed_json) if parsed_json else None
+
+    async def get_users(self) -> List[UserDto]:
+        """Return the users."""
+        parsed_json = await self._do_get_request("users")
+        return [UserDto(**user) for user in parsed_json or []]
+
+    async def get_shopping_list(
+        self, query_filters: List[str] | None = None
+    ) -> List[ShoppingListItem]:
+        """Return the shopping list items."""
+        parsed_json = await self._do_get_request("objects/shopping_list", query_filters)
+        return [ShoppingListItem(**item) for item in parsed_json or []]
+
+    async def get_tasks(self, query_filters: List[str] | None = None) -> List[TaskResponse]:
+        """Return the tasks."""
+        parsed_json = await self._do_get_request("tasks", query_filters)
+        return [TaskResponse(**task) for task in parsed_json or []]
+
+    async def get_meal_plan(
+        self, query_filters: List[str] | None = None
+    ) -> List[MealPlanResponse]:
+        """Return the meal plan."""
+        parsed_json = await self._do_get_request("objects/meal_plan", query_filters)
+        return [MealPlanResponse(**item) for item in parsed_json or []]
+
+    async def get_recipe(self, recipe_id: int) -> RecipeDetailsResponse | None:
+        """Return a recipe."""
+        parsed_json = await self._do_get_request(f"objects/recipes/{recipe_id}")
+        return RecipeDetailsResponse(**parsed_json) if parsed_json else None
+
+    async def get_meal_plan_section(
+        self, section_id: int
+    ) -> MealPlanSectionResponse | None:
+        """Return a meal plan section."""
+        parsed_json = await self._do_get_request(
+            "objects/meal_plan_sections", [f"id={section_id}"]
+        )
+        if parsed_json and len(parsed_json) == 1:
+            return MealPlanSectionResponse(**parsed_json[0])
+        return None
+
+    async def get_generic_objects_for_type(
+        self, entity_type: str, query_filters: List[str] | None = None
+    ) -> List[Dict[str, Any]] | None:
+        """Return the objects of an entity type."""
+        return await self._do_get_request(f"objects/{entity_type}", query_filters)
+
+    async def get_last_object_id(self, entity_type: str) -> int | None:
+        """Return the highest id of an entity type, or None if there are none."""
+        parsed_json = await self._do_get_request(
+            f"objects/{entity_type}", params={"order": "id:desc", "limit": "1"}
+        )
+        return int(parsed_json[0]["id"]) if parsed_json else None
+
+    async def get_last_db_changed(self) -> datetime | None:
+        """Return the time of the last change to the Grocy database."""
+        resp = await self._do_get_request("system/db-changed-time")
+        return parse_date(resp.get("changed_time"))
+
+    async def get_system_info(self) -> SystemInfoDto | None:
+        """Return the Grocy system information."""
+        parsed_json = await self._do_get_request("system/info")
+        return SystemInfoDto(**parsed_json) if parsed_json else None
+
+    async def get_system_config(self) -> SystemConfigDto | None:
+        """Return the Grocy configuration."""
+        parsed_json = await self._do_get_request("system/config")
+        return SystemConfigDto(**parsed_json) if parsed_json else None
+
+    async def add_product(
+        self,
+        product_id: int,
+        amount: float,
+        price: float,
+        best_before_date: datetime | None = None,
+        transaction_type: TransactionType = TransactionType.PURCHASE,
+    ) -> Any:
+        """Add an amount of a product to the stock."""
+        data = {
+            "amount": amount,
+            "transaction_type": transaction_type.value,
+            "price": price,
+        }
+        if best_before_date is not None:
+            data["best_before_date"] = best_before_date.strftime("%Y-%m-%d")
+        return await self._do_post_request(f"stock/products/{product_id}/add", data)
+
+    async def consume_product(
+        self,
+        product_id: int,
+        amount: float = 1,
+        spoiled: bool = False,
+        transaction_type: TransactionType = TransactionType.CONSUME,
+        allow_subproduct_substitution: bool = False,
+    ) -> None:
+        """Consume an amount of a product from the stock."""
+        data = {
+            "amount": amount,
+            "spoiled": spoiled,
+            "transaction_type": transaction_type.value,
+            "allow_subproduct_substitution": allow_subproduct_substitution,
+        }
+        await self._do_post_request(f"stock/products/{product_id}/consume", data)
+
+    async def open_product(
+        self,
+        product_id: int,
+        amount: float = 1,
+        allow_subproduct_substitution: bool = False,
+    ) -> None:
+        """Open an amount of a product in stock."""
+        data = {
+            "amount": amount,
+            "allow_subproduct_substitution": allow_subproduct_substitution,
+        }
+        await self._do_post_request(f"stock/products/{product_id}/open", data)
+
+    async def consume_recipe(self, recipe_id: int) -> None:
+        """Consume the ingredients of a recipe."""
+        await self._do_post_request(f"recipes/{recipe_id}/consume", None)
+
+    async def execute_chore(
+        self,
+        chore_id: int,
+        done_by: int | None = None,
+        tracked_time: datetime | None = None,
+        skipped: bool = False,
+    ) -> Any:
+        """Track an execution of a chore."""
+        data: Dict[str, Any] = {
+            "tracked_time": grocy_datetime_str(
+                localize_datetime(tracked_time or datetime.now())
+            ),
+            "skipped": skipped,
+        }
+        if done_by is not None:
+            data["done_by"] = done_by
+        return await self._do_post_request(f"chores/{chore_id}/execute", data)
+
+    async def complete_task(self, task_id: int, done_time: datetime | None = None) -> None:
+        """Mark a task as completed."""
+        data = {
+            "done_time": grocy_datetime_str(localize_datetime(done_time or datetime.now()))
+        }
+        await self._do_post_request(f"tasks/{task_id}/complete", data)
+
+    async def charge_battery(
+        self, battery_id: int, tracked_time: datetime | None = None
+    ) -> Any:
+        """Track a charge cycle of a battery."""
+        data = {
+            "tracked_time": grocy_datetime_str(
+                localize_datetime(tracked_time or datetime.now())
+            )
+        }
+        return await self._do_post_request(f"batteries/{battery_id}/charge", data)
+
+    async def add_missing_product_to_shopping_list(
+        self, shopping_list_id: int | None = None
+    ) -> None:
+        """Add the products below their minimum stock to a shopping list."""
+        data = {"list_id": shopping_list_id} if shopping_list_id else None
+        await self._do_post_request("stock/shoppinglist/add-missing-products", data)
+
+    async def remove_product_in_shopping_list(
+        self, product_id: int, shopping_list_id: int = 1, amount: float = 1
+    ) -> None:
+        """Remove an amount of a product from a shopping list."""
+        data = {
+            "product_id": product_id,
+            "list_id": shopping_list_id,
+            "product_amount": amount,
+        }
+        await self._do_post_request("stock/shoppinglist/remove-product", data)
+
+    async def add_generic(self, entity_type: str, data: Any) -> Any:
+        """Add an object."""
+        return await self._do_post_request(f"objects/{entity_type}", data)
+
+    async def update_generic(self, entity_type: str, object_id: int, data: Any) -> Any:
+        """Update an object."""
+        return await self._do_put_request(f"objects/{entity_type}/{object_id}", data)
+
+    async def delete_generic(self, entity_type: str, object_id: int) -> Any:
+        """Delete an object."""
+        return await self._do_delete_request(f"objects/{entity_type}/{object_id}")
+
+
+class AsyncGrocy:
+    """Async counterpart of pygrocy2's `Grocy`, returning its data models."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str,
+        api_key: str,
+        port: int = DEFAULT_PORT_NUMBER,
+        path: str | None = None,
+    ) -> None:
+        """Initialize the client."""
+        self._api_client = AsyncGrocyApiClient(session, base_url, api_key, port, path)
+
+    async def get_last_db_changed(self) -> datetime | None:
+        """Return the time of the last change to the Grocy database."""
+        return await self._api_client.get_last_db_changed()
+
+    async def get_stock(self) -> List[CurrentStockResponse]:
+        """Return the current stock."""
+        return await self._api_client.get_stock()
+
+    async def get_volatile_stock(self) -> CurrentVolatilStockResponse:
+        """Return the due, overdue, expired and missing products."""
+        return await self._api_client.get_volatile_stock()
+
+    async def get_product(self, product_id: int) -> ProductDetailsResponse | None:
+        """Return the details of a product."""
+        return await self._api_client.get_product(product_id)
+
+    async def get_product_stock(self, product_id: int) -> ProductStock:
+        """Return the stock of a product."""
+        return await self._api_client.get_product_stock(product_id)
+
+    async def get_chores(
+        self, query_filters: List[str] | None = None
+    ) -> List[CurrentChoreResponse]:
+        """Return the current chores."""
+        return await self._api_client.get_chores(query_filters)
+
+    async def get_chore(self, chore_id: int) -> ChoreDetailsResponse | None:
+        """Return the details of a chore."""
+        return await self._api_client.get_chore(chore_id)
+
+    async def get_batteries(
+        self, query_filters: List[str] | None = None
+    ) -> List[CurrentBatteryResponse]:
+        """Return the current batteries."""
+        return await self._api_client.get_batteries(query_filters)
+
+    async def get_battery(self, battery_id: int) -> BatteryDetailsResponse | None:
+        """Return the details of a battery."""
+        return await self._api_client.get_battery(battery_id)
+
+    async def get_users(self) -> List[UserDto]:
+        """Return the users."""
+        return await self._api_client.get_users()
+
+    async def get_generic_objects_for_type(
+        self, entity_type: EntityType | str, query_filters: List[str] | None = None
+    ) -> List[Dict[str, Any]] | None:
+        """Return the objects of an entity type."""
+        return await self._api_client.get_generic_objects_for_type(
+            _entity_type(entity_type), query_filters
+        )
+
+    async def get_last_object_id(self, entity_type: EntityType | str) -> int | None:
+        """Return the highest id of an entity type, or None if there are none."""
+        return await self._api_client.get_last_object_id(_entity_type(entity_type))
+
+    async def get_system_info(self) -> SystemInfo | None:
+        """Return the Grocy system information."""
+        raw_system_info = await self._api_client.get_system_info()
+        return SystemInfo(raw_system_info) if raw_system_info else None
+
+    async def get_system_config(self) -> SystemConfig | None:
+        """Return the Grocy configuration."""
+        raw_system_config = await self._api_client.get_system_config()
+        return SystemConfig(raw_system_config) if raw_system_config else None
+
+    async def tasks(self, query_filters: List[str] | None = None) -> List[Task]:
+        """Return the tasks."""
+        return [Task(task) for task in await self._api_client.get_tasks(query_filters)]
+
+    async def shopping_list(
+        self, query_filters: List[str] | None = None
+    ) -> List[ShoppingListProduct]:
+        """Return the shopping list, without product details."""
+        return [
+            ShoppingListProduct(item)
+            for item in await self._api_client.get_shopping_list(query_filters)
+        ]
+
+    async def meal_plan(self, query_filters: List[str] | None = None) -> List[MealPlanItem]:
+        """Return the meal plan, without recipe and section details."""
+        return [
+            MealPlanItem(item)
+            for item in await self._api_client.get_meal_plan(query_filters)
+        ]
+
+    async def add_product(self, *args: Any, **kwargs: Any) -> Any:
+        """Add an amount of a product to the stock."""
+        return await self._api_client.add_product(*args, **kwargs)
+
+    async def consume_product(self, *args: Any, **kwargs: Any) -> None:
+        """Consume an amount of a product from the stock."""
+        await self._api_client.consume_product(*args, **kwargs)
+
+    async def open_product(self, *args: Any, **kwargs: Any) -> None:
+        """Open an amount of a product in stock."""
+        await self._api_client.open_product(*args, **kwargs)
+
+    async def consume_recipe(self, recipe_id: int) -> None:
+        """Consume the ingredients of a recipe."""
+        await self._api_client.consume_recipe(recipe_id)
+
+    async def execute_chore(self, *args: Any, **kwargs: Any) -> Any:
+        """Track an execution of a chore."""
+        return await self._api_client.execute_chore(*args, **kwargs)
+
+    async def complete_task(self, *args: Any, **kwargs: Any) -> None:
+        """Mark a task as completed."""
+        await self._api_client.complete_task(*args, **kwargs)
+
+    async def charge_battery(self, *args: Any, **kwargs: Any) -> Any:
+        """Track a charge cycle of a battery."""
+        return await self._api_client.charge_battery(*args, **kwargs)
+
+    async def add_missing_product_to_shopping_list(
+        self, shopping_list_id: int = 1
+    ) -> None:
+        """Add the products below their minimum stock to a shopping list."""
+        await self._api_client.add_missing_product_to_shopping_list(shopping_list_id)
+
+    async def remove_product_in_shopping_list(self, *args: Any, **kwargs: Any) -> None:
+        """Remove an amount of a product from a shopping list."""
+        await self._api_client.remove_product_in_shopping_list(*args, **kwargs)
+
+    async def add_generic(self, entity_type: EntityType | str, data: Any) -> Any:
+        """Add an object."""
+        return await self._api_client.add_generic(_entity_type(entity_type), data)
+
+    async def update_generic(
+        self, entity_type: EntityType | str, object_id: int, updated_data: Any
+    ) -> Any:
+        """Update an object."""
+        return await self._api_client.update_generic(
+            _entity_type(entity_type), object_id, updated_data
+        )
+
+    async def delete_generic(self, entity_type: EntityType | str, object_id: int) -> Any:
+        """Delete an object."""
+        return await self._api_client.delete_generic(_entity_type(entity_type), object_id)
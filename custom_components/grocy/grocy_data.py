@@ -1,17 +1,22 @@
 """Communication with Grocy API."""
 from __future__ import annotations
 
-import logging
+import asyncio
+from collections.abc import Iterable
 from datetime import datetime, timedelta
-from typing import List
+import logging
+from typing import Any, Dict, List
 
 from aiohttp import hdrs, web
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from pygrocy2.data_models.battery import Battery
+from pygrocy2.data_models.chore import Chore
+from pygrocy2.data_models.product import Product
 
+from .bulk_details import BatteryDetails, ChoreDetails
 from .const import (
     ATTR_BATTERIES,
     ATTR_CHORES,
@@ -29,8 +34,20 @@ from .const import (
     CONF_API_KEY,
     CONF_PORT,
     CONF_URL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MEAL_PLAN_DAYS,
 )
-from .helpers import ProductWrapper, MealPlanItemWrapper, extract_base_url_and_path
+from .helpers import (
+    MealPlanItemWrapper,
+    MealPlanOrder,
+    StockRecords,
+    extract_base_url_and_path,
+    filter_overdue_batteries,
+    filter_overdue_chores,
+    filter_overdue_tasks,
+)
+from .master_data import MasterDataCache, RecipeCache
+from .sync import GrocyJournals
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,10 +55,11 @@ _LOGGER = logging.getLogger(__name__)
 class GrocyData:
     """Handles communication and gets the data."""
 
-    def __init__(self, hass, api):
+    def __init__(self, hass, api, meal_plan_days: int = DEFAULT_MEAL_PLAN_DAYS):
         """Initialize Grocy data."""
         self.hass = hass
         self.api = api
+        self.meal_plan_days = meal_plan_days
         self.entity_update_method = {
             ATTR_STOCK: self.async_update_stock,
             ATTR_CHORES: self.async_update_chores,
@@ -57,148 +75,358 @@ class GrocyData:
             ATTR_BATTERIES: self.async_update_batteries,
             ATTR_OVERDUE_BATTERIES: self.async_update_overdue_batteries,
         }
+        # Keys that are produced together by a single Grocy call. The
+        # method returns a mapping of key to data for all keys it covers.
+        self.grouped_update_method = {
+            ATTR_EXPIRING_PRODUCTS: self.async_update_volatile_stock,
+            ATTR_EXPIRED_PRODUCTS: self.async_update_volatile_stock,
+            ATTR_OVERDUE_PRODUCTS: self.async_update_volatile_stock,
+            ATTR_MISSING_PRODUCTS: self.async_update_volatile_stock,
+        }
+        # Keys computed locally from the list of another key, together
+        # with the last fetched source lists they are derived from.
+        self.derived_update_method = {
+            ATTR_OVERDUE_CHORES: (ATTR_CHORES, filter_overdue_chores),
+            ATTR_OVERDUE_TASKS: (ATTR_TASKS, filter_overdue_tasks),
+            ATTR_OVERDUE_BATTERIES: (ATTR_BATTERIES, filter_overdue_batteries),
+        }
+        # Keys whose update methods send several requests, partly
+        # concurrently, and hold the request semaphore for each of them
+        # themselves.
+        self.self_limited_keys = {
+            ATTR_STOCK,
+            ATTR_SHOPPING_LIST,
+            ATTR_EXPIRING_PRODUCTS,
+            ATTR_EXPIRED_PRODUCTS,
+            ATTR_OVERDUE_PRODUCTS,
+            ATTR_MISSING_PRODUCTS,
+        }
+        self._derivation_sources: Dict[str, Any] = {}
+        self._stock_records = StockRecords()
+        self.journals = GrocyJournals()
+        self._master_data: MasterDataCache | None = None
+        self._recipes: RecipeCache | None = None
+        self._meal_plan_order = MealPlanOrder()
+        self._db_changed_request: asyncio.Future | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_limit = 0
+
+    def _request_semaphore(self, max_concurrency: int) -> asyncio.Semaphore:
+        """Return the semaphore limiting the number of parallel requests."""
+        limit = max(1, max_concurrency)
+        if self._semaphore is None or self._semaphore_limit != limit:
+            self._semaphore = asyncio.Semaphore(limit)
+            self._semaphore_limit = limit
+        return self._semaphore
+
+    def _current_semaphore(self) -> asyncio.Semaphore:
+        """Return the semaphore of the last `async_update_many`."""
+        return self._semaphore or self._request_semaphore(DEFAULT_MAX_CONCURRENT_REQUESTS)
 
     async def async_update_data(self, entity_key):
         """Update data."""
         if entity_key in self.entity_update_method:
             return await self.entity_update_method[entity_key]()
 
-    async def async_update_stock(self):
-        """Update stock data."""
-
-        def wrapper():
-            return [ProductWrapper(item, self.hass) for item in self.api._api_client.get_stock()]
-
-        return await self.hass.async_add_executor_job(wrapper)
-
-    async def async_update_chores(self):
-        """Update chores data."""
-
-        def wrapper():
-            return self.api.chores(True)
-
-        return await self.hass.async_add_executor_job(wrapper)
-
-    async def async_update_overdue_chores(self):
+    async def async_update_many(
+        self,
+        entity_keys: Iterable[str],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        cached_sources: bool = False,
+        db_changed: datetime | None = None,
+    ) -> Dict[str, Any]:
+        """Update data for several entity keys concurrently.
+
+        Every distinct key is fetched once, no matter how many entities
+        share it, and keys served by the same grouped method share one
+        call. Keys without an update method (e.g. chore buttons) are
+        skipped. At most `max_concurrency` requests run at the same time,
+        across all concurrent callers.
+
+        Derived keys (overdue chores, tasks and batteries) are filtered
+        locally from their source list. The source is fetched along with
+        the other keys, or reused from the last fetch if `cached_sources`
+        is set and it is available.
+
+        `db_changed` is Grocy's db-changed-time if the caller already
+        requested it; the journals and caches are then synced with it
+        instead of requesting it again.
+        """
+        keys = [key for key in dict.fromkeys(entity_keys) if key in self.entity_update_method]
+        fetch_keys = [key for key in keys if key not in self.derived_update_method]
+        for key in keys:
+            if key in self.derived_update_method:
+                source = self.derived_update_method[key][0]
+                if not (cached_sources and source in self._derivation_sources):
+                    fetch_keys.append(source)
+
+        grouped: dict[Any, list[str]] = {}
+        single: list[str] = []
+        for key in dict.fromkeys(fetch_keys):
+            if key in self.grouped_update_method:
+                grouped.setdefault(self.grouped_update_method[key], []).append(key)
+            else:
+                single.append(key)
+
+        semaphore = self._request_semaphore(max_concurrency)
+
+        async def fetch_single(key: str) -> Dict[str, Any]:
+            method = self.entity_update_method[key]
+            if key in self.self_limited_keys:
+                return {key: await method(db_changed)}
+            async with semaphore:
+                return {key: await method(db_changed)}
+
+        async def fetch_grouped(method, keys: list[str]) -> Dict[str, Any]:
+            if self.self_limited_keys.issuperset(keys):
+                result = await method(db_changed)
+            else:
+                async with semaphore:
+                    result = await method(db_changed)
+            return {key: result[key] for key in keys}
+
+        data: Dict[str, Any] = {}
+        for result in await asyncio.gather(
+            *(fetch_single(key) for key in single),
+            *(fetch_grouped(method, keys) for method, keys in grouped.items()),
+        ):
+            data.update(result)
+
+        for source, _ in self.derived_update_method.values():
+            if source in data:
+                self._derivation_sources[source] = data[source]
+        for key in keys:
+            if key in self.derived_update_method:
+                source, derive = self.derived_update_method[key]
+                data[key] = derive(self._derivation_sources[source])
+
+        return {key: data[key] for key in keys}
+
+    async def async_update_stock(self, db_changed: datetime | None = None):
+        """Update stock data.
+
+        The stock is read in full once and then kept up to date from the
+        stock journal.
+        """
+        return self._stock_records.update(await self._async_sync_stock(db_changed))
+
+    async def _async_sync_stock(self, db_changed: datetime | None) -> List[Any]:
+        """Return the current stock rows, synced from the stock journal."""
+        db_changed = await self._async_db_changed(db_changed)
+        return await self.journals.stock.async_sync(
+            self.api, db_changed, self._current_semaphore()
+        )
+
+    async def async_update_chores(self, db_changed: datetime | None = None):
+        """Update chores data.
+
+        The details of all chores are joined from bulk requests instead of
+        one request per chore, the executions from the new chores log rows.
+        """
+        db_changed = await self._async_db_changed(db_changed)
+        current = await self.api.get_chores()
+        await self.journals.chores.async_sync(self.api, db_changed)
+        details = await ChoreDetails.async_load(self.api, current, self.journals.chores)
+        chores = [Chore(chore) for chore in current]
+        for chore in chores:
+            chore.get_details(details)
+        return chores
+
+    async def async_update_overdue_chores(self, db_changed: datetime | None = None):
         """Update overdue chores data."""
 
-        query_filter = [f"next_estimated_execution_time<{datetime.now()}"]
-
-        def wrapper():
-            return self.api.chores(get_details=True, query_filters=query_filter)
-
-        return await self.hass.async_add_executor_job(wrapper)
+        return filter_overdue_chores(await self.async_update_chores(db_changed))
 
     async def async_get_config(self):
         """Get the configuration from Grocy."""
-
-        def wrapper():
-            try:
-                return self.api.get_system_config()
-            except Exception as exc:  # pylint: disable=broad-except
-                # Surface the raw exception in the log to help troubleshooting when
-                # the Grocy server returns an unexpected (non-JSON) response or
-                # is unreachable.
-                _LOGGER.exception(
-                    "Failed to fetch Grocy system config: %s", exc
-                )
-                # Re-raise so callers (and Home Assistant) can react accordingly.
-                raise
-
-        return await self.hass.async_add_executor_job(wrapper)
-
-    async def async_update_tasks(self):
+        try:
+            return await self.api.get_system_config()
+        except Exception as exc:  # pylint: disable=broad-except
+            # Surface the raw exception in the log to help troubleshooting when
+            # the Grocy server returns an unexpected (non-JSON) response or
+            # is unreachable.
+            _LOGGER.exception(
+                "Failed to fetch Grocy system config: %s", exc
+            )
+            # Re-raise so callers (and Home Assistant) can react accordingly.
+            raise
+
+    async def _async_db_changed(self, db_changed: datetime | None) -> datetime | None:
+        """Return the given db-changed-time, or request it if it is unknown."""
+        if db_changed is None:
+            return await self.async_get_last_db_changed()
+        return db_changed
+
+    async def async_get_last_db_changed(self) -> datetime | None:
+        """Get the time of the last change to the Grocy database.
+
+        Concurrent callers (e.g. several domain coordinators refreshing at
+        once) share a single in-flight request.
+        """
+        if self._db_changed_request is None or self._db_changed_request.done():
+            self._db_changed_request = asyncio.ensure_future(
+                self.api.get_last_db_changed()
+            )
+        return await asyncio.shield(self._db_changed_request)
+
+    async def async_update_tasks(self, db_changed: datetime | None = None):
         """Update tasks data."""
 
-        return await self.hass.async_add_executor_job(self.api.tasks)
+        return await self.api.tasks()
 
-    async def async_update_overdue_tasks(self):
+    async def async_update_overdue_tasks(self, db_changed: datetime | None = None):
         """Update overdue tasks data."""
 
-        and_query_filter = [
-            f"due_date<{datetime.now().date()}",
-            # It's not possible to pass an empty value to Grocy, so use a regex that matches non-empty values to exclude empty str due_date.
-            r"due_date§.*\S.*",
-        ]
-
-        def wrapper():
-            return self.api.tasks(query_filters=and_query_filter)
-
-        return await self.hass.async_add_executor_job(wrapper)
-
-    async def async_update_shopping_list(self):
-        """Update shopping list data."""
-
-        def wrapper():
-            return self.api.shopping_list(True)
-
-        return await self.hass.async_add_executor_job(wrapper)
-
-    async def async_update_expiring_products(self):
+        return filter_overdue_tasks(await self.async_update_tasks(db_changed))
+
+    def invalidate_objects(self, entity_type: str) -> None:
+        """Reload the cached objects of an entity type with the next update."""
+        for cache in (self._master_data, self._recipes):
+            if cache is not None:
+                cache.invalidate([entity_type])
+
+    async def async_load_master_data(
+        self, db_changed: datetime | None = None
+    ) -> MasterDataCache:
+        """Return the master data cache with the current stock.
+
+        The stock rows come from the stock journal, the master data is
+        only reloaded when its tables changed.
+        """
+        if self._master_data is None:
+            self._master_data = MasterDataCache(self.api)
+        self._master_data.update_stock(await self._async_sync_stock(db_changed))
+        async with self._current_semaphore():
+            await self._master_data.async_refresh()
+        return self._master_data
+
+    async def async_load_recipes(self) -> RecipeCache:
+        """Return the recipe cache, with the tables that changed reloaded."""
+        if self._recipes is None:
+            self._recipes = RecipeCache(self.api)
+        await self._recipes.async_refresh()
+        return self._recipes
+
+    async def async_update_shopping_list(self, db_changed: datetime | None = None):
+        """Update shopping list data.
+
+        The products of the items are joined from the master data cache
+        rather than requested one by one.
+        """
+        master_data = await self.async_load_master_data(db_changed)
+        async with self._current_semaphore():
+            shopping_list = await self.api.shopping_list()
+        async with self._current_semaphore():
+            await master_data.async_resolve(
+                item.product_id for item in shopping_list if item.product_id
+            )
+        for item in shopping_list:
+            item.get_details(master_data)
+        return shopping_list
+
+    async def async_update_volatile_stock(
+        self, db_changed: datetime | None = None
+    ) -> Dict[str, List[Product]]:
+        """Update expiring, expired, overdue and missing products data.
+
+        Grocy computes all four lists in one `/stock/volatile` response, so
+        it is fetched once and split locally. The products are hydrated
+        from the master data cache, each distinct product only once.
+        """
+        master_data = await self.async_load_master_data(db_changed)
+        async with self._current_semaphore():
+            volatile_stock = await self.api.get_volatile_stock()
+        data = {
+            ATTR_EXPIRING_PRODUCTS: volatile_stock.due_products,
+            ATTR_EXPIRED_PRODUCTS: volatile_stock.expired_products,
+            ATTR_OVERDUE_PRODUCTS: volatile_stock.overdue_products,
+            ATTR_MISSING_PRODUCTS: volatile_stock.missing_products,
+        }
+        for key, items in data.items():
+            data[key] = [Product(item) for item in items or []]
+        async with self._current_semaphore():
+            await master_data.async_resolve(
+                product.id for products in data.values() for product in products
+            )
+        for products in data.values():
+            for product in products:
+                product.get_details(master_data)
+        return data
+
+    async def async_update_expiring_products(self, db_changed: datetime | None = None):
         """Update expiring products data."""
 
-        def wrapper():
-            return self.api.due_products(True)
+        return (await self.async_update_volatile_stock(db_changed))[ATTR_EXPIRING_PRODUCTS]
 
-        return await self.hass.async_add_executor_job(wrapper)
-
-    async def async_update_expired_products(self):
+    async def async_update_expired_products(self, db_changed: datetime | None = None):
         """Update expired products data."""
 
-        def wrapper():
-            return self.api.expired_products(True)
-
-        return await self.hass.async_add_executor_job(wrapper)
+        return (await self.async_update_volatile_stock(db_changed))[ATTR_EXPIRED_PRODUCTS]
 
-    async def async_update_overdue_products(self):
+    async def async_update_overdue_products(self, db_changed: datetime | None = None):
         """Update overdue products data."""
 
-        def wrapper():
-            return self.api.overdue_products(True)
+        return (await self.async_update_volatile_stock(db_changed))[ATTR_OVERDUE_PRODUCTS]
 
-        return await self.hass.async_add_executor_job(wrapper)
-
-    async def async_update_missing_products(self):
+    async def async_update_missing_products(self, db_changed: datetime | None = None):
         """Update missing products data."""
 
-        def wrapper():
-            return self.api.missing_products(True)
+        return (await self.async_update_volatile_stock(db_changed))[ATTR_MISSING_PRODUCTS]
 
-        return await self.hass.async_add_executor_job(wrapper)
+    async def async_update_meal_plan(self, db_changed: datetime | None = None):
+        """Update meal plan data.
 
-    async def async_update_meal_plan(self):
-        """Update meal plan data."""
+        Only the days of the look-ahead window are fetched. Recipes and
+        sections come from the recipe cache.
+        """
 
-        # The >= condition is broken before Grocy 3.3.1. So use > to maintain backward compatibility.
+        # The >= and <= conditions are broken before Grocy 3.3.1. So use > and <
+        # to maintain backward compatibility.
         yesterday = datetime.now() - timedelta(1)
         query_filter = [f"day>{yesterday.date()}"]
-
-        def wrapper():
-            meal_plan = self.api.meal_plan(get_details=True, query_filters=query_filter)
-            plan = [MealPlanItemWrapper(item) for item in meal_plan]
-            return sorted(plan, key=lambda item: item.meal_plan.day)
-
-        return await self.hass.async_add_executor_job(wrapper)
-
-    async def async_update_batteries(self) -> List[Battery]:
-        """Update batteries."""
-
-        def wrapper():
-            return self.api.batteries(get_details=True)
-
-        return await self.hass.async_add_executor_job(wrapper)
-
-    async def async_update_overdue_batteries(self) -> List[Battery]:
+        if self.meal_plan_days:
+            after_last_day = yesterday + timedelta(days=self.meal_plan_days + 1)
+            query_filter.append(f"day<{after_last_day.date()}")
+        recipes = await self.async_load_recipes()
+        meal_plan = await self.api.meal_plan(query_filters=query_filter)
+        await recipes.async_resolve(
+            (item.recipe_id for item in meal_plan),
+            (item.section_id for item in meal_plan),
+        )
+        for item in meal_plan:
+            item.get_details(recipes)
+        return self._meal_plan_order.update(
+            [MealPlanItemWrapper(item) for item in meal_plan]
+        )
+
+    async def async_update_batteries(
+        self, db_changed: datetime | None = None
+    ) -> List[Battery]:
+        """Update batteries.
+
+        The details of all batteries are joined from bulk requests instead
+        of one request per battery, the charge cycles from the new journal
+        rows.
+        """
+        db_changed = await self._async_db_changed(db_changed)
+        current = await self.api.get_batteries()
+        await self.journals.batteries.async_sync(self.api, db_changed)
+        details = await BatteryDetails.async_load(self.api, current, self.journals.batteries)
+        batteries = [Battery(battery) for battery in current]
+        for battery in batteries:
+            battery.get_details(details)
+        return batteries
+
+    async def async_update_overdue_batteries(
+        self, db_changed: datetime | None = None
+    ) -> List[Battery]:
         """Update overdue batteries."""
 
-        def wrapper():
-            filter_query = [f"next_estimated_charge_time<{datetime.now()}"]
-            return self.api.batteries(filter_query, get_details=True)
-
-        return await self.hass.async_add_executor_job(wrapper)
+        return filter_overdue_batteries(await self.async_update_batteries(db_changed))
 
 
-async def async_setup_endpoint_for_image_proxy(
+@callback
+def async_setup_endpoint_for_image_proxy(
     hass: HomeAssistant, config_entry: ConfigEntry
 ):
     """Setup and register the image api for grocy images with HA."""
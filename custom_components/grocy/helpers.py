@@ -3,11 +3,14 @@ from __future__ import annotations
 
 import json
 import base64
-from typing import Any, Dict, Tuple
+import bisect
+from datetime import date, datetime
+from functools import lru_cache
+from typing import AbstractSet, Any, Dict, List, Tuple
 from urllib.parse import urlparse
 
+from pygrocy2.base import DataModel, get_val
 from pygrocy2.data_models.meal_items import MealPlanItem
-from pygrocy2.data_models.product import Product
 from pygrocy2.grocy_api_client import CurrentStockResponse
 
 
@@ -18,6 +21,59 @@ def extract_base_url_and_path(url: str) -> Tuple[str, str]:
     return (f"{parsed_url.scheme}://{parsed_url.netloc}", parsed_url.path.strip("/"))
 
 
+def _naive(value: datetime) -> datetime:
+    """Drop the timezone, Grocy compares its local time strings."""
+    return value.replace(tzinfo=None) if value.tzinfo else value
+
+
+def filter_overdue_chores(chores: List[Any], now: datetime | None = None) -> List[Any]:
+    """Return the chores whose next estimated execution time has passed.
+
+    Matches Grocy's `next_estimated_execution_time<now` query filter.
+    Chores without a next execution time are never overdue.
+    """
+    now = now or datetime.now()
+    return [
+        chore
+        for chore in chores
+        if chore.next_estimated_execution_time is not None
+        and _naive(chore.next_estimated_execution_time) < now
+    ]
+
+
+def filter_overdue_tasks(tasks: List[Any], today: date | None = None) -> List[Any]:
+    """Return the tasks with a due date before today.
+
+    Matches Grocy's `due_date<today` query filter combined with the
+    non-empty `due_date` regex, so tasks without a due date are excluded.
+    """
+    today = today or datetime.now().date()
+    overdue = []
+    for task in tasks:
+        due_date = task.due_date
+        if due_date is None:
+            continue
+        if isinstance(due_date, datetime):
+            due_date = due_date.date()
+        if due_date < today:
+            overdue.append(task)
+    return overdue
+
+
+def filter_overdue_batteries(batteries: List[Any], now: datetime | None = None) -> List[Any]:
+    """Return the batteries whose next estimated charge time has passed.
+
+    Matches Grocy's `next_estimated_charge_time<now` query filter.
+    """
+    now = now or datetime.now()
+    return [
+        battery
+        for battery in batteries
+        if battery.next_estimated_charge_time is not None
+        and _naive(battery.next_estimated_charge_time) < now
+    ]
+
+
 class MealPlanItemWrapper:
     """Wrapper around the pygrocy MealPlanItem."""
 
@@ -34,27 +90,201 @@ class MealPlanItemWrapper:
         """Proxy URL to the picture."""
         recipe = self.meal_plan.recipe
         if recipe and recipe.picture_file_name:
-            b64name = base64.b64encode(recipe.picture_file_name.encode("ascii"))
-            return f"/api/grocy/recipepictures/{str(b64name, 'utf-8')}"
+            return picture_proxy_url("recipepictures", recipe.picture_file_name)
         return None
 
-    def as_dict(self) -> Dict[str, Any]:
+    def as_dict(self, fields: AbstractSet[str] | None = None) -> Dict[str, Any]:
         """Return attributes for the pygrocy MealPlanItem object including picture URL."""
-        props = self.meal_plan.as_dict()
-        props["picture_url"] = self.picture_url
+        props = item_as_dict(self.meal_plan, fields)
+        if fields is None or "picture_url" in fields:
+            props["picture_url"] = self.picture_url
         return props
     
+class MealPlanOrder:
+    """Keep the meal plan sorted by day across refreshes.
+
+    Items whose day did not change keep their position; only new and
+    moved items are inserted, by day and id.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the order."""
+        self._order: List[Tuple[datetime, int]] = []
+
+    def update(self, items: List[MealPlanItemWrapper]) -> List[MealPlanItemWrapper]:
+        """Return the items in order and remember the order."""
+        by_id = {item.meal_plan.id: item for item in items}
+        order = [
+            key
+            for key in self._order
+            if key[1] in by_id and by_id[key[1]].meal_plan.day == key[0]
+        ]
+        placed = {key[1] for key in order}
+        for item in items:
+            if item.meal_plan.id not in placed:
+                bisect.insort(order, (item.meal_plan.day, item.meal_plan.id))
+        self._order = order
+        return [by_id[item_id] for _, item_id in order]
+
+
+@lru_cache(maxsize=4096)
+def picture_proxy_url(kind: str, file_name: str) -> str:
+    """Return the proxy URL of a Grocy picture, encoding each file name once."""
+    b64name = base64.b64encode(file_name.encode("ascii"))
+    return f"/api/grocy/{kind}/{str(b64name, 'utf-8')}"
+
+
+class StockProduct:
+    """Compact product of a stock row.
+
+    Exposes the same fields as the pygrocy Product built from a
+    CurrentStockResponse, without the per-instance dict.
+    """
+
+    __slots__ = (
+        "_id",
+        "_name",
+        "_product_group_id",
+        "_available_amount",
+        "_amount_aggregated",
+        "_amount_opened",
+        "_amount_opened_aggregated",
+        "_is_aggregated_amount",
+        "_best_before_date",
+    )
+
+    # The fields of Product.as_dict(), in the same order
+    FIELDS = (
+        "name",
+        "id",
+        "product_group_id",
+        "available_amount",
+        "amount_aggregated",
+        "amount_opened",
+        "amount_opened_aggregated",
+        "is_aggregated_amount",
+        "best_before_date",
+        "barcodes",
+        "product_barcodes",
+        "amount_missing",
+        "is_partly_in_stock",
+        "default_quantity_unit_purchase",
+    )
+
+    def __init__(self, response: CurrentStockResponse):
+        """Initialize the product from a stock row."""
+        self._id = response.product_id
+        self._available_amount = response.amount
+        self._amount_aggregated = response.amount_aggregated
+        self._amount_opened = response.amount_opened
+        self._amount_opened_aggregated = response.amount_opened_aggregated
+        self._is_aggregated_amount = response.is_aggregated_amount
+        self._best_before_date = response.best_before_date
+        self._name = None
+        self._product_group_id = None
+        if response.product:
+            self._id = response.product.id
+            self._name = response.product.name
+            self._product_group_id = response.product.product_group_id
+
+    @property
+    def name(self) -> str | None:
+        """Name of the product."""
+        return self._name
+
+    @property
+    def id(self) -> int:
+        """Id of the product."""
+        return self._id
+
+    @property
+    def product_group_id(self) -> int | None:
+        """Id of the product group."""
+        return self._product_group_id
+
+    @property
+    def available_amount(self) -> float:
+        """Amount in stock."""
+        return self._available_amount
+
+    @property
+    def amount_aggregated(self) -> float:
+        """Amount in stock, including sub products."""
+        return self._amount_aggregated
+
+    @property
+    def amount_opened(self) -> float:
+        """Opened amount in stock."""
+        return self._amount_opened
+
+    @property
+    def amount_opened_aggregated(self) -> float:
+        """Opened amount in stock, including sub products."""
+        return self._amount_opened_aggregated
+
+    @property
+    def is_aggregated_amount(self) -> bool:
+        """Whether the amounts include sub products."""
+        return self._is_aggregated_amount
+
+    @property
+    def best_before_date(self) -> date:
+        """Next best before date."""
+        return self._best_before_date
+
+    @property
+    def barcodes(self) -> list[str]:
+        """Barcodes; not part of a stock row."""
+        return []
+
+    @property
+    def product_barcodes(self) -> list[Any]:
+        """Product barcodes; not part of a stock row."""
+        return []
+
+    @property
+    def amount_missing(self) -> None:
+        """Missing amount; not part of a stock row."""
+        return None
+
+    @property
+    def is_partly_in_stock(self) -> None:
+        """Partly in stock state; not part of a stock row."""
+        return None
+
+    @property
+    def default_quantity_unit_purchase(self) -> None:
+        """Purchase quantity unit; not part of a stock row."""
+        return None
+
+    def as_dict(self, fields: AbstractSet[str] | None = None) -> Dict[str, Any]:
+        """Return the product fields like Product.as_dict()."""
+        return {
+            field: getattr(self, field)
+            for field in self.FIELDS
+            if fields is None or field in fields
+        }
+
+
 class ProductWrapper:
     """Wrapper around the pygrocy CurrentStockResponse."""
 
-    def __init__(self, product: CurrentStockResponse, hass):
-        self._product = Product(product)
-        self._hass = hass
+    __slots__ = ("_row", "_product", "_picture_url")
+
+    def __init__(self, product: CurrentStockResponse):
+        """Initialize the wrapper of a stock row."""
+        self._row = product
+        self._product = StockProduct(product)
         self._picture_url = self.get_picture_url(product)
 
     @property
-    def product(self) -> Product:
-        """The pygrocy Product."""
+    def row(self) -> CurrentStockResponse:
+        """The stock row the product was built from."""
+        return self._row
+
+    @property
+    def product(self) -> StockProduct:
+        """The product of the stock row."""
         return self._product
 
     @property
@@ -64,15 +294,120 @@ class ProductWrapper:
 
     def get_picture_url(self, product: CurrentStockResponse) -> str | None:
         """Proxy URL to the picture."""
-        
         if product.product and product.product.picture_file_name:
-            b64name = base64.b64encode(product.product.picture_file_name.encode("ascii"))
-            return f"/api/grocy/productpictures/{str(b64name, 'utf-8')}"
-        
-        return None        
-
-    def as_dict(self) -> Dict[str, Any]:
-        """Return attributes for the pygrocy Product object including picture URL."""        
-        props = self.product.as_dict()
-        props["picture_url"] = self.picture_url
-        return props
\ No newline at end of file
+            return picture_proxy_url("productpictures", product.product.picture_file_name)
+        return None
+
+    def as_dict(self, fields: AbstractSet[str] | None = None) -> Dict[str, Any]:
+        """Return attributes for the product including picture URL."""
+        props = item_as_dict(self.product, fields)
+        if fields is None or "picture_url" in fields:
+            props["picture_url"] = self.picture_url
+        return props
+
+
+class OptimisticItem:
+    """A fetched item with the fields a write is expected to change.
+
+    Reads the changed fields from `changes` and all others from the
+    wrapped `item`, until the next fetch replaces it.
+    """
+
+    def __init__(self, item: Any, changes: Dict[str, Any]) -> None:
+        """Initialize the item, merging the changes of a wrapped one."""
+        if isinstance(item, OptimisticItem):
+            changes = {**item.changes, **changes}
+            item = item.item
+        self.item = item
+        self.changes = changes
+
+    def __getattr__(self, name: str) -> Any:
+        """Return a changed field, or the field of the wrapped item."""
+        try:
+            changes = self.__dict__["changes"]
+            item = self.__dict__["item"]
+        except KeyError as err:
+            raise AttributeError(name) from err
+        if name in changes:
+            return changes[name]
+        return getattr(item, name)
+
+    def as_dict(self, fields: AbstractSet[str] | None = None) -> Dict[str, Any]:
+        """Return the fields of the item with the changes applied."""
+        props = item_as_dict(self.item, fields)
+        props.update(
+            (name, value)
+            for name, value in self.changes.items()
+            if fields is None or name in fields
+        )
+        return props
+
+
+def _stock_row_key(row: CurrentStockResponse) -> Tuple[Any, ...]:
+    """Return the fields of a stock row its record is built from."""
+    product = row.product
+    return (
+        row.amount,
+        row.amount_aggregated,
+        row.amount_opened,
+        row.amount_opened_aggregated,
+        row.is_aggregated_amount,
+        row.best_before_date,
+        product.id if product else None,
+        product.name if product else None,
+        product.product_group_id if product else None,
+        product.picture_file_name if product else None,
+    )
+
+
+class StockRecords:
+    """Build the stock records of a refresh, reusing unchanged ones.
+
+    A stock row whose fields equal those of the previous refresh keeps
+    its record, so steady stock is neither reallocated nor converted
+    again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the records."""
+        self._records: Dict[Any, Tuple[Tuple[Any, ...], ProductWrapper]] = {}
+
+    def update(self, rows: List[CurrentStockResponse]) -> List[ProductWrapper]:
+        """Return the records of the rows and remember them."""
+        previous = self._records
+        records: Dict[Any, Tuple[Tuple[Any, ...], ProductWrapper]] = {}
+        result = []
+        for row in rows:
+            key = _stock_row_key(row)
+            known = previous.get(row.product_id)
+            if known is not None and known[0] == key:
+                record = known[1]
+            else:
+                record = ProductWrapper(row)
+            records[row.product_id] = (key, record)
+            result.append(record)
+        self._records = records
+        return result
+
+
+def item_as_dict(item: Any, fields: AbstractSet[str] | None = None) -> Dict[str, Any]:
+    """Return the given fields of an item, or all fields when fields is None.
+
+    Only the selected properties of pygrocy models are read, so nested
+    objects that are not selected are never converted.
+    """
+    if fields is None:
+        return item.as_dict()
+    if isinstance(item, dict):
+        return {key: value for key, value in item.items() if key in fields}
+    if isinstance(
+        item, (ProductWrapper, MealPlanItemWrapper, StockProduct, OptimisticItem)
+    ):
+        return item.as_dict(fields)
+    if isinstance(item, DataModel):
+        return {
+            key: get_val(getattr(item, key))
+            for key, value in type(item).__dict__.items()
+            if isinstance(value, property) and key in fields
+        }
+    return {key: value for key, value in item.as_dict().items() if key in fields}
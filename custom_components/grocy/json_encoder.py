@@ -16,3 +16,46 @@ class CustomJSONEncoder(ExtendedJSONEncoder):
             return o.isoformat()
 
         return super().default(o)
+
+
+def _json_key(key: Any) -> str:
+    """Convert a mapping key like the json module does."""
+    if isinstance(key, str):
+        return str.__str__(key)
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, (int, float)):
+        return str(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def to_json_safe(o: Any) -> Any:
+    """Convert an object to JSON-safe primitives.
+
+    Gives the same result as a `json.dumps`/`json.loads` round trip with
+    CustomJSONEncoder, without building the intermediate string.
+    """
+    if o is None or isinstance(o, bool):
+        return o
+    if isinstance(o, str):
+        # str.__str__ keeps the value of str based enums, like json does
+        return str.__str__(o)
+    if isinstance(o, int):
+        return int(o)
+    if isinstance(o, float):
+        return float(o)
+    if isinstance(o, dict):
+        return {_json_key(key): to_json_safe(value) for key, value in o.items()}
+    if isinstance(o, (list, tuple, set)):
+        return [to_json_safe(value) for value in o]
+    if isinstance(o, (datetime.date, datetime.time)):
+        return o.isoformat()
+    if isinstance(o, datetime.timedelta):
+        return {"__type": str(type(o)), "total_seconds": o.total_seconds()}
+    if hasattr(o, "as_dict"):
+        return to_json_safe(o.as_dict())
+    return {"__type": str(type(o)), "repr": repr(o)}
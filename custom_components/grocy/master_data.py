@@ -0,0 +1,282 @@
+"""Grocy master data loaded in bulk and joined with list rows locally."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+from collections import defaultdict
+import logging
+import time
+from typing import Any, ClassVar, Dict, Iterable, List, Set, Tuple
+
+from pygrocy2.grocy_api_client import (
+    CurrentStockResponse,
+    LocationData,
+    MealPlanSectionResponse,
+    ProductBarcodeData,
+    ProductData,
+    ProductDetailsResponse,
+    QuantityUnitData,
+    RecipeDetailsResponse,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Tables can change in Grocy without a journal row, so they are reloaded
+# at this interval (in seconds) even if nothing invalidated them.
+OBJECT_RELOAD_INTERVAL = 3600
+
+# Product details that cannot be joined from the cache
+_REQUEST = object()
+
+
+class GrocyObjectCache(ABC):
+    """Grocy tables loaded in bulk, one request per table.
+
+    Grocy's db-changed-time moves with every booking and does not tell
+    which table changed, so a table is only reloaded when it was
+    invalidated (e.g. by a service writing to it), when a row refers to an
+    object it lacks, and otherwise every `OBJECT_RELOAD_INTERVAL` seconds
+    for edits made in Grocy itself. Subclasses list their `tables`, load
+    one of them in `_async_load_table` and return its objects by id from
+    `_table`.
+    """
+
+    tables: ClassVar[Tuple[str, ...]] = ()
+    # Tables reloaded along with a table that lacked an object
+    related_tables: ClassVar[Dict[str, Tuple[str, ...]]] = {}
+
+    def __init__(self, api) -> None:
+        """Initialize the cache."""
+        self._api = api
+        self._lock = asyncio.Lock()
+        self._stale: Set[str] = set(self.tables)
+        self._reload_due = 0.0
+        # Objects still missing after reloading their table for them
+        self._unknown: Set[Tuple[str, int]] = set()
+
+    async def _objects(self, entity_type: str) -> List[Dict[str, Any]]:
+        """Return all objects of an entity type."""
+        return await self._api.get_generic_objects_for_type(entity_type) or []
+
+    def invalidate(self, tables: Iterable[str] | None = None) -> None:
+        """Reload the given tables of the cache, or all, with the next refresh."""
+        self._stale.update(self.tables if tables is None else set(tables) & set(self.tables))
+
+    async def async_refresh(self) -> None:
+        """Load the tables that are invalidated or due."""
+        async with self._lock:
+            if time.monotonic() >= self._reload_due:
+                self._stale.update(self.tables)
+                self._unknown = set()
+            tables = [table for table in self.tables if table in self._stale]
+            if not tables:
+                return
+            _LOGGER.debug("Loading Grocy %s for %s", tables, type(self).__name__)
+            for table in tables:
+                await self._async_load_table(table)
+                self._stale.discard(table)
+            if len(tables) == len(self.tables):
+                self._reload_due = time.monotonic() + OBJECT_RELOAD_INTERVAL
+
+    async def _async_load_missing(self, references: Iterable[Tuple[str, Any]]) -> None:
+        """Reload the tables lacking objects that rows refer to by (table, id).
+
+        Objects still missing afterwards, e.g. deleted ones, do not cause
+        another reload before the next periodic one.
+        """
+        missing = {
+            (table, int(object_id))
+            for table, object_id in references
+            if object_id not in (None, "") and int(object_id) not in self._table(table)
+        } - self._unknown
+        if not missing:
+            return
+        tables = {table for table, _ in missing}
+        for table in list(tables):
+            tables.update(self.related_tables.get(table, ()))
+        self.invalidate(tables)
+        await self.async_refresh()
+        self._unknown.update(
+            (table, object_id)
+            for table, object_id in missing
+            if object_id not in self._table(table)
+        )
+
+    @abstractmethod
+    async def _async_load_table(self, table: str) -> None:
+        """Load the objects of a table."""
+
+    @abstractmethod
+    def _table(self, table: str) -> Dict[int, Any]:
+        """Return the loaded objects of a table by id."""
+
+
+class MasterDataCache(GrocyObjectCache):
+    """Products, quantity units, locations and barcodes of Grocy.
+
+    Acts as the api client pygrocy hydrates shopping list and volatile
+    stock rows with: `get_product` builds the product details from the
+    cache and the stock rows set with `update_stock`, instead of
+    requesting `/stock/products/{id}` for every row. The products are
+    resolved with `async_resolve` before hydrating.
+    """
+
+    tables = ("products", "quantity_units", "locations", "product_barcodes")
+    related_tables: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "products": ("product_barcodes",)
+    }
+
+    def __init__(self, api) -> None:
+        """Initialize the cache."""
+        super().__init__(api)
+        self.products: Dict[int, ProductData] = {}
+        self.quantity_units: Dict[int, QuantityUnitData] = {}
+        self.locations: Dict[int, LocationData] = {}
+        self.barcodes: Dict[int, List[ProductBarcodeData]] = {}
+        self._stock: Dict[int, CurrentStockResponse] = {}
+        self._details: Dict[int, ProductDetailsResponse | None] = {}
+
+    async def _async_load_table(self, table: str) -> None:
+        """Load the objects of a table."""
+        rows = await self._objects(table)
+        if table == "products":
+            self.products = {
+                product.id: product for product in (ProductData(**raw) for raw in rows)
+            }
+        elif table == "quantity_units":
+            self.quantity_units = {
+                unit.id: unit for unit in (QuantityUnitData(**raw) for raw in rows)
+            }
+        elif table == "locations":
+            self.locations = {
+                location.id: location for location in (LocationData(**raw) for raw in rows)
+            }
+        elif table == "product_barcodes":
+            barcodes: Dict[int, List[ProductBarcodeData]] = defaultdict(list)
+            for raw in rows:
+                barcodes[int(raw["product_id"])].append(
+                    ProductBarcodeData(barcode=raw["barcode"], amount=raw.get("amount") or None)
+                )
+            self.barcodes = dict(barcodes)
+        self._details = {}
+
+    def _table(self, table: str) -> Dict[int, Any]:
+        """Return the loaded objects of a table by id."""
+        return {
+            "products": self.products,
+            "quantity_units": self.quantity_units,
+            "locations": self.locations,
+            "product_barcodes": self.barcodes,
+        }[table]
+
+    def update_stock(self, stock: Iterable[CurrentStockResponse]) -> None:
+        """Set the current stock rows the product details are built with."""
+        self._stock = {row.product_id: row for row in stock}
+        self._details = {}
+
+    async def async_resolve(self, product_ids: Iterable[Any]) -> None:
+        """Join the details of the products, requesting those the cache lacks."""
+        product_ids = [
+            product_id
+            for product_id in dict.fromkeys(int(product_id) for product_id in product_ids)
+            if product_id not in self._details
+        ]
+        await self._async_load_missing(("products", product_id) for product_id in product_ids)
+        await self._async_load_missing(
+            reference
+            for product in (self.products.get(product_id) for product_id in product_ids)
+            if product is not None
+            for reference in (
+                ("quantity_units", product.qu_id_stock),
+                ("quantity_units", product.qu_id_purchase),
+                ("locations", product.location_id),
+            )
+        )
+        for product_id in product_ids:
+            details = self._product_details(product_id)
+            if details is _REQUEST:
+                # Inconsistent master data, let Grocy resolve it
+                details = await self._api.get_product(product_id)
+            self._details[product_id] = details
+
+    def get_product(self, product_id) -> ProductDetailsResponse | None:
+        """Return the product details joined from the cache."""
+        product_id = int(product_id)
+        if product_id not in self._details:
+            details = self._product_details(product_id)
+            self._details[product_id] = None if details is _REQUEST else details
+        return self._details[product_id]
+
+    def _product_details(self, product_id: int) -> ProductDetailsResponse | object | None:
+        """Build the details Grocy returns for a product.
+
+        Returns `_REQUEST` when they have to be requested from Grocy.
+        """
+        product = self.products.get(product_id)
+        if product is None:
+            return None
+        unit_stock = self.quantity_units.get(product.qu_id_stock)
+        unit_purchase = self.quantity_units.get(product.qu_id_purchase)
+        if unit_stock is None or unit_purchase is None:
+            return _REQUEST
+
+        stock = self._stock.get(product_id)
+        return ProductDetailsResponse(
+            stock_amount=stock.amount if stock else 0,
+            stock_amount_opened=stock.amount_opened if stock else 0,
+            next_best_before_date=stock.best_before_date if stock else None,
+            product=product,
+            quantity_unit_stock=unit_stock,
+            default_quantity_unit_purchase=unit_purchase,
+            product_barcodes=self.barcodes.get(product_id, []),
+            location=self.locations.get(product.location_id),
+        )
+
+
+class RecipeCache(GrocyObjectCache):
+    """Recipes and meal plan sections of Grocy.
+
+    Acts as the api client pygrocy hydrates meal plan items with, instead
+    of requesting every recipe and section of the plan on its own. The
+    recipes and sections are resolved with `async_resolve` before
+    hydrating.
+    """
+
+    tables = ("recipes", "meal_plan_sections")
+
+    def __init__(self, api) -> None:
+        """Initialize the cache."""
+        super().__init__(api)
+        self.recipes: Dict[int, RecipeDetailsResponse] = {}
+        self.sections: Dict[int, MealPlanSectionResponse] = {}
+
+    async def _async_load_table(self, table: str) -> None:
+        """Load the objects of a table."""
+        rows = await self._objects(table)
+        if table == "recipes":
+            self.recipes = {int(raw["id"]): RecipeDetailsResponse(**raw) for raw in rows}
+        elif table == "meal_plan_sections":
+            self.sections = {int(raw["id"]): MealPlanSectionResponse(**raw) for raw in rows}
+
+    def _table(self, table: str) -> Dict[int, Any]:
+        """Return the loaded objects of a table by id."""
+        return {"recipes": self.recipes, "meal_plan_sections": self.sections}[table]
+
+    async def async_resolve(
+        self, recipe_ids: Iterable[Any], section_ids: Iterable[Any]
+    ) -> None:
+        """Load the recipes and sections the cache lacks."""
+        await self._async_load_missing(
+            [
+                *(("recipes", recipe_id) for recipe_id in recipe_ids if recipe_id),
+                *(("meal_plan_sections", section_id) for section_id in section_ids if section_id),
+            ]
+        )
+
+    def get_recipe(self, recipe_id) -> RecipeDetailsResponse | None:
+        """Return a recipe."""
+        return self.recipes.get(int(recipe_id))
+
+    def get_meal_plan_section(self, section_id) -> MealPlanSectionResponse | None:
+        """Return a meal plan section."""
+        return self.sections.get(int(section_id))
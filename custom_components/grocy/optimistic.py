@@ -0,0 +1,198 @@
+"""Apply the expected result of writes to the coordinator data.
+
+The functions return updated copies of the fetched lists; the items
+themselves are never mutated. Updated items are wrapped with their
+changed fields, stock records are rebuilt from an updated stock row and
+items restored from the cache are copied with updated fields. The next
+fetch from Grocy replaces the optimistic data and reconciles any
+difference.
+"""
+from __future__ import annotations
+
+import calendar
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+
+from .const import (
+    ATTR_BATTERIES,
+    ATTR_CHORES,
+    ATTR_OVERDUE_BATTERIES,
+    ATTR_OVERDUE_CHORES,
+    ATTR_OVERDUE_TASKS,
+    ATTR_TASKS,
+)
+from .helpers import (
+    OptimisticItem,
+    ProductWrapper,
+    filter_overdue_batteries,
+    filter_overdue_chores,
+    filter_overdue_tasks,
+)
+from .store import CachedItem
+
+# Keys derived from an optimistically updated key, with their filter.
+DERIVED_KEYS = {
+    ATTR_CHORES: (ATTR_OVERDUE_CHORES, filter_overdue_chores),
+    ATTR_TASKS: (ATTR_OVERDUE_TASKS, filter_overdue_tasks),
+    ATTR_BATTERIES: (ATTR_OVERDUE_BATTERIES, filter_overdue_batteries),
+}
+
+# Fields of a stock product and the stock row fields they are built from.
+STOCK_ROW_FIELDS = {
+    "available_amount": "amount",
+    "amount_aggregated": "amount_aggregated",
+    "amount_opened": "amount_opened",
+}
+
+
+def _same_kind(value: datetime, reference: datetime | None) -> datetime:
+    """Return value as naive or aware datetime, matching the reference."""
+    if reference is None:
+        return value
+    if reference.tzinfo is None and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    if reference.tzinfo is not None and value.tzinfo is None:
+        return value.replace(tzinfo=reference.tzinfo)
+    return value
+
+
+def _with_changes(item: Any, changes: Dict[str, Any]) -> Any:
+    """Return a copy of a fetched or cached item with some fields changed."""
+    if isinstance(item, CachedItem):
+        return CachedItem(
+            item,
+            **{
+                name: value.isoformat() if isinstance(value, (date, datetime)) else value
+                for name, value in changes.items()
+            },
+        )
+    return OptimisticItem(item, changes)
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    """Add calendar months, clamping the day to the length of the month."""
+    month = value.month - 1 + months
+    year = value.year + month // 12
+    month = month % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def next_chore_execution(chore: Any, tracked_time: datetime) -> datetime | None:
+    """Estimate a chore's next execution time after tracking it.
+
+    Returns None for chores without a schedule and the current estimate
+    for period types whose schedule is not known locally, such as the
+    weekdays of weekly chores.
+    """
+    period_type = getattr(chore, "period_type", None)
+    period_type = getattr(period_type, "value", period_type)
+    current = getattr(chore, "next_estimated_execution_time", None)
+    period_days = getattr(chore, "period_days", None) or 1
+
+    if period_type == "manually":
+        return None
+    if period_type == "dynamic-regular":
+        return tracked_time + timedelta(days=period_days)
+    if period_type == "hourly":
+        return tracked_time + timedelta(hours=1)
+    if period_type in ("daily", "monthly", "yearly") and current is not None:
+        # Fixed schedules move on from the current due date; months are
+        # counted from it, so a clamped day of month does not drift.
+        due, steps = current, 0
+        while current <= tracked_time:
+            steps += 1
+            if period_type == "daily":
+                current = due + timedelta(days=steps * period_days)
+            else:
+                months = period_days if period_type == "monthly" else 12
+                current = _add_months(due, steps * months)
+        return current
+    return current
+
+
+def apply_chore_executed(
+    chores: List[Any], chore_id: int, tracked_time: datetime | None = None
+) -> List[Any]:
+    """Return the chores with the given chore tracked."""
+    updated = []
+    for chore in chores:
+        if getattr(chore, "id", None) != chore_id:
+            updated.append(chore)
+            continue
+        reference = getattr(chore, "next_estimated_execution_time", None) or getattr(
+            chore, "last_tracked_time", None
+        )
+        tracked = _same_kind(tracked_time or datetime.now(), reference)
+        changes = {
+            "last_tracked_time": tracked,
+            "next_estimated_execution_time": next_chore_execution(chore, tracked),
+        }
+        if (track_count := getattr(chore, "track_count", None)) is not None:
+            changes["track_count"] = track_count + 1
+        updated.append(_with_changes(chore, changes))
+    return updated
+
+
+def apply_task_completed(tasks: List[Any], task_id: int) -> List[Any]:
+    """Return the tasks without the completed task."""
+    return [task for task in tasks if getattr(task, "id", None) != task_id]
+
+
+def apply_battery_charged(
+    batteries: List[Any], battery_id: int, charged_time: datetime | None = None
+) -> List[Any]:
+    """Return the batteries with the given battery charged."""
+    updated = []
+    for battery in batteries:
+        if getattr(battery, "id", None) != battery_id:
+            updated.append(battery)
+            continue
+        reference = getattr(battery, "next_estimated_charge_time", None) or getattr(
+            battery, "last_tracked_time", None
+        )
+        charged = _same_kind(charged_time or datetime.now(), reference)
+        changes: Dict[str, Any] = {"last_tracked_time": charged, "last_charged": charged}
+        if interval := getattr(battery, "charge_interval_days", None):
+            changes["next_estimated_charge_time"] = charged + timedelta(days=interval)
+        if (cycles := getattr(battery, "charge_cycles_count", None)) is not None:
+            changes["charge_cycles_count"] = cycles + 1
+        updated.append(_with_changes(battery, changes))
+    return updated
+
+
+def apply_stock_change(
+    stock: List[Any], product_id: int, amount: float = 0, opened: float = 0
+) -> List[Any]:
+    """Return the stock with a product's amount and opened amount changed.
+
+    Products whose amount drops to zero disappear from the stock like they
+    do in Grocy. New products cannot be added locally and show up with
+    the next fetch. Stock restored from the cache holds the product
+    fields directly.
+    """
+    updated = []
+    for record in stock:
+        cached = isinstance(record, CachedItem)
+        product = record if cached else getattr(record, "product", None)
+        if getattr(product, "id", None) != product_id:
+            updated.append(record)
+            continue
+
+        available = (getattr(product, "available_amount", None) or 0) + amount
+        if available <= 0:
+            continue
+        changes: Dict[str, Any] = {"available_amount": available}
+        if (aggregated := getattr(product, "amount_aggregated", None)) is not None:
+            changes["amount_aggregated"] = max(aggregated + amount, 0)
+        if (amount_opened := getattr(product, "amount_opened", None)) is not None:
+            changes["amount_opened"] = min(max(amount_opened + opened, 0), available)
+
+        if cached:
+            updated.append(_with_changes(record, changes))
+            continue
+        row = record.row.model_copy(
+            update={STOCK_ROW_FIELDS[name]: value for name, value in changes.items()}
+        )
+        updated.append(ProductWrapper(row))
+    return updated
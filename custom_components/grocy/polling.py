@@ -0,0 +1,197 @@
+"""Adaptive polling and refresh scheduling for the Grocy coordinators."""
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, time, timedelta
+import logging
+from typing import Any, Awaitable, Callable, Coroutine, Iterable
+
+from .const import (
+    ACTIVE_UPDATE_INTERVAL,
+    ACTIVITY_WINDOW,
+    IDLE_BACKOFF_FACTOR,
+    REFRESH_MAX_DELAY,
+    REFRESH_QUIET_WINDOW,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AdaptivePollingController:
+    """Compute the update interval of a domain coordinator.
+
+    The interval drops to `ACTIVE_UPDATE_INTERVAL` for `ACTIVITY_WINDOW`
+    after a write (service call or button press), shrinks so that the next
+    poll happens right after an upcoming due time, returns to the
+    configured base interval when data changed, and backs off towards
+    `max_interval` while Grocy stays idle.
+    """
+
+    def __init__(self, base_interval: timedelta, max_interval: timedelta) -> None:
+        """Initialize the controller."""
+        self.base_interval = base_interval
+        self.max_interval = max(max_interval, base_interval)
+        self.current_interval = base_interval
+        self._active_until: datetime | None = None
+
+    def record_activity(self, now: datetime | None = None) -> timedelta:
+        """Poll quickly for a while after a write to Grocy."""
+        now = now or datetime.now()
+        self._active_until = now + ACTIVITY_WINDOW
+        self.current_interval = min(ACTIVE_UPDATE_INTERVAL, self.base_interval)
+        return self.current_interval
+
+    def next_interval(
+        self,
+        changed: bool,
+        next_due: datetime | None = None,
+        now: datetime | None = None,
+    ) -> timedelta:
+        """Return the interval until the next poll after a refresh."""
+        now = now or datetime.now()
+
+        if self._active_until is not None and now < self._active_until:
+            interval = min(ACTIVE_UPDATE_INTERVAL, self.base_interval)
+        elif changed:
+            interval = self.base_interval
+        else:
+            interval = min(
+                max(self.current_interval, self.base_interval) * IDLE_BACKOFF_FACTOR,
+                self.max_interval,
+            )
+
+        if next_due is not None and now < next_due < now + interval:
+            # Poll right after the due time so overdue state flips promptly
+            interval = max(
+                next_due - now + timedelta(seconds=1), ACTIVE_UPDATE_INTERVAL
+            )
+
+        self.current_interval = interval
+        return interval
+
+
+def next_due_time(items_by_key: dict, now: datetime | None = None) -> datetime | None:
+    """Return the earliest upcoming due time among the given items.
+
+    Looks at the chores' next execution time, the batteries' next charge
+    time, the products' best before date and the tasks' due date. A task
+    becomes overdue once its due date has passed, at the following
+    midnight.
+    """
+    now = now or datetime.now()
+    upcoming: datetime | None = None
+    for items in items_by_key.values():
+        for item in items or []:
+            for attr in (
+                "next_estimated_execution_time",
+                "next_estimated_charge_time",
+                "best_before_date",
+                "due_date",
+            ):
+                value = getattr(item, attr, None)
+                if isinstance(value, datetime):
+                    if value.tzinfo:
+                        value = value.replace(tzinfo=None)
+                elif isinstance(value, date):
+                    value = datetime.combine(value + timedelta(days=1), time.min)
+                else:
+                    continue
+                if value > now and (upcoming is None or value < upcoming):
+                    upcoming = value
+                break
+    return upcoming
+
+
+class DirtyKeyRefreshQueue:
+    """Coalesce the refreshes requested by bursts of writes.
+
+    Keys marked dirty are collected and refreshed together with a single
+    call once no key was marked for `quiet_window`. A steady stream of
+    writes cannot postpone the refresh for more than `max_delay` after the
+    first key of the burst was marked. Refreshes never overlap: a refresh
+    started while the previous one still runs waits for it to finish.
+
+    `create_task` starts the refresh tasks, e.g. as background tasks of
+    the config entry; by default they run on the event loop.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[list[str]], Awaitable[None]],
+        quiet_window: timedelta = REFRESH_QUIET_WINDOW,
+        max_delay: timedelta = REFRESH_MAX_DELAY,
+        create_task: Callable[[Coroutine[Any, Any, None]], asyncio.Task] | None = None,
+    ) -> None:
+        """Initialize the queue."""
+        self._refresh = refresh
+        self._create_task = create_task
+        self._quiet_window = quiet_window.total_seconds()
+        self._max_delay = max(max_delay.total_seconds(), self._quiet_window)
+        self._dirty: dict[str, None] = {}
+        self._first_marked: float | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def dirty_keys(self) -> list[str]:
+        """Return the keys waiting to be refreshed."""
+        return list(self._dirty)
+
+    def mark_dirty(self, entity_keys: Iterable[str]) -> None:
+        """Mark keys for refresh and restart the quiet window."""
+        self._dirty.update(dict.fromkeys(entity_keys))
+        if not self._dirty:
+            return
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._first_marked is None:
+            self._first_marked = now
+        delay = min(self._quiet_window, self._first_marked + self._max_delay - now)
+
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_later(max(delay, 0), self._fire)
+
+    def _fire(self) -> None:
+        """Start refreshing the keys marked so far."""
+        self._timer = None
+        target = self._async_flush_after(self._task)
+        if self._create_task is not None:
+            self._task = self._create_task(target)
+        else:
+            self._task = asyncio.get_running_loop().create_task(target)
+
+    async def _async_flush_after(self, previous: asyncio.Task | None) -> None:
+        """Refresh the dirty keys once the previous refresh finished."""
+        if previous is not None and not previous.done():
+            await asyncio.wait([previous])
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Refresh all dirty keys now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        keys = list(self._dirty)
+        self._dirty.clear()
+        self._first_marked = None
+        if not keys:
+            return
+
+        _LOGGER.debug("Refreshing %s after writes", keys)
+        try:
+            await self._refresh(keys)
+        except Exception as error:  # pylint: disable=broad-except
+            _LOGGER.warning("Failed to refresh %s: %s", keys, error)
+
+    def cancel(self) -> None:
+        """Drop the pending refresh."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        self._dirty.clear()
+        self._first_marked = None
@@ -7,11 +7,13 @@ from dataclasses import dataclass, replace
 from typing import Any, List
 
 from homeassistant.components.sensor import (
+    SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
@@ -20,6 +22,7 @@ from .const import (
     ATTR_BATTERIES,
     ATTR_CHORES,
     ATTR_MEAL_PLAN,
+    ATTR_POLLING_INTERVAL,
     ATTR_SHOPPING_LIST,
     ATTR_STOCK,
     ATTR_TASKS,
@@ -72,7 +75,14 @@ async def async_setup_entry(
                 description.key,
             )
 
-    async_add_entities(entities, True)
+    entity = GrocyPollingIntervalSensorEntity(
+        coordinator, POLLING_INTERVAL_SENSOR, config_entry
+    )
+    coordinator.entities.append(entity)
+    entities.append(entity)
+
+    # The data was fetched by the warm-up refresh during setup
+    async_add_entities(entities)
 
 
 @dataclass
@@ -80,6 +90,7 @@ class GrocySensorEntityDescription(SensorEntityDescription):
     """Grocy sensor entity description."""
 
     attributes_fn: Callable[[List[Any]], Mapping[str, Any] | None] = lambda _: None
+    list_attribute: str | None = None
     exists_fn: Callable[[List[str]], bool] = lambda _: True
     entity_registry_enabled_default: bool = False
 
@@ -92,10 +103,7 @@ SENSORS: tuple[GrocySensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:broom",
         exists_fn=lambda entities: ATTR_CHORES in entities,
-        attributes_fn=lambda data: {
-            "chores": [x.as_dict() for x in data],
-            "count": len(data),
-        },
+        list_attribute="chores",
     ),
     GrocySensorEntityDescription(
         key=ATTR_MEAL_PLAN,
@@ -104,10 +112,7 @@ SENSORS: tuple[GrocySensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:silverware-variant",
         exists_fn=lambda entities: ATTR_MEAL_PLAN in entities,
-        attributes_fn=lambda data: {
-            "meals": [x.as_dict() for x in data],
-            "count": len(data),
-        },
+        list_attribute="meals",
     ),
     GrocySensorEntityDescription(
         key=ATTR_SHOPPING_LIST,
@@ -116,10 +121,7 @@ SENSORS: tuple[GrocySensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:cart-outline",
         exists_fn=lambda entities: ATTR_SHOPPING_LIST in entities,
-        attributes_fn=lambda data: {
-            "products": [x.as_dict() for x in data],
-            "count": len(data),
-        },
+        list_attribute="products",
     ),
     GrocySensorEntityDescription(
         key=ATTR_STOCK,
@@ -128,10 +130,7 @@ SENSORS: tuple[GrocySensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:fridge-outline",
         exists_fn=lambda entities: ATTR_STOCK in entities,
-        attributes_fn=lambda data: {
-            "products": [x.as_dict() for x in data],
-            "count": len(data),
-        },
+        list_attribute="products",
     ),
     GrocySensorEntityDescription(
         key=ATTR_TASKS,
@@ -140,10 +139,7 @@ SENSORS: tuple[GrocySensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:checkbox-marked-circle-outline",
         exists_fn=lambda entities: ATTR_TASKS in entities,
-        attributes_fn=lambda data: {
-            "tasks": [x.as_dict() for x in data],
-            "count": len(data),
-        },
+        list_attribute="tasks",
     ),
     GrocySensorEntityDescription(
         key=ATTR_BATTERIES,
@@ -152,10 +148,7 @@ SENSORS: tuple[GrocySensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:battery",
         exists_fn=lambda entities: ATTR_BATTERIES in entities,
-        attributes_fn=lambda data: {
-            "batteries": [x.as_dict() for x in data],
-            "count": len(data),
-        },
+        list_attribute="batteries",
     ),
 )
 
@@ -163,9 +156,52 @@ SENSORS: tuple[GrocySensorEntityDescription, ...] = (
 class GrocySensorEntity(GrocyEntity, SensorEntity):
     """Grocy sensor entity definition."""
 
+    # The item lists are kept out of the recorder, only the counts are stored
+    _unrecorded_attributes = frozenset(
+        description.list_attribute
+        for description in SENSORS
+        if description.list_attribute
+    )
+
     @property
     def native_value(self) -> StateType:
         """Return the value reported by the sensor."""
         entity_data = self.coordinator.data.get(self.entity_description.key, None)
 
         return len(entity_data) if entity_data else 0
+
+
+POLLING_INTERVAL_SENSOR = GrocySensorEntityDescription(
+    key=ATTR_POLLING_INTERVAL,
+    name="Grocy polling interval",
+    native_unit_of_measurement=UnitOfTime.SECONDS,
+    device_class=SensorDeviceClass.DURATION,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    icon="mdi:timer-sync-outline",
+)
+
+
+class GrocyPollingIntervalSensorEntity(GrocySensorEntity):
+    """Diagnostic sensor reporting the current adaptive polling intervals.
+
+    Also reports how many entity state writes the coordinator made and
+    how many it skipped because the entity's data did not change.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the sensor, updating it on every coordinator update."""
+        super().__init__(*args, **kwargs)
+        self.coordinator_context = None
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the shortest current update interval in seconds."""
+        return min(self.coordinator.polling_intervals.values())
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the update intervals and the state write counts."""
+        return {
+            **self.coordinator.polling_intervals,
+            **self.coordinator.state_write_stats,
+        }
@@ -1,13 +1,33 @@
 """Grocy services."""
 from __future__ import annotations
 
-import voluptuous as vol
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+import asyncio
 from datetime import datetime
+import time
 
-from .const import ATTR_CHORES, ATTR_TASKS, DOMAIN
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ATTR_BATTERIES,
+    ATTR_CHORES,
+    ATTR_MEAL_PLAN,
+    ATTR_SHOPPING_LIST,
+    ATTR_STOCK,
+    ATTR_TASKS,
+    DOMAIN,
+    UPDATE_DOMAINS,
+)
 from .coordinator import GrocyDataUpdateCoordinator
+from .json_encoder import to_json_safe
+from .optimistic import (
+    apply_battery_charged,
+    apply_chore_executed,
+    apply_stock_change,
+    apply_task_completed,
+)
 
 SERVICE_PRODUCT_ID = "product_id"
 SERVICE_AMOUNT = "amount"
@@ -26,6 +46,14 @@ SERVICE_RECIPE_ID = "recipe_id"
 SERVICE_BATTERY_ID = "battery_id"
 SERVICE_OBJECT_ID = "object_id"
 SERVICE_LIST_ID = "list_id"
+SERVICE_PRODUCTS = "products"
+SERVICE_OBJECTS = "objects"
+SERVICE_OBJECT_IDS = "object_ids"
+SERVICE_MAX_CONCURRENCY = "max_concurrency"
+SERVICE_STOP_ON_ERROR = "stop_on_error"
+SERVICE_ENTITY_KEY = "entity_key"
+SERVICE_OFFSET = "offset"
+SERVICE_LIMIT = "limit"
 
 SERVICE_ADD_PRODUCT = "add_product_to_stock"
 SERVICE_OPEN_PRODUCT = "open_product"
@@ -39,6 +67,13 @@ SERVICE_CONSUME_RECIPE = "consume_recipe"
 SERVICE_TRACK_BATTERY = "track_battery"
 SERVICE_ADD_MISSING_PRODUCTS_TO_SHOPPING_LIST = "add_missing_products_to_shopping_list"
 SERVICE_REMOVE_PRODUCT_IN_SHOPPING_LIST = "remove_product_in_shopping_list"
+SERVICE_ADD_PRODUCTS = "add_products_to_stock"
+SERVICE_OPEN_PRODUCTS = "open_products"
+SERVICE_CONSUME_PRODUCTS = "consume_products_from_stock"
+SERVICE_ADD_GENERIC_OBJECTS = "add_generic_objects"
+SERVICE_UPDATE_GENERIC_OBJECTS = "update_generic_objects"
+SERVICE_DELETE_GENERIC_OBJECTS = "delete_generic_objects"
+SERVICE_GET_ITEMS = "get_items"
 
 SERVICE_ADD_PRODUCT_SCHEMA = vol.All(
     vol.Schema(
@@ -153,6 +188,102 @@ SERVICE_REMOVE_PRODUCT_IN_SHOPPING_LIST_SCHEMA = vol.All(
     )
 )
 
+SERVICE_ADD_PRODUCTS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(SERVICE_PRODUCTS): vol.All(
+                cv.ensure_list, vol.Length(min=1), [SERVICE_ADD_PRODUCT_SCHEMA]
+            ),
+        }
+    )
+)
+
+SERVICE_OPEN_PRODUCTS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(SERVICE_PRODUCTS): vol.All(
+                cv.ensure_list, vol.Length(min=1), [SERVICE_OPEN_PRODUCT_SCHEMA]
+            ),
+        }
+    )
+)
+
+SERVICE_CONSUME_PRODUCTS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(SERVICE_PRODUCTS): vol.All(
+                cv.ensure_list, vol.Length(min=1), [SERVICE_CONSUME_PRODUCT_SCHEMA]
+            ),
+        }
+    )
+)
+
+SERVICE_BULK_GENERIC_FIELDS = {
+    vol.Required(SERVICE_ENTITY_TYPE): str,
+    vol.Optional(SERVICE_MAX_CONCURRENCY): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=16)
+    ),
+    vol.Optional(SERVICE_STOP_ON_ERROR, default=False): bool,
+}
+
+SERVICE_ADD_GENERIC_OBJECTS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **SERVICE_BULK_GENERIC_FIELDS,
+            vol.Required(SERVICE_OBJECTS): vol.All(
+                cv.ensure_list, vol.Length(min=1), [dict]
+            ),
+        }
+    )
+)
+
+SERVICE_UPDATE_GENERIC_OBJECTS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **SERVICE_BULK_GENERIC_FIELDS,
+            vol.Required(SERVICE_OBJECTS): vol.All(
+                cv.ensure_list,
+                vol.Length(min=1),
+                [
+                    vol.Schema(
+                        {
+                            vol.Required(SERVICE_OBJECT_ID): vol.Coerce(int),
+                            vol.Required(SERVICE_DATA): dict,
+                        }
+                    )
+                ],
+            ),
+        }
+    )
+)
+
+SERVICE_DELETE_GENERIC_OBJECTS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **SERVICE_BULK_GENERIC_FIELDS,
+            vol.Required(SERVICE_OBJECT_IDS): vol.All(
+                cv.ensure_list, vol.Length(min=1), [vol.Coerce(int)]
+            ),
+        }
+    )
+)
+
+SERVICE_GET_ITEMS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(SERVICE_ENTITY_KEY): vol.In(
+                [key for keys in UPDATE_DOMAINS.values() for key in keys]
+            ),
+            vol.Optional(SERVICE_OFFSET, default=0): vol.All(
+                vol.Coerce(int), vol.Range(min=0)
+            ),
+            vol.Optional(SERVICE_LIMIT, default=100): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=1000)
+            ),
+        }
+    )
+)
+
 SERVICES_WITH_ACCOMPANYING_SCHEMA: list[tuple[str, vol.Schema]] = [
     (SERVICE_ADD_PRODUCT, SERVICE_ADD_PRODUCT_SCHEMA),
     (SERVICE_OPEN_PRODUCT, SERVICE_OPEN_PRODUCT_SCHEMA),
@@ -166,8 +297,89 @@ SERVICES_WITH_ACCOMPANYING_SCHEMA: list[tuple[str, vol.Schema]] = [
     (SERVICE_TRACK_BATTERY, SERVICE_TRACK_BATTERY_SCHEMA),
     (SERVICE_ADD_MISSING_PRODUCTS_TO_SHOPPING_LIST, SERVICE_ADD_MISSING_PRODUCTS_TO_SHOPPING_LIST_SCHEMA),
     (SERVICE_REMOVE_PRODUCT_IN_SHOPPING_LIST, SERVICE_REMOVE_PRODUCT_IN_SHOPPING_LIST_SCHEMA),
+    (SERVICE_ADD_PRODUCTS, SERVICE_ADD_PRODUCTS_SCHEMA),
+    (SERVICE_OPEN_PRODUCTS, SERVICE_OPEN_PRODUCTS_SCHEMA),
+    (SERVICE_CONSUME_PRODUCTS, SERVICE_CONSUME_PRODUCTS_SCHEMA),
+    (SERVICE_ADD_GENERIC_OBJECTS, SERVICE_ADD_GENERIC_OBJECTS_SCHEMA),
+    (SERVICE_UPDATE_GENERIC_OBJECTS, SERVICE_UPDATE_GENERIC_OBJECTS_SCHEMA),
+    (SERVICE_DELETE_GENERIC_OBJECTS, SERVICE_DELETE_GENERIC_OBJECTS_SCHEMA),
+    (SERVICE_GET_ITEMS, SERVICE_GET_ITEMS_SCHEMA),
 ]
 
+# Services returning a per-item result as service response.
+SERVICES_WITH_RESPONSE = (
+    SERVICE_ADD_PRODUCTS,
+    SERVICE_OPEN_PRODUCTS,
+    SERVICE_CONSUME_PRODUCTS,
+    SERVICE_ADD_GENERIC_OBJECTS,
+    SERVICE_UPDATE_GENERIC_OBJECTS,
+    SERVICE_DELETE_GENERIC_OBJECTS,
+)
+
+# Services that only read the coordinator data and always return it.
+SERVICES_RESPONSE_ONLY = (SERVICE_GET_ITEMS,)
+
+STOCK_KEYS = UPDATE_DOMAINS[ATTR_STOCK]
+
+# Coordinator keys whose data changes when a service writes to Grocy. Only
+# these keys are refetched after the call.
+SERVICE_REFRESH_KEYS: dict[str, tuple[str, ...]] = {
+    SERVICE_ADD_PRODUCT: STOCK_KEYS,
+    SERVICE_OPEN_PRODUCT: STOCK_KEYS,
+    SERVICE_CONSUME_PRODUCT: STOCK_KEYS,
+    SERVICE_ADD_PRODUCTS: STOCK_KEYS,
+    SERVICE_OPEN_PRODUCTS: STOCK_KEYS,
+    SERVICE_CONSUME_PRODUCTS: STOCK_KEYS,
+    SERVICE_EXECUTE_CHORE: UPDATE_DOMAINS[ATTR_CHORES],
+    SERVICE_COMPLETE_TASK: UPDATE_DOMAINS[ATTR_TASKS],
+    SERVICE_CONSUME_RECIPE: STOCK_KEYS,
+    SERVICE_TRACK_BATTERY: UPDATE_DOMAINS[ATTR_BATTERIES],
+    SERVICE_ADD_MISSING_PRODUCTS_TO_SHOPPING_LIST: UPDATE_DOMAINS[ATTR_SHOPPING_LIST],
+    SERVICE_REMOVE_PRODUCT_IN_SHOPPING_LIST: UPDATE_DOMAINS[ATTR_SHOPPING_LIST],
+}
+
+# Coordinator keys affected by the generic services, by Grocy entity type.
+# Master data shows up in the stock and the shopping list.
+GENERIC_REFRESH_KEYS: dict[str, tuple[str, ...]] = {
+    **UPDATE_DOMAINS,
+    "meal_plan_sections": UPDATE_DOMAINS[ATTR_MEAL_PLAN],
+    "recipes": UPDATE_DOMAINS[ATTR_MEAL_PLAN],
+    "products": STOCK_KEYS + (ATTR_SHOPPING_LIST,),
+    "product_barcodes": STOCK_KEYS + (ATTR_SHOPPING_LIST,),
+    "product_groups": STOCK_KEYS + (ATTR_SHOPPING_LIST,),
+    "quantity_units": STOCK_KEYS + (ATTR_SHOPPING_LIST,),
+    "locations": STOCK_KEYS,
+    "shopping_lists": UPDATE_DOMAINS[ATTR_SHOPPING_LIST],
+    "task_categories": UPDATE_DOMAINS[ATTR_TASKS],
+}
+
+GENERIC_SERVICES = (
+    SERVICE_ADD_GENERIC,
+    SERVICE_UPDATE_GENERIC,
+    SERVICE_DELETE_GENERIC,
+    SERVICE_ADD_GENERIC_OBJECTS,
+    SERVICE_UPDATE_GENERIC_OBJECTS,
+    SERVICE_DELETE_GENERIC_OBJECTS,
+)
+
+
+def _invalidate_objects(coordinator, service_data, affected_keys) -> None:
+    """Drop the cached Grocy objects a generic service wrote to."""
+    coordinator.grocy_data.invalidate_objects(
+        str(service_data.get(SERVICE_ENTITY_TYPE) or ATTR_TASKS)
+    )
+    if ATTR_STOCK in affected_keys:
+        # Edits of products and their master data are not journaled
+        coordinator.grocy_data.journals.stock.request_full_sync()
+
+
+def _affected_keys(service: str, service_data) -> tuple[str, ...]:
+    """Return the coordinator keys affected by a service call."""
+    if service in GENERIC_SERVICES:
+        entity_type = service_data.get(SERVICE_ENTITY_TYPE) or ATTR_TASKS
+        return GENERIC_REFRESH_KEYS.get(str(entity_type), ())
+    return SERVICE_REFRESH_KEYS.get(service, ())
+
 
 async def async_setup_services(
     hass: HomeAssistant, config_entry: ConfigEntry  # pylint: disable=unused-argument
@@ -179,10 +391,14 @@ async def async_setup_services(
     if hass.services.async_services().get(DOMAIN):
         return
 
-    async def async_call_grocy_service(service_call: ServiceCall) -> None:
+    async def async_call_grocy_service(service_call: ServiceCall) -> ServiceResponse:
         """Call correct Grocy service."""
         service = service_call.service
         service_data = service_call.data
+        response: ServiceResponse = None
+
+        if service == SERVICE_GET_ITEMS:
+            return async_get_items_service(coordinator, service_data)
 
         if service == SERVICE_ADD_PRODUCT:
             await async_add_product_service(hass, coordinator, service_data)
@@ -220,8 +436,68 @@ async def async_setup_services(
         elif service == SERVICE_REMOVE_PRODUCT_IN_SHOPPING_LIST:
             await async_remove_product_in_shopping_list_service(hass, coordinator, service_data)
 
+        elif service == SERVICE_ADD_PRODUCTS:
+            response = await async_batch_product_service(
+                hass, coordinator, service_data, async_add_product_service
+            )
+
+        elif service == SERVICE_OPEN_PRODUCTS:
+            response = await async_batch_product_service(
+                hass, coordinator, service_data, async_open_product_service
+            )
+
+        elif service == SERVICE_CONSUME_PRODUCTS:
+            response = await async_batch_product_service(
+                hass, coordinator, service_data, async_consume_product_service
+            )
+
+        elif service == SERVICE_ADD_GENERIC_OBJECTS:
+            response = await async_bulk_generic_service(
+                hass,
+                coordinator,
+                service_data,
+                async_add_generic_service,
+                [{SERVICE_DATA: obj} for obj in service_data[SERVICE_OBJECTS]],
+            )
+
+        elif service == SERVICE_UPDATE_GENERIC_OBJECTS:
+            response = await async_bulk_generic_service(
+                hass,
+                coordinator,
+                service_data,
+                async_update_generic_service,
+                service_data[SERVICE_OBJECTS],
+            )
+
+        elif service == SERVICE_DELETE_GENERIC_OBJECTS:
+            response = await async_bulk_generic_service(
+                hass,
+                coordinator,
+                service_data,
+                async_delete_generic_service,
+                [{SERVICE_OBJECT_ID: obj_id} for obj_id in service_data[SERVICE_OBJECT_IDS]],
+            )
+
+        affected_keys = _affected_keys(service, service_data)
+        if service in GENERIC_SERVICES:
+            _invalidate_objects(coordinator, service_data, affected_keys)
+        coordinator.async_mark_keys_dirty(affected_keys)
+        return response
+
     for service, schema in SERVICES_WITH_ACCOMPANYING_SCHEMA:
-        hass.services.async_register(DOMAIN, service, async_call_grocy_service, schema)
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            async_call_grocy_service,
+            schema,
+            supports_response=(
+                SupportsResponse.ONLY
+                if service in SERVICES_RESPONSE_ONLY
+                else SupportsResponse.OPTIONAL
+                if service in SERVICES_WITH_RESPONSE
+                else SupportsResponse.NONE
+            ),
+        )
 
 
 async def async_unload_services(hass: HomeAssistant) -> None:
@@ -239,10 +515,10 @@ async def async_add_product_service(hass, coordinator, data):
     amount = data[SERVICE_AMOUNT]
     price = data.get(SERVICE_PRICE, "")
 
-    def wrapper():
-        coordinator.grocy_api.add_product(product_id, amount, price)
-
-    await hass.async_add_executor_job(wrapper)
+    await coordinator.grocy_api.add_product(product_id, amount, price)
+    coordinator.async_apply_local_change(
+        ATTR_STOCK, apply_stock_change, product_id, amount
+    )
 
 
 async def async_open_product_service(hass, coordinator, data):
@@ -251,12 +527,12 @@ async def async_open_product_service(hass, coordinator, data):
     amount = data[SERVICE_AMOUNT]
     allow_subproduct_substitution = data.get(SERVICE_SUBPRODUCT_SUBSTITUTION, False)
 
-    def wrapper():
-        coordinator.grocy_api.open_product(
-            product_id, amount, allow_subproduct_substitution
-        )
-
-    await hass.async_add_executor_job(wrapper)
+    await coordinator.grocy_api.open_product(
+        product_id, amount, allow_subproduct_substitution
+    )
+    coordinator.async_apply_local_change(
+        ATTR_STOCK, apply_stock_change, product_id, 0, amount
+    )
 
 
 async def async_consume_product_service(hass, coordinator, data):
@@ -280,16 +556,46 @@ async def async_consume_product_service(hass, coordinator, data):
         if transaction_type_raw is not None:
             transaction_type = TransactionType[transaction_type_raw]
 
-    def wrapper():
-        coordinator.grocy_api.consume_product(
-            product_id,
-            amount,
-            spoiled=spoiled,
-            transaction_type=transaction_type,
-            allow_subproduct_substitution=allow_subproduct_substitution,
+    await coordinator.grocy_api.consume_product(
+        product_id,
+        amount,
+        spoiled=spoiled,
+        transaction_type=transaction_type,
+        allow_subproduct_substitution=allow_subproduct_substitution,
+    )
+    if transaction_type_raw in (None, "CONSUME"):
+        coordinator.async_apply_local_change(
+            ATTR_STOCK, apply_stock_change, product_id, -amount
         )
 
-    await hass.async_add_executor_job(wrapper)
+
+async def async_batch_product_service(hass, coordinator, data, item_service):
+    """Run a stock service for many products.
+
+    The items run concurrently, limited to the configured number of
+    parallel Grocy requests. A failing item does not stop the others;
+    the outcome of every item is returned in request order.
+    """
+    semaphore = asyncio.Semaphore(coordinator.max_concurrent_requests)
+
+    async def run_item(item):
+        result = {SERVICE_PRODUCT_ID: item[SERVICE_PRODUCT_ID]}
+        async with semaphore:
+            try:
+                await item_service(hass, coordinator, item)
+            except Exception as error:  # pylint: disable=broad-except
+                result.update(success=False, error=str(error))
+            else:
+                result["success"] = True
+        return result
+
+    results = await asyncio.gather(*(run_item(item) for item in data[SERVICE_PRODUCTS]))
+    succeeded = sum(1 for result in results if result["success"])
+    return {
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": list(results),
+    }
 
 
 async def async_execute_chore_service(hass, coordinator, data):
@@ -301,116 +607,136 @@ async def async_execute_chore_service(hass, coordinator, data):
     tracked_time = datetime.now() if should_track_now else None
     skipped = data.get(SERVICE_SKIPPED, False)
 
-    def wrapper():
-        coordinator.grocy_api.execute_chore(chore_id, done_by, tracked_time, skipped=skipped)
-
-    await hass.async_add_executor_job(wrapper)
-    await coordinator.async_force_update_entity(ATTR_CHORES)
+    await coordinator.grocy_api.execute_chore(chore_id, done_by, tracked_time, skipped=skipped)
+    coordinator.async_apply_local_change(
+        ATTR_CHORES, apply_chore_executed, chore_id, tracked_time
+    )
 
 
 async def async_complete_task_service(hass, coordinator, data):
     """Complete a task in Grocy."""
     task_id = data[SERVICE_TASK_ID]
 
-    def wrapper():
-        coordinator.grocy_api.complete_task(task_id)
+    await coordinator.grocy_api.complete_task(task_id)
+    coordinator.async_apply_local_change(ATTR_TASKS, apply_task_completed, task_id)
 
-    await hass.async_add_executor_job(wrapper)
-    await coordinator.async_force_update_entity(ATTR_TASKS)
 
+def _entity_type(data):
+    """Return the Grocy entity type of a generic service call."""
+    entity_type_raw = data.get(SERVICE_ENTITY_TYPE, None)
 
-async def async_add_generic_service(hass, coordinator, data):
-    """Add a generic entity in Grocy."""
     # Import EntityType lazily so the module can be imported when pygrocy2
     # isn't available in the dev environment.
     try:
         from pygrocy2.grocy import EntityType
     except Exception:  # pragma: no cover - environment dependent
-        entity_type_raw = data.get(SERVICE_ENTITY_TYPE, None)
-        entity_type = entity_type_raw
-    else:
-        entity_type_raw = data.get(SERVICE_ENTITY_TYPE, None)
-        entity_type = EntityType.TASKS
+        return entity_type_raw
 
-        if entity_type_raw is not None:
-            entity_type = EntityType(entity_type_raw)
+    if entity_type_raw is None:
+        return EntityType.TASKS
+    return EntityType(entity_type_raw)
 
-    data = data[SERVICE_DATA]
 
-    def wrapper():
-        coordinator.grocy_api.add_generic(entity_type, data)
+async def async_add_generic_service(hass, coordinator, data):
+    """Add a generic entity in Grocy."""
+    entity_type = _entity_type(data)
+    data = data[SERVICE_DATA]
 
-    await hass.async_add_executor_job(wrapper)
-    await post_generic_refresh(coordinator, entity_type);
+    return await coordinator.grocy_api.add_generic(entity_type, data)
 
 
 async def async_update_generic_service(hass, coordinator, data):
     """Update a generic entity in Grocy."""
-    entity_type_raw = data.get(SERVICE_ENTITY_TYPE, None)
-    entity_type = EntityType.TASKS
-
-    if entity_type_raw is not None:
-        entity_type = EntityType(entity_type_raw)
-
+    entity_type = _entity_type(data)
     object_id = data[SERVICE_OBJECT_ID]
 
     data = data[SERVICE_DATA]
 
-    def wrapper():
-        coordinator.grocy_api.update_generic(entity_type, object_id, data)
-
-    await hass.async_add_executor_job(wrapper)
-    await post_generic_refresh(coordinator, entity_type);
+    return await coordinator.grocy_api.update_generic(entity_type, object_id, data)
 
 
 async def async_delete_generic_service(hass, coordinator, data):
     """Delete a generic entity in Grocy."""
-    entity_type_raw = data.get(SERVICE_ENTITY_TYPE, None)
-    entity_type = EntityType.TASKS
-
-    if entity_type_raw is not None:
-        entity_type = EntityType(entity_type_raw)
-
+    entity_type = _entity_type(data)
     object_id = data[SERVICE_OBJECT_ID]
 
-    def wrapper():
-        coordinator.grocy_api.delete_generic(entity_type, object_id)
+    return await coordinator.grocy_api.delete_generic(entity_type, object_id)
 
-    await hass.async_add_executor_job(wrapper)
-    await post_generic_refresh(coordinator, entity_type);
 
+async def async_bulk_generic_service(hass, coordinator, data, item_service, items):
+    """Run a generic service for many objects of one entity type.
+
+    The objects run concurrently, limited to `max_concurrency` (default:
+    the configured number of parallel Grocy requests). With
+    `stop_on_error` set, objects not started yet are skipped once one
+    fails. The outcome and duration of every object is returned in
+    request order.
+    """
+    semaphore = asyncio.Semaphore(
+        data.get(SERVICE_MAX_CONCURRENCY) or coordinator.max_concurrent_requests
+    )
+    stop_on_error = data.get(SERVICE_STOP_ON_ERROR, False)
+    failed = asyncio.Event()
+
+    async def run_item(index, item):
+        result = {"index": index}
+        if SERVICE_OBJECT_ID in item:
+            result[SERVICE_OBJECT_ID] = item[SERVICE_OBJECT_ID]
+        async with semaphore:
+            if stop_on_error and failed.is_set():
+                result.update(success=False, skipped=True)
+                return result
+            start = time.monotonic()
+            try:
+                response = await item_service(
+                    hass,
+                    coordinator,
+                    {SERVICE_ENTITY_TYPE: data[SERVICE_ENTITY_TYPE], **item},
+                )
+            except Exception as error:  # pylint: disable=broad-except
+                failed.set()
+                result.update(success=False, error=str(error))
+            else:
+                result["success"] = True
+                if isinstance(response, dict) and "created_object_id" in response:
+                    result["created_object_id"] = response["created_object_id"]
+            result["duration_ms"] = round((time.monotonic() - start) * 1000, 1)
+        return result
+
+    results = await asyncio.gather(
+        *(run_item(index, item) for index, item in enumerate(items))
+    )
+    succeeded = sum(1 for result in results if result["success"])
+    skipped = sum(1 for result in results if result.get("skipped"))
+    return {
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded - skipped,
+        "skipped": skipped,
+        "results": list(results),
+    }
 
-async def post_generic_refresh(coordinator, entity_type):
-    if entity_type == "tasks" or entity_type == "chores":
-        await coordinator.async_force_update_entity(entity_type)
 
 async def async_consume_recipe_service(hass, coordinator, data):
     """Consume a recipe in Grocy."""
     recipe_id = data[SERVICE_RECIPE_ID]
 
-    def wrapper():
-        coordinator.grocy_api.consume_recipe(recipe_id)
-
-    await hass.async_add_executor_job(wrapper)
+    await coordinator.grocy_api.consume_recipe(recipe_id)
 
 
 async def async_track_battery_service(hass, coordinator, data):
     """Track a battery in Grocy."""
     battery_id = data[SERVICE_BATTERY_ID]
 
-    def wrapper():
-        coordinator.grocy_api.charge_battery(battery_id)
-
-    await hass.async_add_executor_job(wrapper)
+    await coordinator.grocy_api.charge_battery(battery_id)
+    coordinator.async_apply_local_change(
+        ATTR_BATTERIES, apply_battery_charged, battery_id
+    )
 
 async def async_add_missing_products_to_shopping_list(hass, coordinator, data):
     """Adds currently missing proudcts (below defined min. stock amount) to the given shopping list."""
     list_id = data.get(SERVICE_LIST_ID, 1)
 
-    def wrapper():
-        coordinator.grocy_api.add_missing_product_to_shopping_list(list_id)
-
-    await hass.async_add_executor_job(wrapper)
+    await coordinator.grocy_api.add_missing_product_to_shopping_list(list_id)
 
 async def async_remove_product_in_shopping_list_service(hass, coordinator, data):
     """Removes the given product from the given shopping list"""
@@ -418,8 +744,26 @@ async def async_remove_product_in_shopping_list_service(hass, coordinator, data)
     list_id = data.get(SERVICE_LIST_ID, 1)
     amount = data[SERVICE_AMOUNT]
 
-    def wrapper():
-        coordinator.grocy_api.remove_product_in_shopping_list(product_id, list_id, amount)
-
-    await hass.async_add_executor_job(wrapper)
-
+    await coordinator.grocy_api.remove_product_in_shopping_list(product_id, list_id, amount)
+
+
+def async_get_items_service(coordinator, data):
+    """Return a page of the items the coordinator holds for a key.
+
+    The entity attributes only list the first items; this returns the
+    full lists from memory without a request to Grocy.
+    """
+    entity_key = data[SERVICE_ENTITY_KEY]
+    offset = data.get(SERVICE_OFFSET, 0)
+    limit = data.get(SERVICE_LIMIT, 100)
+    items = (coordinator.data or {}).get(entity_key) or []
+    return {
+        "entity_key": entity_key,
+        "total": len(items),
+        "offset": offset,
+        "limit": limit,
+        "items": [
+            to_json_safe(item.as_dict() if hasattr(item, "as_dict") else item)
+            for item in items[offset : offset + limit]
+        ],
+    }
@@ -0,0 +1,161 @@
+"""Persist the last known Grocy data between Home Assistant restarts."""
+from __future__ import annotations
+
+from datetime import date, datetime
+import json
+import logging
+from typing import Any, Callable, Dict, List
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .json_encoder import CustomJSONEncoder
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+# Fields restored as date/datetime so the overdue filters and the adaptive
+# polling work on cached items like on fetched ones.
+DATETIME_FIELDS = frozenset(
+    {
+        "best_before_date",
+        "last_charged",
+        "last_tracked_time",
+        "next_estimated_charge_time",
+        "next_estimated_execution_time",
+    }
+)
+DATE_FIELDS = frozenset({"due_date", "day"})
+
+
+class CachedItem(dict):
+    """An item restored from the cache.
+
+    Holds the JSON-safe `as_dict()` output of the fetched item and exposes
+    it both as mapping and through attributes, which is all entities use.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        """Return a field as attribute."""
+        try:
+            value = self[name]
+        except KeyError as err:
+            raise AttributeError(name) from err
+        if isinstance(value, str):
+            try:
+                if name in DATETIME_FIELDS:
+                    return datetime.fromisoformat(value)
+                if name in DATE_FIELDS:
+                    return date.fromisoformat(value[:10])
+            except ValueError:
+                return value
+        return value
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the cached fields."""
+        return dict(self)
+
+
+def serialize_data(data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Return the coordinator data in compact JSON-safe form."""
+    serialized: Dict[str, List[Dict[str, Any]]] = {}
+    for key, items in data.items():
+        if not isinstance(items, list):
+            continue
+        try:
+            serialized[key] = json.loads(
+                json.dumps(
+                    [item.as_dict() if hasattr(item, "as_dict") else item for item in items],
+                    cls=CustomJSONEncoder,
+                    separators=(",", ":"),
+                )
+            )
+        except (TypeError, ValueError) as err:
+            _LOGGER.debug("Not caching '%s': %s", key, err)
+    return serialized
+
+
+def deserialize_data(serialized: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+    """Return coordinator data restored from its compact form."""
+    return {
+        key: [CachedItem(item) if isinstance(item, dict) else item for item in items]
+        for key, items in serialized.items()
+    }
+
+
+class GrocyDataStore:
+    """Store of the last successfully fetched data of a config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store[Dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.data"
+        )
+        self._data: Dict[str, Any] = {}
+        self._available_entities: List[str] = []
+
+    async def async_load(self) -> tuple[List[str], Dict[str, Any]] | None:
+        """Return the cached available entities and data, if any."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning("Could not load cached Grocy data: %s", err)
+            return None
+        if not stored or not stored.get("available_entities"):
+            return None
+        return (
+            list(stored["available_entities"]),
+            deserialize_data(stored.get("data", {})),
+        )
+
+    @callback
+    def async_schedule_save(
+        self, available_entities: List[str], data: Dict[str, Any] | None
+    ) -> None:
+        """Save the data after a short delay, coalescing frequent updates."""
+        if not data:
+            return
+        self._available_entities = list(available_entities)
+        self._data = data
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the data to write to disk."""
+        return {
+            "available_entities": self._available_entities,
+            "data": serialize_data(self._data),
+        }
+
+    async def async_remove(self) -> None:
+        """Remove the cache file."""
+        await self._store.async_remove()
+
+
+class GrocyJournalStore:
+    """Store of the journal cursors and the synced stock of a config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store[Dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.journal"
+        )
+
+    async def async_load(self) -> Dict[str, Any] | None:
+        """Return the stored journals, if any."""
+        try:
+            return await self._store.async_load()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning("Could not load the Grocy journal cursors: %s", err)
+            return None
+
+    @callback
+    def async_schedule_save(self, data_to_save: Callable[[], Dict[str, Any]]) -> None:
+        """Save the journals after a short delay, coalescing frequent updates."""
+        self._store.async_delay_save(data_to_save, SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the journal file."""
+        await self._store.async_remove()
@@ -0,0 +1,368 @@
+"""Incremental sync of Grocy data from its journal tables.
+
+Grocy appends a row to `stock_log`, `chores_log` and
+`battery_charge_cycles` for every booking, execution and charge. After
+one full read, only the rows after the last seen id are requested, so the
+transfer of a steady-state refresh grows with the activity in Grocy
+instead of the size of the inventory.
+"""
+from __future__ import annotations
+
+import asyncio
+from contextlib import AbstractAsyncContextManager, nullcontext
+from datetime import datetime
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Set, Tuple
+
+from pygrocy2.errors import GrocyError
+from pygrocy2.grocy_api_client import CurrentStockResponse
+
+if TYPE_CHECKING:
+    from .grocy_api import ProductStock
+
+_LOGGER = logging.getLogger(__name__)
+
+# Product master data can change without a stock booking, so the stock is
+# read in full at this interval (in seconds) even while the journal is
+# consistent.
+STOCK_FULL_SYNC_INTERVAL = 3600
+
+GROCY_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class FullSyncRequired(Exception):
+    """The journal cannot be applied and the data has to be read in full."""
+
+
+def _is_undone(row: Dict[str, Any]) -> bool:
+    """Return whether a journal row was undone."""
+    return str(row.get("undone") or "0") == "1"
+
+
+class JournalCursor:
+    """Position in a Grocy journal table.
+
+    Rows are read by id after `last_id`. A missing id right after the
+    cursor means rows were skipped and the cursor is no longer usable.
+    Rows that were undone since the previous read are found by their undo
+    time, which needs the db-changed-time of that read.
+    """
+
+    def __init__(self, table: str) -> None:
+        """Initialize the cursor."""
+        self.table = table
+        self.last_id: int | None = None
+        self.since: datetime | None = None
+        self.undone_ids: Set[int] = set()
+
+    def reset(self, last_id: int, undone_ids: Iterable[int] = ()) -> None:
+        """Move the cursor after a full read."""
+        self.last_id = last_id
+        self.undone_ids = set(undone_ids)
+
+    async def async_read(
+        self, api, db_changed: datetime | None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return the rows added and the known rows undone since the last read."""
+        if self.last_id is None:
+            raise FullSyncRequired(f"no cursor for {self.table}")
+
+        rows = sorted(
+            await api.get_generic_objects_for_type(
+                self.table, [f"id>{self.last_id}"]
+            )
+            or [],
+            key=lambda row: int(row["id"]),
+        )
+        if rows and int(rows[0]["id"]) != self.last_id + 1:
+            raise FullSyncRequired(
+                f"gap in {self.table} after id {self.last_id}, next is {rows[0]['id']}"
+            )
+
+        undone: List[Dict[str, Any]] = []
+        if self.since is not None:
+            for row in (
+                await api.get_generic_objects_for_type(
+                    self.table,
+                    ["undone=1", f"undone_timestamp>={self.since.strftime(GROCY_TIME_FORMAT)}"],
+                )
+                or []
+            ):
+                row_id = int(row["id"])
+                if row_id <= self.last_id and row_id not in self.undone_ids:
+                    undone.append(row)
+
+        if rows:
+            self.last_id = int(rows[-1]["id"])
+        self.undone_ids.update(int(row["id"]) for row in undone)
+        self.undone_ids.update(int(row["id"]) for row in rows if _is_undone(row))
+        self.since = db_changed
+        return rows, undone
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the cursor in JSON-safe form."""
+        return {
+            "last_id": self.last_id,
+            "since": self.since.isoformat() if self.since else None,
+            "undone_ids": sorted(self.undone_ids),
+        }
+
+    def restore(self, stored: Dict[str, Any]) -> None:
+        """Restore the cursor from its JSON-safe form."""
+        self.last_id = stored.get("last_id")
+        self.since = datetime.fromisoformat(stored["since"]) if stored.get("since") else None
+        self.undone_ids = set(stored.get("undone_ids") or [])
+
+
+class CountingJournal:
+    """Executions per object counted from a journal table.
+
+    Used for `chores_log` (per chore) and `battery_charge_cycles` (per
+    battery). New rows are added to the counts; when a counted row was
+    undone or the cursor broke, the table is counted again in full.
+    """
+
+    def __init__(self, table: str, key_field: str) -> None:
+        """Initialize the journal."""
+        self.cursor = JournalCursor(table)
+        self._key_field = key_field
+        self._lock = asyncio.Lock()
+        self.counts: Dict[int, int] = {}
+        # object id -> (tracked time, row id, user id) of the latest row
+        self.latest: Dict[int, Tuple[str, int, Any]] = {}
+        self._synced: Tuple[Dict[str, Any], Dict[int, int], Dict[int, Any]] | None = None
+
+    async def async_sync(self, api, db_changed: datetime | None) -> None:
+        """Apply the rows added since the last sync."""
+        async with self._lock:
+            try:
+                rows, undone = await self.cursor.async_read(api, db_changed)
+                if undone:
+                    raise FullSyncRequired(f"rows of {self.cursor.table} were undone")
+            except FullSyncRequired as err:
+                _LOGGER.debug("Reading %s in full: %s", self.cursor.table, err)
+                await self._async_full_sync(api, db_changed)
+            else:
+                self._count(rows)
+            self._synced = (self.cursor.as_dict(), dict(self.counts), dict(self.latest))
+
+    async def _async_full_sync(self, api, db_changed: datetime | None) -> None:
+        """Count the whole table."""
+        rows = await api.get_generic_objects_for_type(self.cursor.table) or []
+        self.counts = {}
+        self.latest = {}
+        self._count(rows)
+        self.cursor.reset(
+            max((int(row["id"]) for row in rows), default=0),
+            (int(row["id"]) for row in rows if _is_undone(row)),
+        )
+        self.cursor.since = db_changed
+
+    def _count(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Add the rows that were not undone to the counts."""
+        for row in rows:
+            if _is_undone(row):
+                continue
+            key = int(row[self._key_field])
+            self.counts[key] = self.counts.get(key, 0) + 1
+            latest = (
+                str(row.get("tracked_time") or ""),
+                int(row["id"]),
+                row.get("done_by_user_id"),
+            )
+            if latest[:2] > self.latest.get(key, ("", -1, None))[:2]:
+                self.latest[key] = latest
+
+    def as_dict(self) -> Dict[str, Any] | None:
+        """Return the journal as of the last sync in JSON-safe form."""
+        if (synced := self._synced) is None:
+            return None
+        cursor, counts, latest = synced
+        return {
+            "cursor": cursor,
+            "counts": {str(key): count for key, count in counts.items()},
+            "latest": {str(key): list(row) for key, row in latest.items()},
+        }
+
+    def restore(self, stored: Dict[str, Any]) -> None:
+        """Restore the journal from its JSON-safe form."""
+        self.cursor.restore(stored.get("cursor") or {})
+        self.counts = {int(key): count for key, count in stored.get("counts", {}).items()}
+        self.latest = {
+            int(key): tuple(latest) for key, latest in stored.get("latest", {}).items()
+        }
+        self._synced = (self.cursor.as_dict(), dict(self.counts), dict(self.latest))
+
+
+class StockJournal:
+    """The current stock kept up to date from `stock_log`.
+
+    A full read takes the `/stock` snapshot after noting the newest journal
+    id. Later syncs read the journal rows after that id (and those undone
+    since) and request `/stock/products/{id}` for the affected products
+    only, and their parents, whose aggregated amounts change with them.
+
+    The requests of a sync are sent concurrently, each under the given
+    semaphore, so the sync keeps to the request limit of its caller.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the journal."""
+        self.cursor = JournalCursor("stock_log")
+        self._lock = asyncio.Lock()
+        self._rows: Dict[int, CurrentStockResponse] | None = None
+        self._full_sync_due = 0.0
+        self._synced: Tuple[Dict[str, Any], Dict[int, CurrentStockResponse]] | None = None
+
+    def request_full_sync(self) -> None:
+        """Read the stock in full with the next sync, e.g. after a product edit."""
+        self._full_sync_due = 0.0
+
+    async def async_sync(
+        self,
+        api,
+        db_changed: datetime | None,
+        semaphore: asyncio.Semaphore | None = None,
+    ) -> List[CurrentStockResponse]:
+        """Return the current stock, updated from the journal."""
+        limit: AbstractAsyncContextManager[Any] = semaphore or nullcontext()
+        async with self._lock:
+            if (
+                self._rows is not None
+                and db_changed is not None
+                and db_changed == self.cursor.since
+                and time.monotonic() < self._full_sync_due
+            ):
+                # Nothing was booked since the last sync
+                return list(self._rows.values())
+            try:
+                if self._rows is None or time.monotonic() >= self._full_sync_due:
+                    raise FullSyncRequired("snapshot missing or due")
+                try:
+                    await self._async_apply(api, db_changed, limit)
+                except Exception:
+                    # The cursor may be ahead of the products refreshed so far
+                    self._full_sync_due = 0.0
+                    raise
+            except FullSyncRequired as err:
+                _LOGGER.debug("Reading the stock in full: %s", err)
+                await self._async_full_sync(api, db_changed, limit)
+            self._synced = (self.cursor.as_dict(), dict(self._rows))
+            return list(self._rows.values())
+
+    async def _async_full_sync(
+        self, api, db_changed: datetime | None, limit: AbstractAsyncContextManager[Any]
+    ) -> None:
+        """Read the stock snapshot and move the cursor to the newest row."""
+        # The newest id is read first: rows added meanwhile are applied again
+        # with the next sync, which is harmless.
+        async with limit:
+            last_id = await api.get_last_object_id(self.cursor.table)
+        self.cursor.reset(last_id or 0)
+        self.cursor.since = db_changed
+        async with limit:
+            stock = await api.get_stock()
+        self._rows = {row.product_id: row for row in stock}
+        self._full_sync_due = time.monotonic() + STOCK_FULL_SYNC_INTERVAL
+
+    async def _async_apply(
+        self, api, db_changed: datetime | None, limit: AbstractAsyncContextManager[Any]
+    ) -> None:
+        """Refresh the products booked since the last sync."""
+        async with limit:
+            rows, undone = await self.cursor.async_read(api, db_changed)
+        product_ids = list(dict.fromkeys(int(row["product_id"]) for row in rows + undone))
+        refreshed: Set[int] = set()
+        # Parents are only known from the details of their children, so
+        # they are requested in a further round.
+        while product_ids:
+            refreshed.update(product_ids)
+            stocks = await asyncio.gather(
+                *(
+                    self._async_product_stock(api, product_id, limit)
+                    for product_id in product_ids
+                )
+            )
+            parent_ids: List[int] = []
+            for product_id, stock in zip(product_ids, stocks, strict=True):
+                if stock.row is None:
+                    self._rows.pop(product_id, None)
+                else:
+                    self._rows[product_id] = stock.row
+                if (
+                    stock.parent_product_id is not None
+                    and stock.parent_product_id not in refreshed
+                ):
+                    parent_ids.append(stock.parent_product_id)
+            product_ids = list(dict.fromkeys(parent_ids))
+
+    @staticmethod
+    async def _async_product_stock(
+        api, product_id: int, limit: AbstractAsyncContextManager[Any]
+    ) -> ProductStock:
+        """Return the stock of a product, which has to be readable."""
+        try:
+            async with limit:
+                return await api.get_product_stock(product_id)
+        except (GrocyError, ValueError) as err:
+            # E.g. the product was deleted
+            raise FullSyncRequired(f"product {product_id}: {err}") from err
+
+    def as_dict(self) -> Dict[str, Any] | None:
+        """Return the journal as of the last sync in JSON-safe form."""
+        if (synced := self._synced) is None:
+            return None
+        cursor, rows = synced
+        return {
+            "cursor": cursor,
+            "rows": [row.model_dump(mode="json") for row in rows.values()],
+        }
+
+    def restore(self, stored: Dict[str, Any]) -> None:
+        """Restore the journal from its JSON-safe form.
+
+        The product data is not journaled, so the stock is still read in
+        full once the regular interval passed.
+        """
+        try:
+            rows = [CurrentStockResponse(**row) for row in stored.get("rows", [])]
+        except (TypeError, ValueError) as err:
+            _LOGGER.debug("Not restoring the stock journal: %s", err)
+            return
+        self.cursor.restore(stored.get("cursor") or {})
+        self._rows = {row.product_id: row for row in rows}
+        self._full_sync_due = time.monotonic() + STOCK_FULL_SYNC_INTERVAL
+        self._synced = (self.cursor.as_dict(), dict(self._rows))
+
+
+class GrocyJournals:
+    """The journals of a Grocy instance, saved and restored together.
+
+    `as_dict` only reads the state of the last completed sync, never the
+    state of a sync waiting for Grocy halfway.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the journals."""
+        self.stock = StockJournal()
+        self.chores = CountingJournal("chores_log", "chore_id")
+        self.batteries = CountingJournal("battery_charge_cycles", "battery_id")
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the journals in JSON-safe form."""
+        return {
+            "stock": self.stock.as_dict(),
+            "chores": self.chores.as_dict(),
+            "batteries": self.batteries.as_dict(),
+        }
+
+    def restore(self, stored: Dict[str, Any]) -> None:
+        """Restore the journals from their JSON-safe form."""
+        for name, journal in (
+            ("stock", self.stock),
+            ("chores", self.chores),
+            ("batteries", self.batteries),
+        ):
+            if stored.get(name):
+                journal.restore(stored[name])
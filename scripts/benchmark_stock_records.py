@@ -0,0 +1,109 @@
+"""Compare the stock records with the pygrocy Product based wrappers.
+
+Builds the stock of a refresh from 1k and 10k CurrentStockResponse rows,
+once with the previous approach (a full pygrocy Product and a freshly
+encoded picture URL per row) and once with StockRecords, and reports the
+time per refresh and the memory held by the result.
+
+Run from the repository root:
+
+    python scripts/benchmark_stock_records.py
+"""
+from __future__ import annotations
+
+import base64
+import gc
+from pathlib import Path
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pygrocy2.data_models.product import Product
+from pygrocy2.grocy_api_client import CurrentStockResponse, ProductData
+
+from custom_components.grocy.helpers import StockRecords
+
+REFRESHES = 5
+
+
+class LegacyProductWrapper:
+    """The stock wrapper as it was before StockRecords."""
+
+    def __init__(self, product: CurrentStockResponse):
+        """Initialize the wrapper like the previous ProductWrapper."""
+        self._product = Product(product)
+        self._picture_url = None
+        if product.product and product.product.picture_file_name:
+            b64name = base64.b64encode(product.product.picture_file_name.encode("ascii"))
+            self._picture_url = f"/api/grocy/productpictures/{str(b64name, 'utf-8')}"
+
+
+def make_rows(count: int) -> list[CurrentStockResponse]:
+    """Return stock rows of count products, a few with pictures."""
+    return [
+        CurrentStockResponse(
+            product_id=product_id,
+            amount=product_id % 7 + 1,
+            best_before_date="2024-01-01",
+            amount_opened=0,
+            amount_aggregated=product_id % 7 + 1,
+            amount_opened_aggregated=0,
+            is_aggregated_amount=False,
+            product=ProductData(
+                id=product_id,
+                name=f"Product {product_id}",
+                qu_id_stock=1,
+                qu_id_purchase=1,
+                row_created_timestamp="2024-01-01 00:00:00",
+                default_best_before_days=0,
+                picture_file_name=f"product_{product_id}.jpg" if product_id % 3 else None,
+            ),
+        )
+        for product_id in range(count)
+    ]
+
+
+def measure(build, count: int) -> tuple[float, int]:
+    """Return the mean seconds per refresh and the bytes held by one result."""
+    # Every refresh fetches new row objects; most of them are unchanged
+    batches = [make_rows(count) for _ in range(REFRESHES + 2)]
+    build(batches[0])
+    start = time.perf_counter()
+    for rows in batches[1:-1]:
+        build(rows)
+    seconds = (time.perf_counter() - start) / REFRESHES
+
+    gc.collect()
+    tracemalloc.start()
+    result = build(batches[-1])
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return seconds, size
+
+
+def main() -> None:
+    """Run the benchmark."""
+    for count in (1_000, 10_000):
+        records = StockRecords()
+        results = (
+            (
+                "pygrocy Product",
+                measure(lambda rows: [LegacyProductWrapper(row) for row in rows], count),
+            ),
+            (
+                "StockRecords (changed)",
+                measure(lambda rows: StockRecords().update(rows), count),
+            ),
+            ("StockRecords (unchanged)", measure(records.update, count)),
+        )
+
+        print(f"{count} products")
+        for name, (seconds, size) in results:
+            print(f"  {name:<26}{seconds * 1000:8.1f} ms/refresh{size / 1024:10.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.grocy.helpers import item_as_dict
+from custom_components.grocy.sensor import SENSORS, GrocySensorEntity
+from custom_components.grocy.services import SERVICE_GET_ITEMS_SCHEMA, async_get_items_service
+from custom_components.grocy.store import CachedItem
+
+
+def _coordinator(items, max_items):
+    coordinator = type("C", (), {})()
+    coordinator.config_entry = MockConfigEntry(domain="grocy", data={}, entry_id="test-entry")
+    coordinator.data = {"stock": items}
+    coordinator.max_attribute_items = max_items
+    coordinator.fields = None
+    coordinator.attribute_fields = lambda key: coordinator.fields
+    return coordinator
+
+
+def test_attributes_list_first_items_and_full_count():
+    items = [CachedItem({"id": i, "name": f"Product {i}"}) for i in range(10)]
+    coordinator = _coordinator(items, 3)
+    description = next(d for d in SENSORS if d.key == "stock")
+    entity = GrocySensorEntity(coordinator, description, coordinator.config_entry)
+
+    attrs = entity.extra_state_attributes
+
+    assert [p["id"] for p in attrs["products"]] == [0, 1, 2]
+    assert attrs["count"] == 10
+    assert entity.extra_state_attributes is attrs
+    assert "products" in entity._Entity__combined_unrecorded_attributes
+    assert "count" not in entity._Entity__combined_unrecorded_attributes
+
+    coordinator.max_attribute_items = 0
+    assert entity.extra_state_attributes == {"products": [], "count": 10}
+
+
+def test_get_items_returns_a_page_of_the_coordinator_data():
+    items = [CachedItem({"id": i}) for i in range(10)]
+    coordinator = _coordinator(items, 3)
+
+    data = SERVICE_GET_ITEMS_SCHEMA({"entity_key": "stock", "offset": 8, "limit": 5})
+    response = async_get_items_service(coordinator, data)
+
+    assert response == {
+        "entity_key": "stock",
+        "total": 10,
+        "offset": 8,
+        "limit": 5,
+        "items": [{"id": 8}, {"id": 9}],
+    }
+
+
+def test_attributes_list_only_the_selected_fields():
+    from pygrocy2.data_models.battery import Battery
+    from pygrocy2.grocy_api_client import CurrentBatteryResponse
+
+    battery = Battery(
+        CurrentBatteryResponse(
+            id=1,
+            last_tracked_time="2024-01-01 10:00:00",
+            next_estimated_charge_time="2024-02-01 10:00:00",
+        )
+    )
+    coordinator = _coordinator([CachedItem({"id": 1, "name": "Milk", "amount": 2})], 10)
+    coordinator.fields = frozenset({"name", "picture_url"})
+    description = next(d for d in SENSORS if d.key == "stock")
+    entity = GrocySensorEntity(coordinator, description, coordinator.config_entry)
+
+    assert entity.extra_state_attributes == {"products": [{"name": "Milk"}], "count": 1}
+    assert item_as_dict(battery, {"id", "missing"}) == {"id": 1}
+    assert item_as_dict(battery, {"next_estimated_charge_time"}) == {
+        "next_estimated_charge_time": battery.next_estimated_charge_time
+    }
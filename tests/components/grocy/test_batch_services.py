@@ -0,0 +1,111 @@
+import asyncio
+from types import SimpleNamespace
+
+from custom_components.grocy.services import (
+    SERVICE_ADD_GENERIC_OBJECTS_SCHEMA,
+    SERVICE_ADD_PRODUCTS_SCHEMA,
+    SERVICE_DATA,
+    async_add_generic_service,
+    async_add_product_service,
+    async_batch_product_service,
+    async_bulk_generic_service,
+)
+
+
+class FakeHass:
+    async def async_add_executor_job(self, target, *args):
+        return target(*args)
+
+
+class FakeGrocy:
+    def __init__(self):
+        self.added = []
+
+    async def add_product(self, product_id, amount, price):
+        if product_id == 2:
+            raise ValueError("unknown product")
+        self.added.append((product_id, amount))
+
+
+def test_batch_reports_each_item_and_continues_after_failure():
+    coordinator = SimpleNamespace(
+        grocy_api=FakeGrocy(),
+        max_concurrent_requests=2,
+        async_apply_local_change=lambda *args: None,
+    )
+    data = SERVICE_ADD_PRODUCTS_SCHEMA(
+        {
+            "products": [
+                {"product_id": "1", "amount": 2},
+                {"product_id": 2, "amount": 1},
+                {"product_id": 3, "amount": 1, "price": "1.99"},
+            ]
+        }
+    )
+
+    response = asyncio.run(
+        async_batch_product_service(
+            FakeHass(), coordinator, data, async_add_product_service
+        )
+    )
+
+    assert response["succeeded"] == 2
+    assert response["failed"] == 1
+    assert [r["product_id"] for r in response["results"]] == [1, 2, 3]
+    assert response["results"][1] == {
+        "product_id": 2,
+        "success": False,
+        "error": "unknown product",
+    }
+    assert sorted(coordinator.grocy_api.added) == [(1, 2.0), (3, 1.0)]
+
+
+class FakeGenericGrocy:
+    def __init__(self):
+        self.created = []
+
+    async def add_generic(self, entity_type, data):
+        if data.get("name") == "broken":
+            raise ValueError("invalid object")
+        self.created.append((entity_type.value, data["name"]))
+        return {"created_object_id": len(self.created)}
+
+
+def _bulk_add(objects, **options):
+    coordinator = SimpleNamespace(
+        grocy_api=FakeGenericGrocy(), max_concurrent_requests=4
+    )
+    data = SERVICE_ADD_GENERIC_OBJECTS_SCHEMA(
+        {"entity_type": "locations", "objects": objects, **options}
+    )
+    response = asyncio.run(
+        async_bulk_generic_service(
+            FakeHass(),
+            coordinator,
+            data,
+            async_add_generic_service,
+            [{SERVICE_DATA: obj} for obj in data["objects"]],
+        )
+    )
+    return coordinator.grocy_api, response
+
+
+def test_bulk_generic_returns_results_with_timing():
+    api, response = _bulk_add([{"name": "Pantry"}, {"name": "broken"}, {"name": "Fridge"}])
+
+    assert (response["succeeded"], response["failed"], response["skipped"]) == (2, 1, 0)
+    assert response["results"][0]["created_object_id"] == 1
+    assert response["results"][1]["error"] == "invalid object"
+    assert all("duration_ms" in result for result in response["results"])
+    assert api.created == [("locations", "Pantry"), ("locations", "Fridge")]
+
+
+def test_bulk_generic_stops_on_first_error():
+    api, response = _bulk_add(
+        [{"name": "broken"}, {"name": "Pantry"}],
+        max_concurrency=1,
+        stop_on_error=True,
+    )
+
+    assert (response["succeeded"], response["failed"], response["skipped"]) == (0, 1, 1)
+    assert api.created == []
@@ -0,0 +1,128 @@
+import asyncio
+
+from pygrocy2.grocy_api_client import CurrentBatteryResponse, CurrentChoreResponse, UserDto
+
+from custom_components.grocy.grocy_api import AsyncGrocy
+from custom_components.grocy.grocy_data import GrocyData
+
+TIMESTAMP = "2024-01-01 00:00:00"
+
+
+class FakeHass:
+    def async_add_executor_job(self, target, *args):
+        return asyncio.get_running_loop().run_in_executor(None, target, *args)
+
+
+class FakeApiClient:
+    def __init__(self, count):
+        self.count = count
+        self.requests = []
+
+    async def get_chores(self, query_filters=None):
+        self.requests.append("chores")
+        return [
+            CurrentChoreResponse(
+                chore_id=chore_id,
+                last_tracked_time="2024-01-02 08:00:00",
+                next_estimated_execution_time="2024-01-03 08:00:00",
+            )
+            for chore_id in range(1, self.count + 1)
+        ]
+
+    async def get_batteries(self, query_filters=None):
+        self.requests.append("batteries")
+        return [
+            CurrentBatteryResponse(id=battery_id, last_tracked_time="2024-01-02 08:00:00")
+            for battery_id in range(1, self.count + 1)
+        ]
+
+    async def get_users(self):
+        self.requests.append("users")
+        return [UserDto(id=1, username="alice"), UserDto(id=2, username="bob")]
+
+    async def get_generic_objects_for_type(self, entity_type, query_filters=None):
+        self.requests.append(f"objects/{entity_type}")
+        ids = range(1, self.count + 1)
+        return {
+            "chores": [
+                {
+                    "id": chore_id,
+                    "name": f"Chore {chore_id}",
+                    "period_type": "daily",
+                    "period_days": "",
+                    "track_date_only": "0",
+                    "rollover": "0",
+                    "next_execution_assigned_to_user_id": "2",
+                    "row_created_timestamp": TIMESTAMP,
+                }
+                for chore_id in ids
+            ],
+            "chores_log": [
+                {"id": 1, "chore_id": 1, "tracked_time": "2024-01-02 08:00:00", "done_by_user_id": 1},
+                {"id": 2, "chore_id": 1, "tracked_time": "2024-01-01 08:00:00", "done_by_user_id": 2},
+            ],
+            "batteries": [
+                {
+                    "id": battery_id,
+                    "name": f"Battery {battery_id}",
+                    "charge_interval_days": 30,
+                    "row_created_timestamp": TIMESTAMP,
+                }
+                for battery_id in ids
+            ],
+            "battery_charge_cycles": [{"id": 1, "battery_id": 2}, {"id": 2, "battery_id": 2}],
+        }[entity_type]
+
+    async def get_chore(self, chore_id):
+        raise AssertionError("chore details must not be requested per chore")
+
+    async def get_battery(self, battery_id):
+        raise AssertionError("battery details must not be requested per battery")
+
+
+def _grocy_data(count):
+    async def get_last_db_changed():
+        return None
+
+    api = AsyncGrocy.__new__(AsyncGrocy)
+    api._api_client = FakeApiClient(count)
+    api.get_last_db_changed = get_last_db_changed
+    return GrocyData(FakeHass(), api)
+
+
+def test_chores_are_hydrated_from_a_constant_number_of_requests():
+    grocy_data = _grocy_data(50)
+
+    chores = asyncio.run(grocy_data.async_update_chores())
+
+    assert sorted(grocy_data.api._api_client.requests) == [
+        "chores",
+        "objects/chores",
+        "objects/chores_log",
+        "users",
+    ]
+    assert len(chores) == 50
+    first = chores[0].as_dict()
+    assert first["name"] == "Chore 1"
+    assert first["track_count"] == 2
+    assert first["last_done_by"]["username"] == "alice"
+    assert first["next_execution_assigned_user"]["username"] == "bob"
+    assert first["period_type"] == "daily"
+    assert chores[1].track_count == 0
+    assert chores[1].last_done_by is None
+
+
+def test_batteries_are_hydrated_from_a_constant_number_of_requests():
+    grocy_data = _grocy_data(50)
+
+    batteries = asyncio.run(grocy_data.async_update_batteries())
+
+    assert sorted(grocy_data.api._api_client.requests) == [
+        "batteries",
+        "objects/batteries",
+        "objects/battery_charge_cycles",
+    ]
+    assert [battery.charge_cycles_count for battery in batteries[:3]] == [0, 2, 0]
+    assert batteries[0].name == "Battery 1"
+    assert batteries[0].charge_interval_days == 30
+    assert batteries[0].last_charged == batteries[0].last_tracked_time
@@ -26,3 +26,21 @@ def test_button_attributes_from_chore_dict():
     assert isinstance(attrs, dict)
     assert attrs.get("chore_id") == 42
     assert attrs.get("chore_name") == "Take out trash"
+
+
+def test_button_attributes_index_is_rebuilt_per_chores_list():
+    mock_entry = MockConfigEntry(domain="grocy", data={}, entry_id="test-entry")
+
+    coordinator = type("C", (), {})()
+    coordinator.config_entry = mock_entry
+    coordinator.data = {"chores": [{"chore_id": 1, "chore_name": "Dishes"}]}
+    coordinator.entities = []
+
+    desc = DummyEntityDesc(key="chore_button_1", name="Dishes")
+    entity = GrocyButtonEntity(coordinator, desc, coordinator.config_entry, 1)
+
+    first = entity.extra_state_attributes
+    assert entity.extra_state_attributes is first
+
+    coordinator.data = {"chores": [{"chore_id": 1, "chore_name": "Wash up"}]}
+    assert entity.extra_state_attributes["chore_name"] == "Wash up"
@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.grocy.button import ChoreButtonReconciler
+
+
+def _setup(chores):
+    entry = MockConfigEntry(domain="grocy", data={}, entry_id="test-entry")
+    coordinator = type("C", (), {})()
+    coordinator.config_entry = entry
+    coordinator.available_entities = ["chores"]
+    coordinator.data = {"chores": chores}
+    coordinator.entities = []
+    added = []
+    reconciler = ChoreButtonReconciler(coordinator, entry, added.append)
+    reconciler.async_add_initial(chores)
+    return coordinator, reconciler, added
+
+
+def test_unchanged_chore_ids_do_not_touch_entities():
+    coordinator, reconciler, added = _setup([{"chore_id": 1, "chore_name": "Dishes"}])
+
+    coordinator.data = {"chores": [{"chore_id": 1, "chore_name": "Dishes", "x": 1}]}
+    reconciler.async_reconcile()
+
+    assert len(added) == 1
+    assert list(reconciler.index) == [1]
+
+
+def test_new_chores_are_added_and_removed_ones_retired():
+    coordinator, reconciler, added = _setup(
+        [{"chore_id": 1, "chore_name": "Dishes"}, {"chore_id": 2, "chore_name": "Trash"}]
+    )
+    removed = reconciler.index[2]
+    removed.entity_id = "button.trash"
+    reconciler._registry_entries = lambda: {
+        "button.trash": SimpleNamespace(
+            unique_id="test-entry_chore_button_2", disabled_by=None, name=None
+        )
+    }
+
+    coordinator.data = {
+        "chores": [{"chore_id": 1, "chore_name": "Dishes"}, {"chore_id": 3, "chore_name": "Plants"}]
+    }
+    reconciler.async_reconcile()
+
+    assert [e.entity_description.key for e in added[1]] == ["chore_button_3"]
+    assert removed._attr_available is False
+    assert sorted(reconciler.index) == [1, 2, 3]
+
+    coordinator.data = {"chores": [{"chore_id": 2, "chore_name": "Trash"}]}
+    reconciler._registry_entries = lambda: {}
+    reconciler.async_reconcile()
+
+    assert removed._attr_available is True
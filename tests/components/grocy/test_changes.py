@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from custom_components.grocy.changes import ChangeTracker, item_fingerprint
+
+
+def test_unchanged_content_keeps_published_object():
+    tracker = ChangeTracker()
+    stock = [{"id": 1, "amount": 2}]
+
+    data, changed = tracker.merge({"stock": stock})
+    assert changed == {"stock"}
+
+    refetched = [{"id": 1, "amount": 2}]
+    data, changed = tracker.merge({"stock": refetched})
+
+    assert changed == set()
+    assert data["stock"] is stock
+
+
+def test_chore_changes_notify_only_affected_buttons():
+    tracker = ChangeTracker()
+    tracker.merge(
+        {"chores": [{"id": 1, "name": "Dishes"}, {"id": 2, "name": "Trash"}], "tasks": []}
+    )
+
+    _, changed = tracker.merge(
+        {
+            "chores": [{"id": 1, "name": "Dishes"}, {"id": 2, "name": "Trash out"}, {"id": 3}],
+            "tasks": [],
+        }
+    )
+
+    assert changed == {"chores", "chore_button_2", "chore_button_3"}
+    assert tracker.contexts_for_keys(["chores"]) == {
+        "chores",
+        "chore_button_1",
+        "chore_button_2",
+        "chore_button_3",
+    }
+
+
+class Item:
+    def __init__(self, item_id, due):
+        self._id = item_id
+        self._due = due
+        self._tags = ["a", "b"]
+
+
+class SlottedItem:
+    __slots__ = ("_amount", "_item")
+
+    def __init__(self, item, amount):
+        self._item = item
+        self._amount = amount
+
+
+def test_objects_are_compared_by_their_attributes():
+    due = datetime(2024, 1, 1, 8, 0)
+    assert item_fingerprint(SlottedItem(Item(1, due), 2)) == item_fingerprint(
+        SlottedItem(Item(1, due), 2)
+    )
+    assert item_fingerprint(SlottedItem(Item(1, due), 2)) != item_fingerprint(
+        SlottedItem(Item(1, due), 3)
+    )
+    assert item_fingerprint(Item(1, due)) != item_fingerprint(
+        Item(1, due + timedelta(days=1))
+    )
+
+
+def test_items_reused_from_the_previous_list_are_not_fingerprinted_again():
+    tracker = ChangeTracker()
+    unchanged = Item(1, None)
+    tracker.merge({"stock": [unchanged, Item(2, None)]})
+
+    with patch(
+        "custom_components.grocy.changes.item_fingerprint", wraps=item_fingerprint
+    ) as fingerprint:
+        _, changed = tracker.merge({"stock": [unchanged, Item(3, None)]})
+
+    fingerprint.assert_called_once()
+    assert changed == {"stock"}
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.grocy.const import DOMAIN, UPDATE_DOMAINS
+from custom_components.grocy.coordinator import GrocyDataUpdateCoordinator
+
+
+class FakeGrocyData:
+    """Grocy data failing for the keys of unreachable domains."""
+
+    def __init__(self, unreachable=()):
+        self.unreachable = set(unreachable)
+        self.fetched = []
+        self.db_changed = None
+
+    async def async_get_last_db_changed(self):
+        return self.db_changed
+
+    async def async_update_many(
+        self, keys, max_concurrent, cached_sources=False, db_changed=None
+    ):
+        if self.unreachable.intersection(keys):
+            raise ConnectionError("Grocy is not reachable")
+        self.fetched.extend(keys)
+        return {key: [f"{key} {len(self.fetched)}"] for key in keys}
+
+
+def _coordinator(hass, grocy_data, keys, options=None):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"url": "http://grocy", "api_key": "key", "port": 9192, "verify_ssl": False},
+        options=options or {},
+    )
+    coordinator = GrocyDataUpdateCoordinator(hass, entry)
+    coordinator.grocy_data = grocy_data
+    coordinator.warm_up_keys = set(keys)
+    return coordinator
+
+
+def _listen(coordinator, *contexts):
+    """Record the contexts of the listeners notified by the coordinator."""
+    notified = []
+    for context in contexts:
+        coordinator.async_add_listener(
+            lambda context=context: notified.append(context), context
+        )
+    return notified
+
+
+async def test_failing_domain_only_fails_its_own_keys(hass):
+    grocy_data = FakeGrocyData(unreachable=["chores"])
+    coordinator = _coordinator(hass, grocy_data, ["stock", "chores"])
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.key_update_success("stock")
+    assert not coordinator.key_update_success("chores")
+    assert coordinator.data == {"stock": ["stock 1"]}
+    await coordinator.async_shutdown()
+
+
+async def test_domains_poll_on_their_own_interval_and_notify_their_keys(hass):
+    grocy_data = FakeGrocyData(unreachable=["chores"])
+    coordinator = _coordinator(
+        hass,
+        grocy_data,
+        ["stock", "chores"],
+        options={"stock_update_interval": 600, "chores_update_interval": 30},
+    )
+    await coordinator.async_refresh()
+    notified = _listen(coordinator, "stock", "chores")
+
+    grocy_data.unreachable.clear()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+    await hass.async_block_till_done()
+
+    # Only the chores were polled again; their entities are updated and
+    # become available, the stock entities are left alone.
+    assert grocy_data.fetched == ["stock", "chores"]
+    assert coordinator.key_update_success("chores")
+    assert coordinator.data == {"stock": ["stock 1"], "chores": ["chores 2"]}
+    assert notified == ["chores"]
+    await coordinator.async_shutdown()
+
+
+async def test_polling_continues_after_failed_first_refresh(hass):
+    keys = [key for keys in UPDATE_DOMAINS.values() for key in keys]
+    grocy_data = FakeGrocyData(unreachable=keys)
+    coordinator = _coordinator(hass, grocy_data, keys)
+    coordinator.async_subscribe_domains()
+
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    notified = _listen(coordinator, "stock")
+
+    grocy_data.unreachable.clear()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=10))
+    await hass.async_block_till_done()
+
+    assert coordinator.last_update_success
+    assert coordinator.data["stock"]
+    assert "stock" in notified
+    await coordinator.async_shutdown()
+
+
+async def test_unchanged_database_only_refreshes_time_dependent_keys(hass):
+    grocy_data = FakeGrocyData()
+    grocy_data.db_changed = datetime(2024, 1, 1, 8, 0)
+    coordinator = _coordinator(hass, grocy_data, ["chores", "overdue_chores"])
+
+    await coordinator.async_refresh()
+    grocy_data.fetched.clear()
+    await coordinator.async_refresh()
+
+    assert grocy_data.fetched == ["overdue_chores"]
+    assert coordinator.data["chores"] == ["chores 2"]
+    await coordinator.async_shutdown()
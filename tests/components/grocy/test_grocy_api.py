@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+from pygrocy2.errors import GrocyError
+import pytest
+
+from custom_components.grocy.grocy_api import AsyncGrocy
+
+TIMESTAMP = "2024-01-01 00:00:00"
+
+
+class FakeResponse:
+    def __init__(self, status, body):
+        self.status = status
+        self._body = json.dumps(body).encode() if body is not None else b""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def read(self):
+        return self._body
+
+
+class FakeSession:
+    """aiohttp session answering from a table of (method, url) responses."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def request(self, method, url, headers=None, params=None, json=None):
+        self.requests.append((method, url, headers, params, json))
+        return FakeResponse(*self.responses[(method, url)])
+
+
+def test_reads_return_pygrocy_models_and_send_query_filters():
+    session = FakeSession(
+        {
+            ("GET", "http://grocy:9192/api/tasks"): (
+                200,
+                [{"id": 1, "name": "Dishes", "done": 0, "row_created_timestamp": TIMESTAMP}],
+            )
+        }
+    )
+    grocy = AsyncGrocy(session, "http://grocy", "key", port=9192)
+
+    tasks = asyncio.run(grocy.tasks(query_filters=["done=0"]))
+
+    assert [task.name for task in tasks] == ["Dishes"]
+    _, _, headers, params, _ = session.requests[0]
+    assert headers["GROCY-API-KEY"] == "key"
+    assert params == [("query[]", "done=0")]
+
+
+def test_journal_reads_return_the_newest_id_and_the_stock_of_a_product():
+    product = {
+        "id": 2,
+        "name": "Oat milk",
+        "location_id": 1,
+        "qu_id_purchase": 1,
+        "qu_id_stock": 1,
+        "min_stock_amount": 0,
+        "default_best_before_days": 0,
+        "parent_product_id": "1",
+        "row_created_timestamp": TIMESTAMP,
+    }
+    session = FakeSession(
+        {
+            ("GET", "http://grocy:9192/api/objects/stock_log"): (200, [{"id": 42}]),
+            ("GET", "http://grocy:9192/api/stock/products/2"): (
+                200,
+                {
+                    "product": product,
+                    "stock_amount": "3",
+                    "stock_amount_opened": "1",
+                    "next_due_date": "2024-02-01",
+                    "is_aggregated_amount": "0",
+                },
+            ),
+        }
+    )
+    grocy = AsyncGrocy(session, "http://grocy", "key", port=9192)
+
+    assert asyncio.run(grocy.get_last_object_id("stock_log")) == 42
+    assert session.requests[0][3] == [("order", "id:desc"), ("limit", "1")]
+
+    stock = asyncio.run(grocy.get_product_stock(2))
+    assert stock.parent_product_id == 1
+    assert (stock.row.product_id, stock.row.amount, stock.row.amount_opened) == (2, 3, 1)
+    assert stock.row.amount_aggregated == 3
+
+
+def test_writes_send_json_and_raise_grocy_errors():
+    session = FakeSession(
+        {
+            ("POST", "http://grocy:9192/sub/api/stock/products/1/consume"): (204, None),
+            ("POST", "http://grocy:9192/sub/api/stock/products/2/consume"): (
+                400,
+                {"error_message": "Product does not exist"},
+            ),
+        }
+    )
+    grocy = AsyncGrocy(session, "http://grocy", "key", port=9192, path="sub")
+
+    asyncio.run(grocy.consume_product(1, 2, spoiled=True))
+    with pytest.raises(GrocyError) as err:
+        asyncio.run(grocy.consume_product(2))
+
+    assert err.value.status_code == 400
+    assert err.value.message == "Product does not exist"
+    assert session.requests[0][4] == {
+        "amount": 2,
+        "spoiled": True,
+        "transaction_type": "consume",
+        "allow_subproduct_substitution": False,
+    }
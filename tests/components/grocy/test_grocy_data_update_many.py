@@ -0,0 +1,262 @@
+import asyncio
+from datetime import datetime
+
+from custom_components.grocy.grocy_api import AsyncGrocy
+from custom_components.grocy.grocy_data import GrocyData
+
+
+def test_update_many_fetches_each_key_once_and_skips_unknown():
+    grocy_data = GrocyData(None, None)
+    calls = []
+
+    def make_method(key):
+        async def method(db_changed=None):
+            calls.append((key, db_changed))
+            return [key]
+
+        return method
+
+    grocy_data.entity_update_method = {
+        "stock": make_method("stock"),
+        "chores": make_method("chores"),
+    }
+
+    db_changed = datetime(2024, 1, 1, 10)
+    result = asyncio.run(
+        grocy_data.async_update_many(
+            ["stock", "chores", "stock", "chore_button_1"], db_changed=db_changed
+        )
+    )
+
+    assert result == {"stock": ["stock"], "chores": ["chores"]}
+    assert sorted(calls) == [("chores", db_changed), ("stock", db_changed)]
+
+
+def test_update_many_respects_concurrency_limit():
+    grocy_data = GrocyData(None, None)
+    running = 0
+    peak = 0
+
+    async def method(db_changed=None):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return []
+
+    grocy_data.entity_update_method = {f"key_{i}": method for i in range(6)}
+
+    result = asyncio.run(
+        grocy_data.async_update_many(grocy_data.entity_update_method, max_concurrency=2)
+    )
+
+    assert len(result) == 6
+    assert peak == 2
+
+
+class FakeHass:
+    def async_add_executor_job(self, target, *args):
+        return asyncio.get_running_loop().run_in_executor(None, target, *args)
+
+
+def _product_data(product_id):
+    from pygrocy2.grocy_api_client import ProductData
+
+    return ProductData(
+        id=product_id,
+        name=f"Product {product_id}",
+        qu_id_stock=1,
+        qu_id_purchase=1,
+        row_created_timestamp="2024-01-01 00:00:00",
+        default_best_before_days=0,
+    )
+
+
+class FakeApiClient:
+    """Grocy api client serving a small catalog of three products."""
+
+    def __init__(self):
+        from pygrocy2.grocy_api_client import CurrentStockResponse
+
+        self.requests = []
+        self.last_ids = {}
+        self.stock = [
+            CurrentStockResponse(
+                product_id=1,
+                amount=3,
+                best_before_date="2024-01-01",
+                amount_opened=1,
+                amount_aggregated=3,
+                amount_opened_aggregated=1,
+                is_aggregated_amount=False,
+                product=_product_data(1),
+            )
+        ]
+
+    async def get_generic_objects_for_type(self, entity_type, query_filters=None):
+        self.requests.append(entity_type)
+        return {
+            "products": [
+                {
+                    "id": product_id,
+                    "name": f"Product {product_id}",
+                    "location_id": "1",
+                    "product_group_id": "",
+                    "qu_id_stock": 1,
+                    "qu_id_purchase": 1,
+                    "row_created_timestamp": "2024-01-01 00:00:00",
+                    "default_best_before_days": 0,
+                }
+                for product_id in (1, 2, 3)
+            ],
+            "quantity_units": [
+                {"id": 1, "name": "Piece", "row_created_timestamp": "2024-01-01 00:00:00"}
+            ],
+            "locations": [
+                {"id": 1, "name": "Fridge", "row_created_timestamp": "2024-01-01 00:00:00"}
+            ],
+            "product_barcodes": [{"id": 1, "product_id": 2, "barcode": "4001", "amount": ""}],
+            "stock_log": [],
+        }[entity_type]
+
+    async def get_last_object_id(self, entity_type):
+        self.requests.append(f"{entity_type}?order=id:desc")
+        return self.last_ids.get(entity_type)
+
+    async def get_stock(self):
+        self.requests.append("stock")
+        return self.stock
+
+    async def get_product(self, product_id):
+        self.requests.append(f"stock/products/{product_id}")
+        return None
+
+
+def _db_changed(value):
+    async def get_last_db_changed():
+        return value
+
+    return get_last_db_changed
+
+
+def _grocy_data(api_client, db_changed=datetime(2024, 1, 1, 10)):
+    api = AsyncGrocy.__new__(AsyncGrocy)
+    api._api_client = api_client
+    api.get_last_db_changed = _db_changed(db_changed)
+    return GrocyData(FakeHass(), api)
+
+
+def test_volatile_stock_is_fetched_once_and_joined_with_master_data():
+    from pygrocy2.grocy_api_client import (
+        CurrentStockResponse,
+        CurrentVolatilStockResponse,
+        MissingProductResponse,
+    )
+
+    def stock_row(product_id):
+        return CurrentStockResponse(
+            product_id=product_id,
+            amount=1,
+            best_before_date="2024-01-01",
+            amount_opened=0,
+            amount_aggregated=1,
+            amount_opened_aggregated=0,
+            is_aggregated_amount=False,
+            product=_product_data(product_id),
+        )
+
+    api_client = FakeApiClient()
+
+    async def get_volatile_stock():
+        api_client.requests.append("stock/volatile")
+        return CurrentVolatilStockResponse(
+            due_products=[stock_row(1)],
+            overdue_products=[stock_row(2)],
+            expired_products=[stock_row(2)],
+            missing_products=[
+                MissingProductResponse(
+                    id=1, name="Product 1", amount_missing=2, is_partly_in_stock=True
+                )
+            ],
+        )
+
+    api_client.get_volatile_stock = get_volatile_stock
+    grocy_data = _grocy_data(api_client)
+
+    async def get_last_db_changed():
+        raise AssertionError("the db-changed-time of the caller must be used")
+
+    grocy_data.api.get_last_db_changed = get_last_db_changed
+    result = asyncio.run(
+        grocy_data.async_update_many(
+            ["expiring_products", "expired_products", "overdue_products", "missing_products"],
+            db_changed=datetime(2024, 1, 1, 10),
+        )
+    )
+
+    assert sorted(api_client.requests) == sorted(
+        [
+            "products",
+            "quantity_units",
+            "locations",
+            "product_barcodes",
+            "stock_log?order=id:desc",
+            "stock",
+            "stock/volatile",
+        ]
+    )
+    assert [p.id for p in result["expiring_products"]] == [1]
+    assert [p.id for p in result["expired_products"]] == [2]
+    assert [p.id for p in result["overdue_products"]] == [2]
+    assert [p.amount_missing for p in result["missing_products"]] == [2]
+    assert result["missing_products"][0].available_amount == 3
+    assert result["overdue_products"][0].barcodes == ["4001"]
+
+
+def test_shopping_list_products_come_from_master_data_until_their_tables_change():
+    from pygrocy2.grocy_api_client import ShoppingListItem
+
+    api_client = FakeApiClient()
+    product_ids = [1, 3, 1]
+
+    async def get_shopping_list(query_filters=None):
+        return [
+            ShoppingListItem(
+                id=item_id,
+                product_id=product_id,
+                amount=1,
+                row_created_timestamp="2024-01-01 00:00:00",
+                shopping_list_id=1,
+                done=0,
+            )
+            for item_id, product_id in enumerate(product_ids, 1)
+        ]
+
+    api_client.get_shopping_list = get_shopping_list
+    grocy_data = _grocy_data(api_client)
+
+    shopping_list = asyncio.run(grocy_data.async_update_shopping_list())
+    grocy_data.api.get_last_db_changed = _db_changed(datetime(2024, 1, 1, 11))
+    asyncio.run(grocy_data.async_update_shopping_list())
+
+    assert [item.product.name for item in shopping_list] == ["Product 1", "Product 3", "Product 1"]
+    assert shopping_list[0].product.available_amount == 3
+    assert shopping_list[1].product.available_amount == 0
+    assert shopping_list[0].product.default_quantity_unit_purchase.name == "Piece"
+    # Other changes in Grocy leave the master data and the stock alone
+    assert api_client.requests.count("products") == 1
+    assert api_client.requests.count("stock") == 1
+    assert not [r for r in api_client.requests if r.startswith("stock/products")]
+
+    # A product the cache lacks reloads the products only
+    product_ids.append(4)
+    asyncio.run(grocy_data.async_update_shopping_list())
+    assert api_client.requests.count("products") == 2
+    assert api_client.requests.count("quantity_units") == 1
+
+    # So does a service writing to the products
+    grocy_data.invalidate_objects("products")
+    asyncio.run(grocy_data.async_update_shopping_list())
+    assert api_client.requests.count("products") == 3
+    assert api_client.requests.count("locations") == 1
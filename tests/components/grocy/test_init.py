@@ -0,0 +1,108 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.grocy import async_setup_entry
+from custom_components.grocy.const import DOMAIN, UPDATE_DOMAINS
+
+FEATURES = [
+    "FEATURE_FLAG_STOCK",
+    "FEATURE_FLAG_SHOPPINGLIST",
+    "FEATURE_FLAG_TASKS",
+    "FEATURE_FLAG_CHORES",
+    "FEATURE_FLAG_RECIPES",
+    "FEATURE_FLAG_BATTERIES",
+]
+KEYS = [key for keys in UPDATE_DOMAINS.values() for key in keys]
+
+
+class FakeGrocyData:
+    """Grocy data answering only while Grocy is reachable."""
+
+    reachable = False
+    config_requests = 0
+
+    def __init__(self, hass, api, meal_plan_days=None):
+        self.journals = SimpleNamespace(restore=lambda data: None, as_dict=lambda: {})
+
+    def _check_reachable(self):
+        if not FakeGrocyData.reachable:
+            raise ConnectionError("Grocy is not reachable")
+
+    async def async_get_config(self):
+        FakeGrocyData.config_requests += 1
+        self._check_reachable()
+        return SimpleNamespace(enabled_features=FEATURES)
+
+    async def async_get_last_db_changed(self):
+        self._check_reachable()
+        return None
+
+    async def async_update_many(
+        self, keys, max_concurrent, cached_sources=False, db_changed=None
+    ):
+        self._check_reachable()
+        return {key: [f"{key} from Grocy"] for key in keys}
+
+
+async def _async_wait_for_background_tasks(hass, entry):
+    """Wait for the entry's background tasks, including the ones they start."""
+    await hass.async_block_till_done()
+    while entry._background_tasks:  # noqa: SLF001
+        await asyncio.gather(*entry._background_tasks)  # noqa: SLF001
+        await hass.async_block_till_done()
+
+
+async def test_setup_from_cache_keeps_polling_while_grocy_is_unreachable(hass):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"url": "http://grocy", "api_key": "key", "port": 9192, "verify_ssl": False},
+    )
+    entry.add_to_hass(hass)
+    registry = er.async_get(hass)
+    for key in KEYS:
+        registry.async_get_or_create(
+            "sensor", DOMAIN, f"{entry.entry_id}{key}", config_entry=entry
+        )
+    FakeGrocyData.reachable = False
+    FakeGrocyData.config_requests = 0
+
+    with patch(
+        "custom_components.grocy.coordinator.GrocyData", FakeGrocyData
+    ), patch(
+        "custom_components.grocy.GrocyDataStore.async_load",
+        return_value=(KEYS, {key: [] for key in KEYS}),
+    ), patch(
+        "custom_components.grocy.GrocyJournalStore.async_load", return_value=None
+    ), patch.object(
+        hass.config_entries, "async_forward_entry_setups"
+    ), patch(
+        "custom_components.grocy.async_setup_services"
+    ), patch(
+        "custom_components.grocy.async_setup_endpoint_for_image_proxy"
+    ):
+        assert await async_setup_entry(hass, entry)
+        await _async_wait_for_background_tasks(hass, entry)
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        assert not coordinator.last_update_success
+        assert coordinator.data["chores"] == []
+        assert FakeGrocyData.config_requests == 1
+
+        FakeGrocyData.reachable = True
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=1))
+        await _async_wait_for_background_tasks(hass, entry)
+
+    assert coordinator.last_update_success
+    assert coordinator.data["chores"] == ["chores from Grocy"]
+    # The enabled features are checked again once Grocy answered
+    assert FakeGrocyData.config_requests == 2
+    await coordinator.async_shutdown()
@@ -0,0 +1,33 @@
+import datetime
+from enum import Enum
+import json
+
+from custom_components.grocy.json_encoder import CustomJSONEncoder, to_json_safe
+
+
+class Period(str, Enum):
+    DAILY = "daily"
+
+
+class Model:
+    def __init__(self, value):
+        self.value = value
+
+    def as_dict(self):
+        return {"value": self.value, "period": Period.DAILY}
+
+
+def test_matches_json_round_trip():
+    data = {
+        "products": [Model(1), Model(datetime.date(2024, 1, 2))],
+        "count": 2,
+        1: (datetime.datetime(2024, 1, 2, 3, 4), datetime.time(5, 6)),
+        "tags": {"a"},
+        "delta": datetime.timedelta(minutes=1),
+        "ratio": 0.5,
+        None: True,
+    }
+
+    expected = json.loads(json.dumps(data, cls=CustomJSONEncoder))
+
+    assert to_json_safe(data) == expected
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from pygrocy2.data_models.meal_items import MealPlanItem
+from pygrocy2.grocy_api_client import MealPlanResponse
+
+from custom_components.grocy.grocy_api import AsyncGrocy
+from custom_components.grocy.grocy_data import GrocyData
+from custom_components.grocy.helpers import MealPlanItemWrapper, MealPlanOrder
+
+TIMESTAMP = "2024-01-01 00:00:00"
+
+
+class FakeHass:
+    def async_add_executor_job(self, target, *args):
+        return asyncio.get_running_loop().run_in_executor(None, target, *args)
+
+
+def _meal(meal_id, day, recipe_id=None, section_id=None):
+    return MealPlanResponse(
+        id=meal_id,
+        day=day,
+        type="recipe" if recipe_id else "note",
+        recipe_id=recipe_id,
+        section_id=section_id,
+        row_created_timestamp=TIMESTAMP,
+    )
+
+
+def _wrapped(*meals):
+    return [MealPlanItemWrapper(MealPlanItem(meal)) for meal in meals]
+
+
+def test_meal_plan_order_only_places_new_and_moved_items():
+    order = MealPlanOrder()
+    first = order.update(
+        _wrapped(_meal(1, "2024-01-03"), _meal(2, "2024-01-01"), _meal(3, "2024-01-02"))
+    )
+    assert [item.meal_plan.id for item in first] == [2, 3, 1]
+
+    second = order.update(
+        _wrapped(
+            _meal(1, "2024-01-03"),
+            _meal(3, "2024-01-04"),
+            _meal(4, "2024-01-02"),
+            _meal(5, "2024-01-01"),
+        )
+    )
+    assert [item.meal_plan.id for item in second] == [5, 4, 1, 3]
+
+
+class FakeApiClient:
+    """Grocy api client serving a meal plan of today."""
+
+    def __init__(self):
+        self.requests = []
+        self.filters = None
+
+    async def get_meal_plan(self, query_filters=None):
+        self.filters = query_filters
+        return [
+            _meal(1, datetime.now().date(), recipe_id=7, section_id=2),
+            _meal(2, datetime.now().date(), section_id=2),
+        ]
+
+    async def get_generic_objects_for_type(self, entity_type, query_filters=None):
+        self.requests.append(entity_type)
+        return {
+            "recipes": [
+                {
+                    "id": 7,
+                    "name": "Pancakes",
+                    "base_servings": 2,
+                    "desired_servings": 2,
+                    "picture_file_name": "pancakes.jpg",
+                    "row_created_timestamp": TIMESTAMP,
+                }
+            ],
+            "meal_plan_sections": [
+                {"id": 2, "name": "Breakfast", "sort_number": 1, "row_created_timestamp": TIMESTAMP}
+            ],
+        }[entity_type]
+
+    async def get_recipe(self, recipe_id):
+        raise AssertionError("recipes must come from the cache")
+
+
+def _grocy_data(meal_plan_days):
+    async def get_last_db_changed():
+        return TIMESTAMP
+
+    api_client = FakeApiClient()
+    api = AsyncGrocy.__new__(AsyncGrocy)
+    api._api_client = api_client
+    api.get_last_db_changed = get_last_db_changed
+    return GrocyData(FakeHass(), api, meal_plan_days=meal_plan_days), api_client
+
+
+def test_meal_plan_uses_window_and_cached_recipes():
+    grocy_data, api_client = _grocy_data(meal_plan_days=7)
+
+    plan = asyncio.run(grocy_data.async_update_meal_plan())
+    asyncio.run(grocy_data.async_update_meal_plan())
+
+    today = datetime.now().date()
+    assert api_client.filters == [
+        f"day>{today - timedelta(days=1)}",
+        f"day<{today + timedelta(days=7)}",
+    ]
+    assert api_client.requests == ["recipes", "meal_plan_sections"]
+    assert plan[0].meal_plan.recipe.name == "Pancakes"
+    assert plan[0].meal_plan.section.name == "Breakfast"
+    assert plan[0].picture_url == "/api/grocy/recipepictures/cGFuY2FrZXMuanBn"
+
+
+def test_meal_plan_window_is_queried_with_strict_comparisons(freezer):
+    freezer.move_to("2024-02-28 23:30:00")
+
+    grocy_data, api_client = _grocy_data(meal_plan_days=3)
+    asyncio.run(grocy_data.async_update_meal_plan())
+    # Today and the two following days, 2024 being a leap year
+    assert api_client.filters == ["day>2024-02-27", "day<2024-03-02"]
+
+    grocy_data, api_client = _grocy_data(meal_plan_days=0)
+    asyncio.run(grocy_data.async_update_meal_plan())
+    assert api_client.filters == ["day>2024-02-27"]
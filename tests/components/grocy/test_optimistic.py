@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from pygrocy2.grocy_api_client import CurrentStockResponse
+
+from custom_components.grocy.helpers import ProductWrapper, item_as_dict
+from custom_components.grocy.optimistic import (
+    apply_battery_charged,
+    apply_chore_executed,
+    apply_stock_change,
+    apply_task_completed,
+    next_chore_execution,
+)
+from custom_components.grocy.store import CachedItem
+
+NOW = datetime(2024, 5, 10, 12, 0, 0)
+
+
+class FakeChore:
+    def __init__(self, chore_id, period_type, next_time, period_days=None):
+        self.id = chore_id
+        self.period_type = period_type
+        self.period_days = period_days
+        self._next_estimated_execution_time = next_time
+        self._last_tracked_time = None
+        self._track_count = 3
+
+    @property
+    def next_estimated_execution_time(self):
+        return self._next_estimated_execution_time
+
+    @property
+    def last_tracked_time(self):
+        return self._last_tracked_time
+
+    @property
+    def track_count(self):
+        return self._track_count
+
+    def as_dict(self):
+        return {
+            "id": self.id,
+            "next_estimated_execution_time": self.next_estimated_execution_time,
+            "last_tracked_time": self.last_tracked_time,
+            "track_count": self.track_count,
+        }
+
+
+def test_chore_execution_advances_schedule_without_mutating_input():
+    chores = [
+        FakeChore(1, "dynamic-regular", NOW - timedelta(days=1), period_days=3),
+        FakeChore(2, "weekly", NOW - timedelta(days=1)),
+    ]
+
+    first = apply_chore_executed(chores, 1, NOW)
+    second = apply_chore_executed(chores, 2, NOW)
+
+    assert first[0].next_estimated_execution_time == NOW + timedelta(days=3)
+    assert first[0].track_count == 4
+    assert item_as_dict(first[0], {"track_count", "last_tracked_time"}) == {
+        "track_count": 4,
+        "last_tracked_time": NOW,
+    }
+    # A second execution before the next fetch builds on the first
+    (again,) = [
+        chore for chore in apply_chore_executed(first, 1, NOW + timedelta(days=3))
+        if chore.id == 1
+    ]
+    assert again.as_dict()["track_count"] == 5
+    assert again.next_estimated_execution_time == NOW + timedelta(days=6)
+    # The weekdays of weekly chores are not known: keep the estimate
+    assert second[1].next_estimated_execution_time == NOW - timedelta(days=1)
+    assert chores[0].next_estimated_execution_time == NOW - timedelta(days=1)
+    assert first[1] is chores[1]
+
+
+def test_fixed_schedules_step_by_their_period():
+    every_other_day = FakeChore(1, "daily", NOW - timedelta(hours=1), period_days=2)
+    quarterly = FakeChore(2, "monthly", datetime(2024, 1, 31, 8), period_days=3)
+
+    assert next_chore_execution(every_other_day, NOW) == NOW + timedelta(days=2, hours=-1)
+    assert next_chore_execution(quarterly, NOW) == datetime(2024, 7, 31, 8)
+
+
+def test_cached_items_are_updated_through_their_fields():
+    chores = [
+        CachedItem(
+            {
+                "id": 1,
+                "period_type": "dynamic-regular",
+                "period_days": 2,
+                "next_estimated_execution_time": "2024-05-09T12:00:00",
+                "track_count": 3,
+            }
+        )
+    ]
+    stock = [CachedItem({"id": 5, "available_amount": 3, "amount_opened": 0})]
+
+    (chore,) = apply_chore_executed(chores, 1, NOW)
+    (product,) = apply_stock_change(stock, 5, -1, 1)
+
+    assert chore.next_estimated_execution_time == NOW + timedelta(days=2)
+    assert chore["track_count"] == 4
+    assert chores[0]["track_count"] == 3
+    assert product.as_dict() == {"id": 5, "available_amount": 2, "amount_opened": 1}
+    assert stock[0]["available_amount"] == 3
+
+
+def test_task_completion_removes_task():
+    tasks = [SimpleNamespace(id=1), SimpleNamespace(id=2)]
+
+    assert [task.id for task in apply_task_completed(tasks, 1)] == [2]
+
+
+def test_battery_charge_moves_next_charge_time():
+    battery = SimpleNamespace(
+        id=4,
+        next_estimated_charge_time=NOW,
+        last_tracked_time=None,
+        charge_interval_days=30,
+        charge_cycles_count=2,
+    )
+
+    (charged,) = apply_battery_charged([battery], 4, NOW)
+
+    assert charged.next_estimated_charge_time == NOW + timedelta(days=30)
+    assert charged.charge_cycles_count == 3
+    assert battery.charge_cycles_count == 2
+
+
+def _stock_item(product_id, amount, opened=0):
+    return ProductWrapper(
+        CurrentStockResponse(
+            product_id=product_id,
+            amount=amount,
+            best_before_date="2024-06-01",
+            amount_opened=opened,
+            amount_aggregated=amount,
+            amount_opened_aggregated=opened,
+            is_aggregated_amount=False,
+            product={
+                "id": product_id,
+                "name": f"Product {product_id}",
+                "qu_id_stock": 1,
+                "qu_id_purchase": 1,
+                "default_best_before_days": 0,
+                "row_created_timestamp": "2024-01-01 00:00:00",
+            },
+        )
+    )
+
+
+def test_stock_change_updates_amounts_and_drops_empty_products():
+    stock = [_stock_item(1, 3, opened=1), _stock_item(2, 1)]
+
+    consumed = apply_stock_change(stock, 2, -1)
+    opened = apply_stock_change(stock, 1, 0, 1)
+
+    assert [item.product.id for item in consumed] == [1]
+    assert opened[0].product.amount_opened == 2
+    assert opened[0].as_dict({"available_amount", "amount_opened"}) == {
+        "available_amount": 3,
+        "amount_opened": 2,
+    }
+    assert stock[0].product.amount_opened == 1
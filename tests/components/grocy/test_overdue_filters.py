@@ -0,0 +1,44 @@
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+from custom_components.grocy.helpers import (
+    filter_overdue_batteries,
+    filter_overdue_chores,
+    filter_overdue_tasks,
+)
+
+NOW = datetime(2024, 5, 10, 12, 0, 0)
+
+
+def test_overdue_chores_excludes_future_and_missing_times():
+    chores = [
+        SimpleNamespace(id=1, next_estimated_execution_time=datetime(2024, 5, 10, 11, 59)),
+        SimpleNamespace(id=2, next_estimated_execution_time=datetime(2024, 5, 10, 12, 1)),
+        SimpleNamespace(id=3, next_estimated_execution_time=None),
+        SimpleNamespace(
+            id=4, next_estimated_execution_time=datetime(2024, 5, 9, tzinfo=timezone.utc)
+        ),
+    ]
+
+    assert [c.id for c in filter_overdue_chores(chores, NOW)] == [1, 4]
+
+
+def test_overdue_tasks_compare_dates_and_skip_empty_due_date():
+    tasks = [
+        SimpleNamespace(id=1, due_date=datetime(2024, 5, 9, 23, 0)),
+        SimpleNamespace(id=2, due_date=datetime(2024, 5, 10, 0, 0)),
+        SimpleNamespace(id=3, due_date=None),
+        SimpleNamespace(id=4, due_date=date(2024, 5, 1)),
+    ]
+
+    assert [t.id for t in filter_overdue_tasks(tasks, NOW.date())] == [1, 4]
+
+
+def test_overdue_batteries():
+    batteries = [
+        SimpleNamespace(id=1, next_estimated_charge_time=datetime(2024, 5, 1)),
+        SimpleNamespace(id=2, next_estimated_charge_time=datetime(2024, 6, 1)),
+        SimpleNamespace(id=3, next_estimated_charge_time=None),
+    ]
+
+    assert [b.id for b in filter_overdue_batteries(batteries, NOW)] == [1]
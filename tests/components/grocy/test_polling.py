@@ -0,0 +1,134 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from custom_components.grocy.polling import (
+    AdaptivePollingController,
+    DirtyKeyRefreshQueue,
+    next_due_time,
+)
+
+NOW = datetime(2024, 5, 10, 12, 0, 0)
+
+
+def test_backs_off_while_idle_up_to_ceiling():
+    controller = AdaptivePollingController(timedelta(seconds=30), timedelta(seconds=60))
+
+    assert controller.next_interval(changed=False, now=NOW) == timedelta(seconds=45)
+    assert controller.next_interval(changed=False, now=NOW) == timedelta(seconds=60)
+    assert controller.next_interval(changed=False, now=NOW) == timedelta(seconds=60)
+    assert controller.next_interval(changed=True, now=NOW) == timedelta(seconds=30)
+
+
+def test_polls_fast_after_activity():
+    controller = AdaptivePollingController(timedelta(seconds=30), timedelta(minutes=10))
+
+    assert controller.record_activity(NOW) == timedelta(seconds=5)
+    later = NOW + timedelta(seconds=30)
+    assert controller.next_interval(changed=False, now=later) == timedelta(seconds=5)
+    much_later = NOW + timedelta(minutes=5)
+    assert controller.next_interval(changed=False, now=much_later) == timedelta(seconds=45)
+
+
+def test_polls_right_after_upcoming_due_time():
+    controller = AdaptivePollingController(timedelta(seconds=30), timedelta(minutes=10))
+    chores = [
+        SimpleNamespace(next_estimated_execution_time=NOW + timedelta(seconds=12)),
+        SimpleNamespace(next_estimated_execution_time=NOW - timedelta(days=1)),
+    ]
+
+    due = next_due_time({"chores": chores}, NOW)
+
+    assert due == NOW + timedelta(seconds=12)
+    assert controller.next_interval(changed=True, next_due=due, now=NOW) == timedelta(
+        seconds=13
+    )
+
+
+def test_tasks_are_due_at_the_end_of_their_due_date():
+    tasks = [
+        SimpleNamespace(due_date=date(2024, 5, 9)),
+        SimpleNamespace(due_date=date(2024, 5, 10)),
+        SimpleNamespace(due_date=None),
+    ]
+
+    assert next_due_time({"tasks": tasks}, NOW) == datetime(2024, 5, 11)
+
+
+def test_refresh_queue_coalesces_burst_into_one_refresh():
+    refreshed = []
+
+    async def refresh(keys):
+        refreshed.append(keys)
+
+    async def run():
+        queue = DirtyKeyRefreshQueue(
+            refresh,
+            quiet_window=timedelta(seconds=0.05),
+            max_delay=timedelta(seconds=1),
+        )
+        for _ in range(5):
+            queue.mark_dirty(["stock", "missing_products"])
+            await asyncio.sleep(0.01)
+        queue.mark_dirty(["shopping_list"])
+        await asyncio.sleep(0.15)
+
+    asyncio.run(run())
+
+    assert refreshed == [["stock", "missing_products", "shopping_list"]]
+
+
+def test_refresh_queue_caps_delay_during_steady_writes():
+    refreshed = []
+
+    async def refresh(keys):
+        refreshed.append(keys)
+
+    async def run():
+        queue = DirtyKeyRefreshQueue(
+            refresh,
+            quiet_window=timedelta(seconds=0.05),
+            max_delay=timedelta(seconds=0.1),
+        )
+        for _ in range(10):
+            queue.mark_dirty(["stock"])
+            await asyncio.sleep(0.03)
+        await queue.async_flush()
+
+    asyncio.run(run())
+
+    assert len(refreshed) >= 2
+
+
+def test_refresh_queue_waits_for_running_refresh():
+    refreshed = []
+    running = []
+    created = []
+
+    async def refresh(keys):
+        assert not running
+        running.append(keys)
+        await asyncio.sleep(0.1)
+        running.remove(keys)
+        refreshed.append(keys)
+
+    def create_task(target):
+        created.append(target)
+        return asyncio.get_running_loop().create_task(target)
+
+    async def run():
+        queue = DirtyKeyRefreshQueue(
+            refresh,
+            quiet_window=timedelta(seconds=0.01),
+            max_delay=timedelta(seconds=0.01),
+            create_task=create_task,
+        )
+        queue.mark_dirty(["stock"])
+        await asyncio.sleep(0.05)
+        queue.mark_dirty(["chores"])
+        await asyncio.sleep(0.3)
+
+    asyncio.run(run())
+
+    assert refreshed == [["stock"], ["chores"]]
+    assert len(created) == 2
@@ -0,0 +1,27 @@
+from custom_components.grocy.services import (
+    SERVICE_ADD_GENERIC,
+    SERVICE_CONSUME_PRODUCT,
+    SERVICE_EXECUTE_CHORE,
+    SERVICE_ENTITY_TYPE,
+    _affected_keys,
+)
+
+
+def test_stock_services_refresh_stock_keys():
+    keys = _affected_keys(SERVICE_CONSUME_PRODUCT, {})
+
+    assert "stock" in keys
+    assert "missing_products" in keys
+    assert "chores" not in keys
+
+
+def test_chore_service_refreshes_only_chore_keys():
+    assert set(_affected_keys(SERVICE_EXECUTE_CHORE, {})) == {"chores", "overdue_chores"}
+
+
+def test_generic_services_refresh_by_entity_type():
+    assert set(_affected_keys(SERVICE_ADD_GENERIC, {})) == {"tasks", "overdue_tasks"}
+    assert "shopping_list" in _affected_keys(
+        SERVICE_ADD_GENERIC, {SERVICE_ENTITY_TYPE: "products"}
+    )
+    assert _affected_keys(SERVICE_ADD_GENERIC, {SERVICE_ENTITY_TYPE: "equipment"}) == ()
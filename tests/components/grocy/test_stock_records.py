@@ -0,0 +1,57 @@
+import copy
+
+from pygrocy2.data_models.product import Product
+from pygrocy2.grocy_api_client import CurrentStockResponse, ProductData
+
+from custom_components.grocy.helpers import StockRecords, picture_proxy_url
+
+
+def _row(product_id, amount=1, picture=None):
+    return CurrentStockResponse(
+        product_id=product_id,
+        amount=amount,
+        best_before_date="2024-01-01",
+        amount_opened=0,
+        amount_aggregated=amount,
+        amount_opened_aggregated=0,
+        is_aggregated_amount=False,
+        product=ProductData(
+            id=product_id,
+            name=f"Product {product_id}",
+            product_group_id=2,
+            qu_id_stock=1,
+            qu_id_purchase=1,
+            row_created_timestamp="2024-01-01 00:00:00",
+            default_best_before_days=0,
+            picture_file_name=picture,
+        ),
+    )
+
+
+def test_stock_record_matches_pygrocy_product():
+    row = _row(1, picture="milk.jpg")
+    record = StockRecords().update([row])[0]
+
+    expected = Product(row).as_dict()
+    expected["picture_url"] = picture_proxy_url("productpictures", "milk.jpg")
+    assert record.as_dict() == expected
+    assert list(record.as_dict()) == list(expected)
+    assert record.picture_url == "/api/grocy/productpictures/bWlsay5qcGc="
+    assert not hasattr(record.product, "__dict__")
+
+    changed = copy.copy(record.product)
+    changed._available_amount = 5
+    assert changed.available_amount == 5
+    assert record.product.available_amount == 1
+
+
+def test_unchanged_rows_reuse_their_records():
+    records = StockRecords()
+    first = records.update([_row(1), _row(2)])
+
+    second = records.update([_row(1), _row(2, amount=3)])
+
+    assert second[0] is first[0]
+    assert second[1] is not first[1]
+    assert second[1].product.available_amount == 3
+    assert records.update([_row(2, amount=3)])[0] is second[1]
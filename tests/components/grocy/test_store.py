@@ -0,0 +1,41 @@
+from datetime import date, datetime
+
+from custom_components.grocy.helpers import filter_overdue_chores, filter_overdue_tasks
+from custom_components.grocy.store import CachedItem, deserialize_data, serialize_data
+
+
+class FakeChore:
+    def __init__(self, chore_id, next_time):
+        self.id = chore_id
+        self.next_time = next_time
+
+    def as_dict(self):
+        return {"id": self.id, "name": f"Chore {self.id}", "next_estimated_execution_time": self.next_time}
+
+
+def test_round_trip_keeps_fields_and_types():
+    data = {
+        "chores": [
+            FakeChore(1, datetime(2024, 1, 1, 8, 0)),
+            FakeChore(2, datetime(2099, 1, 1, 8, 0)),
+        ],
+        "tasks": [{"id": 3, "due_date": date(2024, 1, 1)}],
+        "not_a_list": None,
+    }
+
+    restored = deserialize_data(serialize_data(data))
+
+    assert set(restored) == {"chores", "tasks"}
+    chore = restored["chores"][0]
+    assert isinstance(chore, CachedItem)
+    assert chore.id == 1
+    assert chore.next_estimated_execution_time == datetime(2024, 1, 1, 8, 0)
+    assert chore.as_dict()["name"] == "Chore 1"
+    assert [c.id for c in filter_overdue_chores(restored["chores"], datetime(2024, 6, 1))] == [1]
+    assert filter_overdue_tasks(restored["tasks"], date(2024, 6, 1)) == restored["tasks"]
+
+
+def test_missing_field_raises_attribute_error():
+    item = CachedItem({"id": 1})
+
+    assert getattr(item, "product", None) is None
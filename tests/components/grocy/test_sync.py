@@ -0,0 +1,194 @@
+import asyncio
+from datetime import datetime
+import json
+
+from pygrocy2.grocy_api_client import CurrentStockResponse
+
+from custom_components.grocy.grocy_api import ProductStock
+from custom_components.grocy.sync import CountingJournal, GrocyJournals, StockJournal
+
+PRODUCT = {
+    "id": 1,
+    "name": "Milk",
+    "location_id": 1,
+    "qu_id_purchase": 1,
+    "qu_id_stock": 1,
+    "min_stock_amount": 0,
+    "default_best_before_days": 0,
+    "parent_product_id": None,
+    "row_created_timestamp": "2024-01-01 00:00:00",
+}
+
+
+class FakeApiClient:
+    """Grocy api client with a stock journal and a chores log."""
+
+    def __init__(self):
+        self.requests = []
+        self.stock_log = [{"id": 1, "product_id": 1, "undone": "0"}]
+        self.chores_log = [
+            {"id": 1, "chore_id": 1, "tracked_time": "2024-01-01 08:00:00", "undone": "0"},
+        ]
+        self.amounts = {1: 2}
+        self.parents = {}
+        self.concurrent = 0
+        self.max_concurrent = 0
+
+    def _stock_row(self, product_id):
+        return {
+            "product_id": product_id,
+            "amount": self.amounts[product_id],
+            "best_before_date": "2024-02-01",
+            "amount_opened": 0,
+            "amount_aggregated": self.amounts[product_id],
+            "amount_opened_aggregated": 0,
+            "is_aggregated_amount": "0",
+            "product": {**PRODUCT, "id": product_id},
+        }
+
+    async def get_stock(self):
+        self.requests.append("stock")
+        return [
+            CurrentStockResponse(**self._stock_row(product_id))
+            for product_id, amount in self.amounts.items()
+            if amount > 0
+        ]
+
+    async def get_last_object_id(self, entity_type):
+        self.requests.append(f"objects/{entity_type}?order=id:desc")
+        rows = getattr(self, entity_type)
+        return rows[-1]["id"] if rows else None
+
+    async def get_product_stock(self, product_id):
+        self.requests.append(f"stock/products/{product_id}")
+        self.concurrent += 1
+        self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        await asyncio.sleep(0)
+        self.concurrent -= 1
+        row = self._stock_row(product_id)
+        return ProductStock(
+            CurrentStockResponse(**row) if row["amount"] > 0 else None,
+            self.parents.get(product_id),
+        )
+
+    async def get_generic_objects_for_type(self, entity_type, query_filters=None):
+        self.requests.append(f"objects/{entity_type}")
+        rows = getattr(self, entity_type)
+        for query_filter in query_filters or []:
+            if query_filter.startswith("id>"):
+                rows = [row for row in rows if row["id"] > int(query_filter[3:])]
+            elif query_filter == "undone=1":
+                rows = [row for row in rows if row["undone"] == "1"]
+        return rows
+
+
+def test_stock_is_synced_from_new_journal_rows_only():
+    api_client = FakeApiClient()
+    journal = StockJournal()
+    assert [row.amount for row in asyncio.run(journal.async_sync(api_client, None))] == [2]
+    assert "stock" in api_client.requests
+
+    # A consumption of product 1 and a purchase of the new product 2
+    api_client.amounts.update({1: 1, 2: 5})
+    api_client.stock_log += [
+        {"id": 2, "product_id": 1, "undone": "0"},
+        {"id": 3, "product_id": 2, "undone": "0"},
+    ]
+    api_client.requests.clear()
+    rows = asyncio.run(journal.async_sync(api_client, datetime(2024, 1, 1, 10)))
+    assert {row.product_id: row.amount for row in rows} == {1: 1, 2: 5}
+    assert "stock" not in api_client.requests
+    assert sorted(api_client.requests) == [
+        "objects/stock_log",
+        "stock/products/1",
+        "stock/products/2",
+    ]
+
+    # Grocy did not change: nothing is read
+    api_client.requests.clear()
+    asyncio.run(journal.async_sync(api_client, datetime(2024, 1, 1, 10)))
+    assert api_client.requests == []
+
+    # Nothing was booked: only the journal is read
+    asyncio.run(journal.async_sync(api_client, datetime(2024, 1, 1, 11)))
+    assert api_client.requests == ["objects/stock_log", "objects/stock_log"]
+
+    # Products that are used up leave the stock
+    api_client.amounts[1] = 0
+    api_client.stock_log.append({"id": 4, "product_id": 1, "undone": "0"})
+    assert [row.product_id for row in asyncio.run(journal.async_sync(api_client, None))] == [2]
+
+
+def test_stock_is_read_in_full_after_a_gap_in_the_journal():
+    api_client = FakeApiClient()
+    journal = StockJournal()
+    asyncio.run(journal.async_sync(api_client, None))
+
+    api_client.amounts[1] = 7
+    api_client.stock_log.append({"id": 3, "product_id": 1, "undone": "0"})
+    api_client.requests.clear()
+    assert [row.amount for row in asyncio.run(journal.async_sync(api_client, None))] == [7]
+    assert "stock" in api_client.requests
+
+
+def test_booked_products_and_their_parents_are_requested_concurrently():
+    api_client = FakeApiClient()
+    api_client.amounts.update({2: 3, 3: 4, 4: 9})
+    api_client.parents = {2: 4, 3: 4}
+    journal = StockJournal()
+    asyncio.run(journal.async_sync(api_client, None))
+
+    api_client.amounts.update({2: 2, 3: 3, 4: 7})
+    api_client.stock_log += [
+        {"id": 2, "product_id": 2, "undone": "0"},
+        {"id": 3, "product_id": 3, "undone": "0"},
+    ]
+    api_client.requests.clear()
+
+    async def sync():
+        return await journal.async_sync(api_client, None, asyncio.Semaphore(2))
+
+    rows = asyncio.run(sync())
+    assert {row.product_id: row.amount for row in rows} == {1: 2, 2: 2, 3: 3, 4: 7}
+    # The parent is requested once, after its children
+    assert api_client.requests[-1] == "stock/products/4"
+    assert api_client.requests.count("stock/products/4") == 1
+    assert api_client.max_concurrent == 2
+
+
+def test_chore_executions_are_counted_incrementally_and_recounted_after_undo():
+    api_client = FakeApiClient()
+    journal = CountingJournal("chores_log", "chore_id")
+    asyncio.run(journal.async_sync(api_client, datetime(2024, 1, 1, 9)))
+    assert journal.counts == {1: 1}
+
+    api_client.chores_log.append(
+        {"id": 2, "chore_id": 1, "tracked_time": "2024-01-02 08:00:00", "undone": "0"}
+    )
+    api_client.requests.clear()
+    asyncio.run(journal.async_sync(api_client, datetime(2024, 1, 2, 9)))
+    assert journal.counts == {1: 2}
+    assert journal.latest[1][1] == 2
+    # Only the new rows and the rows undone since are read
+    assert api_client.requests == ["objects/chores_log", "objects/chores_log"]
+
+    api_client.chores_log[1]["undone"] = "1"
+    asyncio.run(journal.async_sync(api_client, datetime(2024, 1, 3, 9)))
+    assert journal.counts == {1: 1}
+    assert journal.latest[1][1] == 1
+
+
+def test_journals_are_restored_from_their_saved_form():
+    api_client = FakeApiClient()
+    journals = GrocyJournals()
+    assert journals.as_dict() == {"stock": None, "chores": None, "batteries": None}
+    asyncio.run(journals.stock.async_sync(api_client, datetime(2024, 1, 1, 10)))
+    asyncio.run(journals.chores.async_sync(api_client, datetime(2024, 1, 1, 10)))
+
+    restored = GrocyJournals()
+    restored.restore(json.loads(json.dumps(journals.as_dict())))
+    api_client.requests.clear()
+    rows = asyncio.run(restored.stock.async_sync(api_client, datetime(2024, 1, 1, 10)))
+    assert [row.amount for row in rows] == [2]
+    assert "stock" not in api_client.requests
+    assert restored.chores.counts == {1: 1}